@@ -35,6 +35,20 @@ def create_app(config_name='default'):
         from app.models.tenant import Tenant
         from app.models.user import User
         from app.models.article import Article
+        from app.models.article_body import ArticleBody
+        from app.models.article_revision import ArticleRevision
+        from app.models.article_file import ArticleFile
+        from app.models.stored_file import StoredFile
+        from app.models.upload_session import UploadSession
+        from app.models.article_view import ArticleViewDaily
+        from app.models.active_user_sketch import ActiveUserSketch
+        from app.models.user_cohort import UserSignupCount, UserRetention
+        from app.models.article_status_event import ArticleStatusEvent
+        from app.models.submission_trend import SubmissionTrendBucket
+        from app.models.revenue_month import RevenueMonth, RevenuePlanMonth
+        from app.models.report_export import ReportExport
+        from app.models.reviewer_profile import ReviewerProfile, ReviewerTerm
+        from app.models.trend_score import ArticleTrendScore
         from app.models.notification import Notification
         from app.models.subscription import Subscription
         from app.models.transaction import Transaction
@@ -43,6 +57,9 @@ def create_app(config_name='default'):
         from app.core.middleware import detect_tenant
         app.before_request(detect_tenant)
 
+        from app.core.active_users import track_active_user
+        app.before_request(track_active_user)
+
         from app.modules.auth import auth_bp
         from app.modules.auth import routes as auth_routes
         app.register_blueprint(auth_bp, url_prefix='/auth')
@@ -83,6 +100,14 @@ def create_app(config_name='default'):
         from app.modules.video import routes as video_routes
         app.register_blueprint(video_bp)
 
+        from app.modules.api import api_bp
+        from app.modules.api import routes as api_routes
+        app.register_blueprint(api_bp, url_prefix='/api')
+
+        from app.modules.oai import oai_bp
+        from app.modules.oai import routes as oai_routes
+        app.register_blueprint(oai_bp, url_prefix='/oai')
+
         from app.modules.ai import ai_bp
         from app.modules.ai import routes as ai_routes
         app.register_blueprint(ai_bp, url_prefix="/ai")
@@ -94,4 +119,7 @@ def create_app(config_name='default'):
         from app.core.errors import register_error_handlers
         register_error_handlers(app)
 
+        from app.core.cli import register_cli
+        register_cli(app)
+
     return app
\ No newline at end of file
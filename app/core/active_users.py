@@ -0,0 +1,189 @@
+"""Daily, weekly and monthly active users from HyperLogLog sketches.
+
+Each authenticated request adds the user id to today's in-memory sketch for
+the platform and for the user's journal. Sketches are merged into
+``active_user_sketches`` (register-wise max) on an interval, so every worker
+can persist independently and any range of days merges into one estimate.
+"""
+
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timedelta
+
+from flask import current_app, request
+from flask_login import current_user
+from sqlalchemy.exc import IntegrityError
+
+from app.core.extensions import db
+from app.models.active_user_sketch import ActiveUserSketch
+
+DEFAULT_PRECISION = 12
+DEFAULT_PERSIST_INTERVAL = 60
+
+PLATFORM_SCOPE = 'platform'
+
+class HyperLogLog:
+    """HyperLogLog cardinality sketch with ``2 ** precision`` one-byte registers."""
+
+    def __init__(self, precision=DEFAULT_PRECISION, registers=None):
+        self.precision = precision
+        self.m = 1 << precision
+        if registers is not None and len(registers) != self.m:
+            raise ValueError('register size does not match precision')
+        self.registers = bytearray(registers) if registers is not None else bytearray(self.m)
+
+    def add(self, value):
+        digest = hashlib.blake2b(str(value).encode('utf-8'), digest_size=8).digest()
+        h = int.from_bytes(digest, 'big')
+        index = h >> (64 - self.precision)
+        remaining = h & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - remaining.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other):
+        if other.m != self.m:
+            raise ValueError('cannot merge sketches of different precision')
+        regs, theirs = self.registers, other.registers
+        for i in range(self.m):
+            if theirs[i] > regs[i]:
+                regs[i] = theirs[i]
+        return self
+
+    def count(self):
+        m = self.m
+        if m >= 128:
+            alpha = 0.7213 / (1 + 1.079 / m)
+        else:
+            alpha = {16: 0.673, 32: 0.697, 64: 0.709}[m]
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def to_bytes(self):
+        return bytes(self.registers)
+
+    @property
+    def memory_bytes(self):
+        return len(self.registers)
+
+_sketches = {}   # (day, scope) -> HyperLogLog, this process only
+_dirty = set()
+_lock = threading.Lock()
+_last_persist = time.monotonic()
+
+def tenant_scope(tenant_id):
+    return f'tenant:{tenant_id}'
+
+def _precision():
+    return current_app.config.get('ACTIVE_USERS_HLL_PRECISION', DEFAULT_PRECISION)
+
+def _utc_today():
+    return datetime.utcnow().date()
+
+def record_active_user(user_id, tenant_id=None, day=None):
+    day = day or _utc_today()
+    scopes = [PLATFORM_SCOPE]
+    if tenant_id:
+        scopes.append(tenant_scope(tenant_id))
+    with _lock:
+        for scope in scopes:
+            key = (day, scope)
+            sketch = _sketches.get(key)
+            if sketch is None:
+                sketch = _sketches[key] = HyperLogLog(_precision())
+            sketch.add(user_id)
+            _dirty.add(key)
+
+def track_active_user():
+    """before_request hook: count the signed-in user as active today."""
+    if request.endpoint == 'static' or not current_user.is_authenticated:
+        return
+    record_active_user(current_user.id, current_user.tenant_id)
+
+    interval = current_app.config.get('ACTIVE_USERS_PERSIST_INTERVAL', DEFAULT_PERSIST_INTERVAL)
+    if time.monotonic() - _last_persist >= interval:
+        try:
+            persist_active_users()
+        except Exception:
+            current_app.logger.exception('Persisting active-user sketches failed')
+
+def _merge_row(day, scope, sketch):
+    """Merge ``sketch`` into its row under a row lock, so concurrent writers
+    from other processes add to each other's registers instead of
+    overwriting them."""
+    row = ActiveUserSketch.query.filter_by(day=day, scope=scope).with_for_update().first()
+    if row is None:
+        try:
+            with db.session.begin_nested():
+                db.session.add(ActiveUserSketch(day=day, scope=scope, registers=sketch.to_bytes()))
+            return
+        except IntegrityError:
+            # Another worker inserted it first; merge into theirs
+            row = ActiveUserSketch.query.filter_by(day=day, scope=scope).with_for_update().one()
+    merged = HyperLogLog(sketch.precision, row.registers).merge(sketch)
+    row.registers = merged.to_bytes()
+
+def persist_active_users():
+    """Merge dirty in-memory sketches into the table. Returns rows written."""
+    global _last_persist
+    with _lock:
+        dirty = {key: HyperLogLog(sketch.precision, sketch.registers) for key, sketch in _sketches.items()
+                 if key in _dirty}
+        _dirty.clear()
+        _last_persist = time.monotonic()
+
+    if dirty:
+        try:
+            for (day, scope), sketch in dirty.items():
+                _merge_row(day, scope, sketch)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            with _lock:
+                for key, sketch in dirty.items():
+                    _sketches.setdefault(key, HyperLogLog(sketch.precision)).merge(sketch)
+                    _dirty.add(key)
+            raise
+
+    # Past days are final once persisted; drop them only after the merge
+    # committed, keeping any that were recorded again since.
+    with _lock:
+        today = _utc_today()
+        for key in [key for key in _sketches if key[0] < today and key not in _dirty]:
+            del _sketches[key]
+    return len(dirty)
+
+def active_user_counts(tenant_id=None, today=None):
+    """Return estimated ``{'dau', 'wau', 'mau'}`` for the platform or a journal."""
+    today = today or _utc_today()
+    scope = tenant_scope(tenant_id) if tenant_id else PLATFORM_SCOPE
+    precision = _precision()
+    start = today - timedelta(days=29)
+
+    by_day = {}
+    rows = ActiveUserSketch.query.filter(
+        ActiveUserSketch.scope == scope,
+        ActiveUserSketch.day >= start,
+        ActiveUserSketch.day <= today,
+    ).all()
+    for row in rows:
+        by_day[row.day] = HyperLogLog(precision, row.registers)
+    with _lock:
+        for (day, key_scope), sketch in _sketches.items():
+            if key_scope == scope and start <= day <= today:
+                by_day.setdefault(day, HyperLogLog(precision)).merge(sketch)
+
+    def _union(days):
+        merged = HyperLogLog(precision)
+        for offset in range(days):
+            sketch = by_day.get(today - timedelta(days=offset))
+            if sketch is not None:
+                merged.merge(sketch)
+        return merged.count()
+
+    return {'dau': _union(1), 'wau': _union(7), 'mau': _union(30)}
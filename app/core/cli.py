@@ -0,0 +1,120 @@
+import click
+from flask.cli import AppGroup
+
+analytics_cli = AppGroup('analytics', help='Analytics maintenance jobs.')
+
+@analytics_cli.command('flush-views')
+def flush_views_command():
+    """Write buffered article views to article_views_daily."""
+    from app.core.view_stats import flush_views
+    written = flush_views()
+    click.echo(f'Flushed {written} buffered views.')
+
+@analytics_cli.command('compact-views')
+@click.option('--retention-days', type=int, default=None,
+              help='Days kept at daily granularity (default: VIEW_DAILY_RETENTION_DAYS).')
+def compact_views_command(retention_days):
+    """Fold daily view rows older than the retention window into months."""
+    from app.core.view_stats import compact_views, flush_views
+    flush_views()
+    months = compact_views(retention_days=retention_days)
+    click.echo(f'Compacted {months} month(s) of daily views.')
+
+@analytics_cli.command('dedup-stats')
+def dedup_stats_command():
+    """Report the unique-view Bloom filter size and memory use."""
+    from app.core.view_dedup import view_filter_stats
+    stats = view_filter_stats()
+    click.echo(
+        f"{stats['filters']}/{stats['max_filters']} filters, {stats['keys']} keys, "
+        f"{stats['memory_bytes'] / 1024:.1f} KiB used "
+        f"(max {stats['max_memory_bytes'] / 1024:.1f} KiB at {stats['error_rate']:.2%} false positives), "
+        f"{stats['estimated_error_rate']:.2%} false positives now"
+    )
+
+@analytics_cli.command('persist-trending')
+def persist_trending_command():
+    """Merge in-memory trending score deltas into article_trend_scores."""
+    from app.core.trending import persist_trending
+    click.echo(f'Persisted {persist_trending()} trending score(s).')
+
+@analytics_cli.command('rebuild-trending')
+@click.option('--days', type=int, default=14, help='History window to replay.')
+def rebuild_trending_command(days):
+    """Recompute trending scores from publish dates and daily views."""
+    from app.core.trending import rebuild_trending
+    from app.core.view_stats import flush_views
+    flush_views()
+    click.echo(f'Rebuilt trending scores for {rebuild_trending(days=days)} article(s).')
+
+@analytics_cli.command('persist-active-users')
+def persist_active_users_command():
+    """Merge in-memory active-user sketches into active_user_sketches."""
+    from app.core.active_users import persist_active_users
+    click.echo(f'Persisted {persist_active_users()} active-user sketch(es).')
+
+@analytics_cli.command('rebuild-cohorts')
+def rebuild_cohorts_command():
+    """Recompute signup counts and cohort retention from the users table."""
+    from app.core.cohorts import rebuild_cohorts
+    click.echo(f'Rebuilt cohorts from {rebuild_cohorts()} user(s).')
+
+@analytics_cli.command('rebuild-submission-trends')
+def rebuild_submission_trends_command():
+    """Backfill missing status history and recompute submission-trend buckets."""
+    from app.core.submission_trends import rebuild_submission_trends
+    click.echo(f'Replayed {rebuild_submission_trends()} status event(s).')
+
+@analytics_cli.command('rebuild-revenue')
+def rebuild_revenue_command():
+    """Recompute the cached totals of every closed revenue month."""
+    from app.core.revenue import rebuild_revenue_cache
+    click.echo(f'Cached revenue for {rebuild_revenue_cache()} closed month(s).')
+
+@analytics_cli.command('body-stats')
+def body_stats_command():
+    """Report how much the article body store saves."""
+    from app.core.content_store import store_stats
+    stats = store_stats()
+    ratio = stats['stored_bytes'] / stats['raw_bytes'] if stats['raw_bytes'] else 1
+    click.echo(
+        f"{stats['articles']} articles share {stats['bodies']} bodies: "
+        f"{stats['raw_bytes'] / 1024:.1f} KiB of text stored in {stats['stored_bytes'] / 1024:.1f} KiB ({ratio:.0%})"
+    )
+
+@analytics_cli.command('prune-bodies')
+def prune_bodies_command():
+    """Delete article bodies no article refers to any more."""
+    from app.core.content_store import prune_orphan_bodies
+    click.echo(f'Deleted {prune_orphan_bodies()} orphaned article bodies.')
+
+@analytics_cli.command('encode-revisions')
+def encode_revisions_command():
+    """Encode article revisions still pending as snapshots or deltas."""
+    from app.core.revisions import encode_all_pending_revisions
+    click.echo(f'Encoded {encode_all_pending_revisions()} pending revision(s).')
+
+@analytics_cli.command('prune-uploads')
+@click.option('--max-age-hours', type=int, default=None,
+              help='Idle time before an open upload is dropped (default: UPLOAD_SESSION_TTL_HOURS).')
+def prune_uploads_command(max_age_hours):
+    """Drop abandoned uploads and stored files no article uses."""
+    from app.core.file_store import prune_orphan_files
+    from app.core.uploads import prune_stale_uploads
+    uploads = prune_stale_uploads(max_age_hours)
+    click.echo(f'Dropped {uploads} stale upload(s) and {prune_orphan_files()} orphaned file(s).')
+
+@analytics_cli.command('rebuild-reviewer-profiles')
+def rebuild_reviewer_profiles_command():
+    """Recompute every member's reviewer expertise and workload profile."""
+    from app.core.reviewer_index import rebuild_reviewer_profiles
+    click.echo(f'Rebuilt {rebuild_reviewer_profiles()} reviewer profile(s).')
+
+@analytics_cli.command('build-sitemaps')
+def build_sitemaps_command():
+    """Regenerate every platform and journal sitemap from scratch."""
+    from app.core.sitemaps import build_sitemaps
+    click.echo(f'Wrote {build_sitemaps()} sitemap file(s).')
+
+def register_cli(app):
+    app.cli.add_command(analytics_cli)
@@ -0,0 +1,137 @@
+"""Monthly signup counts and cohort retention, maintained incrementally.
+
+``user_signup_counts`` holds accounts created per month and role, and
+``user_retention`` holds, for each signup month, how many of those users were
+active in each later month. Both are updated in the same transaction as the
+registration or login that changes them, so the growth page reads a few
+hundred pre-aggregated rows instead of scanning ``users``.
+"""
+
+from datetime import date, datetime
+
+from sqlalchemy import func
+
+from app.core.extensions import db
+from app.core.upsert import upsert_increment
+from app.models.user import User
+from app.models.user_cohort import UserSignupCount, UserRetention
+
+DEFAULT_COHORT_MONTHS = 24
+
+def month_start(value):
+    return date(value.year, value.month, 1)
+
+def _add_months(month, offset):
+    index = month.year * 12 + month.month - 1 + offset
+    return date(index // 12, index % 12 + 1, 1)
+
+def _months_between(start, end):
+    return (end.year - start.year) * 12 + end.month - start.month
+
+def record_signup(user):
+    """Count a new account in its signup month. Call before committing."""
+    month = month_start(user.created_at or datetime.utcnow())
+    upsert_increment(UserSignupCount, [{'month': month, 'role': user.role or 'subscriber', 'count': 1}],
+                     key_columns=('month', 'role'))
+    # Month 0 of every cohort is the whole cohort.
+    upsert_increment(UserRetention, [{'cohort_month': month, 'activity_month': month, 'count': 1}],
+                     key_columns=('cohort_month', 'activity_month'))
+
+def record_login(user, previous_login, now=None):
+    """Count ``user`` as retained this month on their first login of the month.
+
+    ``previous_login`` is ``user.last_login`` before this login overwrote it.
+    Call before committing.
+    """
+    if user.created_at is None:
+        return
+    now = now or datetime.utcnow()
+    cohort = month_start(user.created_at)
+    activity = month_start(now)
+    if activity <= cohort:
+        return
+    if previous_login is not None and month_start(previous_login) == activity:
+        return
+    upsert_increment(UserRetention, [{'cohort_month': cohort, 'activity_month': activity, 'count': 1}],
+                     key_columns=('cohort_month', 'activity_month'))
+
+def monthly_signups(months=DEFAULT_COHORT_MONTHS, today=None):
+    """Return ``[{'month', 'total', 'by_role'}]`` oldest first, zero-filled."""
+    current = month_start(today or datetime.utcnow())
+    first = _add_months(current, -(months - 1))
+    by_month = {_add_months(first, i): {} for i in range(months)}
+    rows = UserSignupCount.query.filter(UserSignupCount.month >= first).all()
+    for row in rows:
+        if row.month in by_month:
+            by_month[row.month][row.role] = row.count
+    return [
+        {'month': month, 'total': sum(roles.values()), 'by_role': roles}
+        for month, roles in by_month.items()
+    ]
+
+def cohort_grid(months=DEFAULT_COHORT_MONTHS, today=None):
+    """Return one row per signup month with retention by month offset.
+
+    Each row is ``{'month', 'size', 'retention'}`` where ``retention`` is a
+    list of ``(count, percent)`` for offsets 1, 2, ... up to the current
+    month. Newest cohorts come first.
+    """
+    current = month_start(today or datetime.utcnow())
+    first = _add_months(current, -(months - 1))
+    counts = {}
+    rows = UserRetention.query.filter(UserRetention.cohort_month >= first).all()
+    for row in rows:
+        counts[(row.cohort_month, row.activity_month)] = row.count
+
+    grid = []
+    for i in range(months - 1, -1, -1):
+        cohort = _add_months(first, i)
+        size = counts.get((cohort, cohort), 0)
+        retention = []
+        for offset in range(1, _months_between(cohort, current) + 1):
+            count = counts.get((cohort, _add_months(cohort, offset)), 0)
+            retention.append((count, round(count * 100.0 / size, 1) if size else 0.0))
+        grid.append({'month': cohort, 'size': size, 'retention': retention})
+    return grid
+
+def rebuild_cohorts(batch_size=1000):
+    """Recompute both tables from ``users``.
+
+    Only ``created_at`` and ``last_login`` are stored per user, so rebuilt
+    retention counts each user in their signup month and in the month of
+    their latest login; months in between are only known to the incremental
+    counters. Returns the number of users scanned.
+    """
+    signups = {}
+    retention = {}
+    scanned = 0
+    query = (
+        db.session.query(User.created_at, User.role, User.last_login)
+        .filter(User.created_at.isnot(None))
+        .execution_options(yield_per=batch_size)
+    )
+    for created_at, role, last_login in query:
+        scanned += 1
+        cohort = month_start(created_at)
+        key = (cohort, role or 'subscriber')
+        signups[key] = signups.get(key, 0) + 1
+        retention[(cohort, cohort)] = retention.get((cohort, cohort), 0) + 1
+        if last_login is not None and month_start(last_login) > cohort:
+            key = (cohort, month_start(last_login))
+            retention[key] = retention.get(key, 0) + 1
+
+    UserSignupCount.query.delete(synchronize_session=False)
+    UserRetention.query.delete(synchronize_session=False)
+    db.session.add_all([
+        UserSignupCount(month=month, role=role, count=count)
+        for (month, role), count in signups.items()
+    ])
+    db.session.add_all([
+        UserRetention(cohort_month=cohort, activity_month=activity, count=count)
+        for (cohort, activity), count in retention.items()
+    ])
+    db.session.commit()
+    return scanned
+
+def total_signups():
+    return db.session.query(func.coalesce(func.sum(UserSignupCount.count), 0)).scalar()
@@ -0,0 +1,73 @@
+"""Content-addressed, compressed storage for article bodies.
+
+Article text lives in ``article_bodies`` rather than in the ``articles`` row,
+so scans and pages of ``articles`` only touch metadata and a body is read
+when an article is actually opened. Bodies are zlib-compressed and keyed by
+the sha256 of their text, so identical text is stored once however many
+articles (or saves of the same draft) refer to it.
+
+``Article.content`` reads and writes through this module; nothing else needs
+to know bodies are stored separately.
+"""
+
+import hashlib
+import zlib
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from app.core.extensions import db
+from app.models.article import Article
+from app.models.article_body import ArticleBody
+from app.models.article_revision import ArticleRevision
+
+CODEC = 'zlib'
+COMPRESSION_LEVEL = 6
+
+def content_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def compress(text):
+    return zlib.compress(text.encode('utf-8'), COMPRESSION_LEVEL)
+
+def decompress(codec, data):
+    if codec == 'zlib':
+        return zlib.decompress(data).decode('utf-8')
+    raise ValueError(f'unknown article body codec: {codec!r}')
+
+def store_body(text):
+    """Return the ``ArticleBody`` holding ``text``, adding it if it is new."""
+    digest = content_hash(text)
+    body = ArticleBody.query.filter_by(content_hash=digest).first()
+    if body is not None:
+        return body
+
+    body = ArticleBody(content_hash=digest, codec=CODEC, data=compress(text), size=len(text.encode('utf-8')))
+    body.__dict__['text'] = text  # prime cached_property; no need to inflate what we just deflated
+    try:
+        # Savepoint: a concurrent request may insert the same text first
+        with db.session.begin_nested():
+            db.session.add(body)
+    except IntegrityError:
+        body = ArticleBody.query.filter_by(content_hash=digest).one()
+    return body
+
+def prune_orphan_bodies():
+    """Delete bodies no article or pending revision refers to; returns how many."""
+    orphans = select(ArticleBody.id).where(
+        ~ArticleBody.id.in_(select(Article.body_id).where(Article.body_id.isnot(None))),
+        ~ArticleBody.id.in_(select(ArticleRevision.body_id).where(ArticleRevision.body_id.isnot(None))),
+    )
+    deleted = ArticleBody.query.filter(ArticleBody.id.in_(orphans)).delete(synchronize_session=False)
+    db.session.commit()
+    return deleted
+
+def store_stats():
+    """Totals for ``flask analytics body-stats``."""
+    bodies, raw, stored = db.session.query(
+        db.func.count(ArticleBody.id),
+        db.func.coalesce(db.func.sum(ArticleBody.size), 0),
+        db.func.coalesce(db.func.sum(db.func.length(ArticleBody.data)), 0),
+    ).one()
+    articles = Article.query.filter(Article.body_id.isnot(None)).count()
+    return {'bodies': bodies, 'articles': articles, 'raw_bytes': raw, 'stored_bytes': stored}
@@ -0,0 +1,117 @@
+"""Chart datasets shared by the dashboards and the ``/api/metrics`` endpoints.
+
+Every dataset is a single grouped query over the articles in a dashboard's
+scope, so a chart costs one round trip regardless of how many articles the
+journal has.
+"""
+
+from datetime import date, datetime
+
+from sqlalchemy import case, func
+
+from app.core.extensions import db
+from app.models.article import Article
+from app.models.tenant import Tenant
+
+STATUS_LABELS = (
+    ('published', 'Published'),
+    ('under_review', 'Under Review'),
+    ('submitted', 'Submitted'),
+    ('rejected', 'Rejected'),
+    ('draft', 'Draft'),
+)
+
+DASHBOARDS = ('admin', 'member', 'analytics')
+
+def effective_tenant_id(user):
+    """The user's journal; tenant owners may only be linked through ``owner_id``."""
+    if user.tenant_id:
+        return user.tenant_id
+    if user.is_tenant_owner():
+        owned = Tenant.query.filter_by(owner_id=user.id).first()
+        if owned:
+            return owned.id
+    return None
+
+def dashboard_scope(user, dashboard):
+    """Return ``(kind, id)`` for the articles a dashboard's charts cover.
+
+    ``kind`` is ``'platform'``, ``'tenant'`` or ``'author'``. Returns ``None``
+    when the user may not see that dashboard.
+    """
+    if dashboard == 'admin':
+        if user.is_admin():
+            return ('platform', None)
+        if user.tenant_id:
+            return ('tenant', user.tenant_id)
+        return ('author', user.id)
+    if dashboard == 'member':
+        tenant_id = effective_tenant_id(user)
+        return ('tenant', tenant_id) if tenant_id else ('author', user.id)
+    if dashboard == 'analytics':
+        if not (user.is_editor() or user.is_admin()):
+            return None
+        tenant_id = effective_tenant_id(user)
+        if tenant_id:
+            return ('tenant', tenant_id)
+        if user.is_admin():
+            return ('platform', None)
+        return ('none', None)
+    return None
+
+def scoped_articles(scope):
+    kind, scope_id = scope
+    if kind == 'platform':
+        return Article.query
+    if kind == 'tenant':
+        return Article.query.filter(Article.tenant_id == scope_id)
+    if kind == 'author':
+        return Article.query.filter(Article.author_id == scope_id)
+    return Article.query.filter(db.false())
+
+def status_counts(query):
+    """Return ``{status: count}`` for the articles in ``query``."""
+    rows = query.with_entities(Article.status, func.count(Article.id)).group_by(Article.status).all()
+    return {status: count for status, count in rows}
+
+def status_breakdown(query):
+    counts = status_counts(query)
+    return [{'key': key, 'label': label, 'count': counts.get(key, 0)} for key, label in STATUS_LABELS]
+
+def _month_start(value, offset=0):
+    index = value.year * 12 + value.month - 1 + offset
+    return date(index // 12, index % 12 + 1, 1)
+
+def monthly_submissions(query, months=6, today=None):
+    """Articles created per calendar month, oldest first."""
+    current = _month_start(today or datetime.utcnow())
+    bounds = [_month_start(current, -i) for i in range(months - 1, -2, -1)]
+    starts = [datetime(b.year, b.month, 1) for b in bounds]
+    columns = [
+        func.coalesce(func.sum(case(
+            ((Article.created_at >= starts[i]) & (Article.created_at < starts[i + 1]), 1), else_=0,
+        )), 0)
+        for i in range(months)
+    ]
+    counts = query.filter(Article.created_at >= starts[0], Article.created_at < starts[-1]) \
+        .with_entities(*columns).one()
+    return [{'label': bounds[i].strftime('%b %Y'), 'count': int(counts[i])} for i in range(months)]
+
+def top_categories(query, limit=6):
+    category = func.coalesce(Article.category, 'Uncategorized')
+    rows = (
+        query.with_entities(category, func.count(Article.id))
+        .group_by(category)
+        .order_by(func.count(Article.id).desc(), category)
+        .limit(limit)
+        .all()
+    )
+    return [{'label': label or 'Uncategorized', 'count': count} for label, count in rows]
+
+def view_totals(query):
+    """Return ``(total_views, published_views)``."""
+    total, published = query.with_entities(
+        func.coalesce(func.sum(Article.views), 0),
+        func.coalesce(func.sum(case((Article.status == 'published', Article.views), else_=0)), 0),
+    ).one()
+    return int(total), int(published)
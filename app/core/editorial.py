@@ -0,0 +1,132 @@
+"""Bulk editorial actions: assign a reviewer to, or decide on, many articles at once.
+
+The single-article routes (``assign_reviewer``, ``editor_decision`` and the
+admin status form) commit and notify once per article, so clearing a backlog
+of a few hundred submissions costs a few thousand statements and leaves a
+half-applied batch behind if one of them fails. These functions run a whole
+selection in one transaction: the articles are loaded in one query, the
+status history goes through :func:`transition_articles`, DOIs are assigned
+in memory and written with the same flush, and the notifications are one
+bulk insert. Either every selected article changes or none does; the
+trending ranking and other derived state catch up from the post-commit
+status hooks (:mod:`app.core.status_hooks`).
+
+``editor_decision`` goes through :func:`bulk_decide` with a single article,
+so one decision is one transaction too.
+"""
+
+from datetime import datetime
+
+from flask import url_for
+
+from app.core.extensions import db
+from app.core.notifications import bulk_create_notifications
+from app.core.projections import article_list_options
+from app.core.reviewer_index import refresh_profiles_for
+from app.core.submission_trends import transition_articles
+from app.models.article import Article
+
+MAX_BULK_ARTICLES = 500
+
+# Editor decision -> article status
+DECISIONS = {'accept': 'accepted', 'reject': 'rejected', 'publish': 'published'}
+
+# Author notification for each status a decision can lead to
+DECISION_NOTICES = {
+    'accepted':  ('Article accepted', 'Your article "{title}" has been accepted.'),
+    'rejected':  ('Article rejected', 'Your article "{title}" was rejected.'),
+    'published': ('Article published', 'Your article "{title}" is now published.'),
+}
+
+class BulkActionError(Exception):
+    pass
+
+def load_articles(article_ids, tenant_id=None):
+    """Load the selected articles in one query, optionally limited to a tenant.
+
+    Ids that do not exist (or belong to another tenant) are dropped.
+    """
+    ids = {int(article_id) for article_id in article_ids if article_id}
+    if not ids:
+        raise BulkActionError('Select at least one article.')
+    if len(ids) > MAX_BULK_ARTICLES:
+        raise BulkActionError(f'Select at most {MAX_BULK_ARTICLES} articles at a time.')
+    query = Article.query.options(article_list_options()).filter(Article.id.in_(ids))
+    if tenant_id is not None:
+        query = query.filter(Article.tenant_id == tenant_id)
+    return query.order_by(Article.id).all()
+
+def bulk_assign_reviewer(articles, reviewer, editor_id):
+    """Assign ``reviewer`` to ``articles`` and move them under review.
+
+    Articles from another journal or written by the reviewer are skipped.
+    Commits once; returns the articles that were assigned.
+    """
+    eligible = [a for a in articles if a.tenant_id == reviewer.tenant_id and a.author_id != reviewer.id]
+    if not eligible:
+        return []
+    previous_reviewer_ids = {a.reviewer_id for a in eligible}
+    for article in eligible:
+        article.reviewer_id = reviewer.id
+        article.editor_id = editor_id
+    transition_articles(eligible, 'under_review', actor_id=editor_id)
+    refresh_profiles_for(eligible, *previous_reviewer_ids)
+    bulk_create_notifications([
+        {
+            'user_id': reviewer.id,
+            'title': 'New review assignment',
+            'message': f'You were assigned to review "{article.title}".',
+            'link_url': url_for('articles.review_article', article_id=article.id),
+            'category': 'review_assignment',
+        }
+        for article in eligible
+    ], commit=False)
+    db.session.commit()
+    return eligible
+
+def bulk_set_status(articles, status, actor_id, editor_id=None, editor_notes=None, notify=True):
+    """Move ``articles`` to ``status`` in one transaction.
+
+    Publishing stamps ``published_at`` and assigns DOIs to articles without
+    one. With ``notify`` the authors hear about accept, reject and publish
+    decisions. Commits once; returns the articles whose status changed.
+    """
+    changed = transition_articles(articles, status, actor_id=actor_id)
+    if not changed:
+        return []
+
+    now = datetime.utcnow()
+    for article in changed:
+        if editor_id:
+            article.editor_id = editor_id
+        if editor_notes is not None:
+            article.editor_notes = editor_notes
+        if status == 'published':
+            # A republished article may have changed; harvesters go by this date
+            article.published_at = now
+            article.generate_doi()
+
+    notice = DECISION_NOTICES.get(status) if notify else None
+    if notice:
+        title, message = notice
+        bulk_create_notifications([
+            {
+                'user_id': article.author_id,
+                'title': title,
+                'message': message.format(title=article.title),
+                'link_url': (url_for('articles.view', article_id=article.id) if status == 'published'
+                             else url_for('articles.my_articles')),
+                'category': 'article_status',
+            }
+            for article in changed
+        ], commit=False)
+    refresh_profiles_for(changed)
+    db.session.commit()
+    return changed
+
+def bulk_decide(articles, decision, actor_id, editor_notes=None):
+    """Apply an editor ``decision`` (accept, reject or publish) to ``articles``."""
+    status = DECISIONS.get(decision)
+    if status is None:
+        raise BulkActionError('Unknown decision.')
+    return bulk_set_status(articles, status, actor_id, editor_id=actor_id, editor_notes=editor_notes)
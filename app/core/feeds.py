@@ -0,0 +1,75 @@
+"""Atom and RSS feeds of a journal's latest published articles.
+
+Feed readers poll, most of them every few minutes, and almost every poll
+finds nothing new. A feed is therefore versioned by the journal's
+:func:`feed_state`, the newest ``published_at``, the number of published
+articles and their newest ``updated_at``, read with one aggregate filtered
+on the ``(tenant_id, status, published_at)`` index. Publishing an article
+moves the newest date, unpublishing one changes the count, and an article
+unpublished, edited and published again moves the newest ``updated_at``
+even when the other two come back to earlier values, so the state changes
+whenever the feed does.
+
+The state gives the ``ETag`` and ``Last-Modified`` validators, so a poll
+that sends them back gets a 304 before any article is loaded, and it is the
+version of the rendered feed in the fragment cache, so the feed is rendered
+once per publish rather than once per poll.
+"""
+
+from datetime import timezone
+from email.utils import format_datetime
+
+from flask import current_app, render_template
+from sqlalchemy import func
+
+from app.core.extensions import db
+from app.core.fragment_cache import cached_fragment
+from app.core.projections import article_list_query
+from app.models.article import Article
+
+DEFAULT_ENTRIES = 20
+DEFAULT_MAX_AGE = 300
+
+FORMATS = {
+    'atom': ('articles/feed_atom.xml', 'application/atom+xml'),
+    'rss':  ('articles/feed_rss.xml', 'application/rss+xml'),
+}
+
+def feed_state(tenant_id):
+    """Return ``(latest published_at, published count, latest updated_at)`` for a journal."""
+    latest, count, updated = db.session.query(
+        func.max(Article.published_at), func.count(Article.id), func.max(Article.updated_at),
+    ).filter(Article.tenant_id == tenant_id, Article.status == 'published').one()
+    return latest, count, updated
+
+def feed_updated(state):
+    """When the feed last changed: its newest publish or edit, whichever is later."""
+    latest, _, updated = state
+    return max((when for when in (latest, updated) if when), default=None)
+
+def _stamp(when):
+    return when.strftime('%Y%m%d%H%M%S%f') if when else '0'
+
+def feed_etag(tenant_id, fmt, state):
+    latest, count, updated = state
+    return f'{fmt}-{tenant_id}-{count}-{_stamp(latest)}-{_stamp(updated)}'
+
+def rfc3339(when):
+    return when.replace(microsecond=0).isoformat() + 'Z'
+
+def rfc822(when):
+    return format_datetime(when.replace(tzinfo=timezone.utc), usegmt=True)
+
+def render_feed(tenant, fmt, state):
+    """The feed XML for ``tenant`` at ``state``, rendered once per version."""
+    template, _ = FORMATS[fmt]
+
+    def render():
+        limit = current_app.config.get('FEED_ENTRIES', DEFAULT_ENTRIES)
+        articles = article_list_query(
+            Article.query.filter_by(tenant_id=tenant.id, status='published'), Article.abstract, view='feed',
+        ).filter(Article.published_at.isnot(None)).order_by(Article.published_at.desc(), Article.id.desc()).limit(limit).all()
+        return render_template(template, tenant=tenant, articles=articles, updated=feed_updated(state),
+                               rfc3339=rfc3339, rfc822=rfc822)
+
+    return cached_fragment(f'feed_{fmt}', tenant.id, state, render)
@@ -0,0 +1,131 @@
+"""Content-addressed storage for uploaded files.
+
+Each distinct file is kept once on disk at ``FILE_STORE_DIR/ab/cd/<sha256>``
+and described by a ``StoredFile`` row; uploading the same PDF twice costs
+nothing extra. Blobs never change once written, which makes them safe to
+cache and to hand to the front-end web server; only files of published
+articles are marked ``public``, the rest ``private, no-store`` so a shared
+proxy never keeps a copy of an unpublished manuscript.
+
+Downloads never read a blob into Python memory. With ``FILE_SENDFILE`` set
+to ``x-accel-redirect`` (nginx) or ``x-sendfile`` (Apache, lighttpd) the
+response only carries a header and the web server sends the file, Range
+requests included. Otherwise Werkzeug streams it from disk in blocks and
+answers Range and conditional requests itself. For nginx::
+
+    location /_files/ {            # FILE_ACCEL_PREFIX
+        internal;
+        alias /srv/researchhub/files/;   # FILE_STORE_DIR
+    }
+"""
+
+import hashlib
+import os
+from pathlib import Path
+
+from flask import Response, current_app, send_file
+from sqlalchemy.exc import IntegrityError
+
+from app.core.extensions import db
+from app.models.article_file import ArticleFile
+from app.models.stored_file import StoredFile
+
+BLOCK_SIZE = 64 * 1024
+MAX_AGE = 3600
+
+def store_root():
+    path = Path(current_app.config.get('FILE_STORE_DIR') or Path(current_app.instance_path) / 'files')
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+def blob_relpath(sha256):
+    return f'{sha256[:2]}/{sha256[2:4]}/{sha256}'
+
+def blob_path(sha256):
+    return store_root() / blob_relpath(sha256)
+
+def temp_dir():
+    path = store_root() / 'tmp'
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+def hash_file(path):
+    """``(sha256 hex, size)`` of a file, read in blocks."""
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(BLOCK_SIZE), b''):
+            digest.update(block)
+            size += len(block)
+    return digest.hexdigest(), size
+
+def store_file(path, content_type='application/octet-stream'):
+    """Move the file at ``path`` into the store; returns its ``StoredFile``.
+
+    If the same bytes are already stored, ``path`` is deleted instead.
+    """
+    sha256, size = hash_file(path)
+    target = blob_path(sha256)
+    if target.exists():
+        os.remove(path)
+    else:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(path, target)
+
+    stored = StoredFile.query.filter_by(sha256=sha256).first()
+    if stored is not None:
+        return stored
+    stored = StoredFile(sha256=sha256, size=size, content_type=content_type)
+    try:
+        with db.session.begin_nested():
+            db.session.add(stored)
+    except IntegrityError:
+        stored = StoredFile.query.filter_by(sha256=sha256).one()
+    return stored
+
+def _set_cache_policy(response, public):
+    if public:
+        response.cache_control.public = True
+        response.cache_control.max_age = MAX_AGE
+    else:
+        response.cache_control.no_cache = None
+        response.cache_control.private = True
+        response.cache_control.no_store = True
+    return response
+
+def send_stored_file(stored, download_name, as_attachment=False, public=False):
+    """Response for a stored blob, handed off to the web server when configured.
+
+    ``public`` allows shared caches to keep the file; pass it only for files
+    anyone may read.
+    """
+    mode = (current_app.config.get('FILE_SENDFILE') or '').lower()
+    disposition = 'attachment' if as_attachment else 'inline'
+    if mode not in ('x-accel-redirect', 'x-sendfile'):
+        response = send_file(
+            blob_path(stored.sha256), mimetype=stored.content_type, as_attachment=as_attachment,
+            download_name=download_name, conditional=True, etag=stored.sha256,
+            max_age=MAX_AGE if public else None,
+        )
+        return _set_cache_policy(response, public)
+
+    response = Response(mimetype=stored.content_type)
+    if mode == 'x-accel-redirect':
+        prefix = current_app.config.get('FILE_ACCEL_PREFIX', '/_files/').rstrip('/')
+        response.headers['X-Accel-Redirect'] = f'{prefix}/{blob_relpath(stored.sha256)}'
+    else:
+        response.headers['X-Sendfile'] = str(blob_path(stored.sha256))
+    response.headers.set('Content-Disposition', disposition, filename=download_name)
+    response.set_etag(stored.sha256)
+    return _set_cache_policy(response, public)
+
+def prune_orphan_files():
+    """Delete stored files no article file refers to, row and blob; returns how many."""
+    orphans = StoredFile.query.filter(~StoredFile.id.in_(db.session.query(ArticleFile.stored_file_id))).all()
+    for stored in orphans:
+        path = blob_path(stored.sha256)
+        if path.exists():
+            os.remove(path)
+        db.session.delete(stored)
+    db.session.commit()
+    return len(orphans)
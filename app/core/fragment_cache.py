@@ -0,0 +1,110 @@
+"""In-process cache of rendered template fragments, keyed by object version.
+
+A published article's body almost never changes, so the article page caches
+its rendered body and only renders the per-request chrome (view count, edit
+buttons) around it. Each entry is stored under ``(name, object id)`` together
+with the version it was rendered from, the article's ``updated_at``; a lookup
+with a newer version misses and replaces the entry, so saving an article is
+all it takes to invalidate it. Anything that changes what the fragment shows
+must therefore bump ``updated_at``.
+
+Entries also expire after ``FRAGMENT_CACHE_TTL`` seconds, which bounds how
+long related data rendered into a fragment (an author's name) can be stale,
+and the cache is capped at ``FRAGMENT_CACHE_MAX_BYTES``, least recently used
+first out. Each worker process keeps its own cache.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app
+from markupsafe import Markup
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+DEFAULT_TTL = 3600
+
+class FragmentCache:
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, ttl=DEFAULT_TTL):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (version, html, expires_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version or entry[2] < time.monotonic():
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, version, html):
+        size = len(html)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (version, html, time.monotonic() + self.ttl)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+
+    def delete(self, key):
+        with self._lock:
+            self._discard(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry[1])
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_fragment_cache():
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                config = current_app.config
+                _cache = FragmentCache(
+                    max_bytes=config.get('FRAGMENT_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES),
+                    ttl=config.get('FRAGMENT_CACHE_TTL', DEFAULT_TTL),
+                )
+    return _cache
+
+def cached_fragment(name, obj_id, version, render):
+    """Return ``render()``'s HTML for ``(name, obj_id)`` at ``version``, cached."""
+    if not current_app.config.get('FRAGMENT_CACHE_ENABLED', True):
+        return Markup(render())
+    cache = get_fragment_cache()
+    key = (name, obj_id)
+    html = cache.get(key, version)
+    if html is None:
+        html = render()
+        cache.set(key, version, html)
+    return Markup(html)
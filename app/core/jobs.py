@@ -0,0 +1,45 @@
+"""Minimal in-process background jobs.
+
+Work that is too slow for a request (large report exports) runs on a small
+thread pool inside an application context. Job state that users need to see
+lives in the job's own table; this module only runs the callable.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+
+from app.core.extensions import db
+
+DEFAULT_WORKERS = 2
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                workers = current_app.config.get('BACKGROUND_JOB_WORKERS', DEFAULT_WORKERS)
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='job')
+    return _executor
+
+def _run(app, fn, args, kwargs):
+    with app.app_context():
+        try:
+            fn(*args, **kwargs)
+        except Exception:
+            db.session.rollback()
+            app.logger.exception('Background job %s failed', getattr(fn, '__name__', fn))
+        finally:
+            db.session.remove()
+
+def submit_job(fn, *args, **kwargs):
+    """Run ``fn(*args, **kwargs)`` on the job pool with an app context.
+
+    Pass ids rather than ORM objects; the job gets its own session.
+    """
+    app = current_app._get_current_object()
+    return _get_executor().submit(_run, app, fn, args, kwargs)
@@ -11,12 +11,12 @@ PLATFORM_NOTIFICATION_ROLES = ('super_admin', 'admin')
 def _ensure_notifications_table():
     Notification.__table__.create(bind=db.session.get_bind(), checkfirst=True)
 
-def _with_table_retry(callback):
+def _with_table_retry(callback, rollback=True):
     try:
         return callback()
     except OperationalError as exc:
         details = str(exc).lower()
-        if 'no such table' not in details or 'notification' not in details:
+        if not rollback or 'no such table' not in details or 'notification' not in details:
             raise
         db.session.rollback()
         _ensure_notifications_table()
@@ -47,6 +47,37 @@ def create_notifications_for_users(user_ids, title, message, link_url=None, cate
 
     return _with_table_retry(_create)
 
+def bulk_create_notifications(rows, commit=True):
+    """Insert many notifications in one statement.
+
+    ``rows`` are dicts with ``user_id``, ``title``, ``message`` and optionally
+    ``link_url`` and ``category``; unlike :func:`create_notifications_for_users`
+    each recipient can get a different message. With ``commit=False`` the
+    insert joins the caller's transaction, and errors are left to the caller.
+    """
+    values = [
+        {
+            'user_id': int(row['user_id']),
+            'title': (row.get('title') or '').strip()[:180] or 'Notification',
+            'message': (row.get('message') or '').strip(),
+            'link_url': (row.get('link_url') or '').strip() or None,
+            'category': row.get('category') or 'general',
+        }
+        for row in rows if row.get('user_id')
+    ]
+    if not values:
+        return 0
+
+    def _insert():
+        db.session.execute(Notification.__table__.insert(), values)
+        if commit:
+            db.session.commit()
+        return len(values)
+
+    # Inside a caller's transaction a rollback would throw away its pending
+    # changes, so only a standalone insert creates the table and retries
+    return _with_table_retry(_insert, rollback=commit)
+
 def create_notifications_for_roles(target_roles, title, message, link_url=None, category='general'):
     roles = {r for r in (target_roles or []) if r}
     if not roles:
@@ -0,0 +1,324 @@
+"""OAI-PMH 2.0 metadata harvesting of a journal's published articles.
+
+Each journal is its own repository at ``/oai/<subdomain>`` and disseminates
+Dublin Core (``oai_dc``). A record's datestamp is the article's
+``published_at``. A published article can only change by being moved back
+to an earlier status, edited and published again, and every publish stamps
+a new ``published_at``, so the datestamp is also the time the record last
+changed and ``from`` harvests pick republished records up. Unpublished
+articles drop out of the repository without a trace, so deleted records are
+declared ``transient``.
+
+Lists are harvested oldest first in pages of ``OAI_PAGE_SIZE`` records. A
+resumption token is a keyset position, the ``(published_at, id)`` of the
+last record sent plus the request's ``metadataPrefix``, ``from`` and
+``until``, so the next page is read straight off the ``(tenant_id, status,
+published_at, id)`` index however deep the harvest is, and a token never
+expires. Records are read with ``yield_per`` and the XML is written and
+sent in batches as they arrive, so a response of any page size, from a
+journal of any size, runs in constant memory.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime, timedelta
+from xml.sax.saxutils import escape, quoteattr
+
+from flask import current_app, request, url_for
+from sqlalchemy import and_, func, or_
+
+from app.core.extensions import db
+from app.models.article import Article
+from app.models.user import User
+
+DEFAULT_PAGE_SIZE = 500
+BATCH_SIZE = 100
+
+GRANULARITY = 'YYYY-MM-DDThh:mm:ssZ'
+METADATA_FORMATS = {
+    'oai_dc': ('http://www.openarchives.org/OAI/2.0/oai_dc.xsd', 'http://www.openarchives.org/OAI/2.0/oai_dc/'),
+}
+
+# verb -> (required arguments, optional arguments); a resumptionToken is exclusive
+VERBS = {
+    'Identify':            ((), ()),
+    'ListMetadataFormats': ((), ('identifier',)),
+    'ListSets':            ((), ('resumptionToken',)),
+    'GetRecord':           (('identifier', 'metadataPrefix'), ()),
+    'ListIdentifiers':     (('metadataPrefix',), ('from', 'until', 'set', 'resumptionToken')),
+    'ListRecords':         (('metadataPrefix',), ('from', 'until', 'set', 'resumptionToken')),
+}
+
+HEADER_COLUMNS = (Article.id, Article.published_at)
+RECORD_COLUMNS = HEADER_COLUMNS + (
+    Article.title, Article.abstract, Article.keywords, Article.co_authors, Article.category, Article.doi,
+    User.first_name, User.last_name,
+)
+
+class OAIError(Exception):
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+# ── Arguments ──────────────────────────────────
+def datestamp(when):
+    return when.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+def parse_datestamp(value, end=False):
+    """Parse a ``from``/``until`` argument at day or second granularity.
+
+    Returns ``(datetime, granularity)``; a day ``until`` covers the whole day.
+    """
+    for fmt, granularity in (('%Y-%m-%dT%H:%M:%SZ', 'seconds'), ('%Y-%m-%d', 'day')):
+        try:
+            parsed = datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+        if end:
+            parsed += timedelta(days=1) if granularity == 'day' else timedelta(seconds=1)
+        return parsed, granularity
+    raise OAIError('badArgument', f'Invalid datestamp: {value}')
+
+def validate_arguments(args):
+    """Check a request's arguments against its verb; return ``(verb, args)``."""
+    verb = args.get('verb')
+    if verb not in VERBS:
+        raise OAIError('badVerb', 'Missing or illegal verb.')
+    if any(len(args.getlist(name)) > 1 for name in args):
+        raise OAIError('badArgument', 'Repeated argument.')
+    required, optional = VERBS[verb]
+    given = {name: args[name] for name in args if name != 'verb'}
+    unknown = set(given) - set(required) - set(optional)
+    if unknown:
+        raise OAIError('badArgument', f'Illegal argument: {", ".join(sorted(unknown))}.')
+    if 'resumptionToken' in given:
+        if len(given) > 1:
+            raise OAIError('badArgument', 'resumptionToken is an exclusive argument.')
+        return verb, given
+    missing = [name for name in required if name not in given]
+    if missing:
+        raise OAIError('badArgument', f'Missing argument: {", ".join(missing)}.')
+    return verb, given
+
+def encode_token(prefix, since, until, last_published_at, last_id):
+    raw = json.dumps([prefix, since, until, last_published_at.isoformat(), last_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).rstrip(b'=').decode('ascii')
+
+def decode_token(token):
+    """Return ``(prefix, from, until, last published_at, last id)`` of a token."""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        prefix, since, until, last_published_at, last_id = json.loads(raw)
+        if (prefix not in METADATA_FORMATS or not isinstance(last_id, int) or isinstance(last_id, bool)
+                or not isinstance(last_published_at, str)):
+            raise ValueError(prefix)
+        for value, end in ((since, False), (until, True)):
+            if value is not None:
+                if not isinstance(value, str):
+                    raise ValueError(value)
+                parse_datestamp(value, end=end)
+        return prefix, since, until, datetime.fromisoformat(last_published_at), last_id
+    except (binascii.Error, ValueError, TypeError, OAIError):
+        raise OAIError('badResumptionToken', 'The resumptionToken is invalid.') from None
+
+def list_request(args):
+    """Normalise ListIdentifiers/ListRecords arguments, resumed or fresh."""
+    if 'resumptionToken' in args:
+        return decode_token(args['resumptionToken'])
+    if 'set' in args:
+        raise OAIError('noSetHierarchy', 'This repository does not support sets.')
+    prefix = args['metadataPrefix']
+    if prefix not in METADATA_FORMATS:
+        raise OAIError('cannotDisseminateFormat', f'Unsupported metadataPrefix: {prefix}')
+    since = args.get('from')
+    until = args.get('until')
+    granularities = set()
+    if since:
+        granularities.add(parse_datestamp(since)[1])
+    if until:
+        granularities.add(parse_datestamp(until, end=True)[1])
+    if len(granularities) > 1:
+        raise OAIError('badArgument', 'from and until must have the same granularity.')
+    if since and until and parse_datestamp(since)[0] >= parse_datestamp(until, end=True)[0]:
+        raise OAIError('badArgument', 'from is later than until.')
+    return prefix, since, until, None, None
+
+# ── Queries ────────────────────────────────────
+def _published(tenant_id, columns=RECORD_COLUMNS):
+    query = db.session.query(*columns)
+    if columns is RECORD_COLUMNS:
+        query = query.outerjoin(User, User.id == Article.author_id)
+    return query.filter(
+        Article.tenant_id == tenant_id, Article.status == 'published', Article.published_at.isnot(None),
+    )
+
+def list_query(tenant_id, since, until, last_published_at, last_id, page_size, columns=RECORD_COLUMNS):
+    """Up to ``page_size + 1`` records after the keyset position, oldest first."""
+    query = _published(tenant_id, columns)
+    if since:
+        query = query.filter(Article.published_at >= parse_datestamp(since)[0])
+    if until:
+        query = query.filter(Article.published_at < parse_datestamp(until, end=True)[0])
+    if last_id is not None:
+        query = query.filter(or_(
+            Article.published_at > last_published_at,
+            and_(Article.published_at == last_published_at, Article.id > last_id),
+        ))
+    return query.order_by(Article.published_at, Article.id).limit(page_size + 1)
+
+def earliest_datestamp(tenant_id):
+    earliest = db.session.query(func.min(Article.published_at)).filter(
+        Article.tenant_id == tenant_id, Article.status == 'published',
+    ).scalar()
+    return earliest or datetime(1970, 1, 1)
+
+# ── XML ────────────────────────────────────────
+def repository_identifier():
+    return current_app.config.get('OAI_REPOSITORY_IDENTIFIER') or request.host.split(':')[0]
+
+def oai_identifier(tenant, article_id):
+    return f'oai:{repository_identifier()}:{tenant.subdomain}/{article_id}'
+
+def parse_identifier(tenant, identifier):
+    prefix = f'oai:{repository_identifier()}:{tenant.subdomain}/'
+    if identifier.startswith(prefix) and identifier[len(prefix):].isdigit():
+        return int(identifier[len(prefix):])
+    raise OAIError('idDoesNotExist', f'Unknown identifier: {identifier}')
+
+def _header(tenant, row):
+    return (f'<header><identifier>{escape(oai_identifier(tenant, row.id))}</identifier>'
+            f'<datestamp>{datestamp(row.published_at)}</datestamp></header>')
+
+def _split(value):
+    return [part.strip() for part in (value or '').split(',') if part.strip()]
+
+def _dublin_core(tenant, row):
+    elements = [('title', row.title)]
+    if row.first_name or row.last_name:
+        elements.append(('creator', f'{row.first_name or ""} {row.last_name or ""}'.strip()))
+    elements += [('creator', name) for name in _split(row.co_authors)]
+    elements += [('subject', keyword) for keyword in _split(row.keywords)]
+    if row.category:
+        elements.append(('subject', row.category.replace('_', ' ').title()))
+    elements += [
+        ('description', row.abstract),
+        ('publisher', tenant.name),
+        ('date', row.published_at.strftime('%Y-%m-%d')),
+        ('type', 'Text'),
+        ('identifier', url_for('articles.view', article_id=row.id, _external=True)),
+    ]
+    if row.doi:
+        elements.append(('identifier', f'https://doi.org/{row.doi}'))
+    body = ''.join(f'<dc:{name}>{escape(value)}</dc:{name}>' for name, value in elements if value)
+    return (
+        '<metadata><oai_dc:dc xmlns:oai_dc="http://www.openarchives.org/OAI/2.0/oai_dc/" '
+        'xmlns:dc="http://purl.org/dc/elements/1.1/" '
+        'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+        'xsi:schemaLocation="http://www.openarchives.org/OAI/2.0/oai_dc/ '
+        'http://www.openarchives.org/OAI/2.0/oai_dc.xsd">'
+        f'{body}</oai_dc:dc></metadata>'
+    )
+
+def _record(tenant, row):
+    return f'<record>{_header(tenant, row)}{_dublin_core(tenant, row)}</record>'
+
+def _envelope(base_url, args):
+    attributes = ''.join(f' {name}={quoteattr(value)}' for name, value in sorted(args.items()))
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<OAI-PMH xmlns="http://www.openarchives.org/OAI/2.0/" '
+        'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+        'xsi:schemaLocation="http://www.openarchives.org/OAI/2.0/ '
+        'http://www.openarchives.org/OAI/2.0/OAI-PMH.xsd">'
+        f'<responseDate>{datestamp(datetime.utcnow())}</responseDate>'
+        f'<request{attributes}>{escape(base_url)}</request>'
+    )
+
+def error_response(base_url, error, args=None):
+    # Arguments are echoed only when the request was well formed (spec 3.6)
+    echo = args if error.code not in ('badVerb', 'badArgument') else {}
+    return (f'{_envelope(base_url, echo or {})}'
+            f'<error code={quoteattr(error.code)}>{escape(error.message)}</error></OAI-PMH>')
+
+def identify(tenant, base_url):
+    owner = db.session.get(User, tenant.owner_id) if tenant.owner_id else None
+    admin_email = (tenant.contact_email or (owner.email if owner else None)
+                   or current_app.config.get('MAIL_DEFAULT_SENDER'))
+    return (
+        f'{_envelope(base_url, {"verb": "Identify"})}<Identify>'
+        f'<repositoryName>{escape(tenant.name)}</repositoryName>'
+        f'<baseURL>{escape(base_url)}</baseURL>'
+        '<protocolVersion>2.0</protocolVersion>'
+        f'<adminEmail>{escape(admin_email)}</adminEmail>'
+        f'<earliestDatestamp>{datestamp(earliest_datestamp(tenant.id))}</earliestDatestamp>'
+        '<deletedRecord>transient</deletedRecord>'
+        f'<granularity>{GRANULARITY}</granularity>'
+        '</Identify></OAI-PMH>'
+    )
+
+def list_metadata_formats(tenant, base_url, args):
+    if 'identifier' in args:
+        get_row(tenant, args['identifier'])
+    formats = ''.join(
+        f'<metadataFormat><metadataPrefix>{prefix}</metadataPrefix><schema>{schema}</schema>'
+        f'<metadataNamespace>{namespace}</metadataNamespace></metadataFormat>'
+        for prefix, (schema, namespace) in METADATA_FORMATS.items()
+    )
+    return (f'{_envelope(base_url, {"verb": "ListMetadataFormats", **args})}'
+            f'<ListMetadataFormats>{formats}</ListMetadataFormats></OAI-PMH>')
+
+def get_row(tenant, identifier):
+    row = _published(tenant.id).filter(Article.id == parse_identifier(tenant, identifier)).first()
+    if row is None:
+        raise OAIError('idDoesNotExist', f'Unknown identifier: {identifier}')
+    return row
+
+def get_record(tenant, base_url, args):
+    if args['metadataPrefix'] not in METADATA_FORMATS:
+        raise OAIError('cannotDisseminateFormat', f'Unsupported metadataPrefix: {args["metadataPrefix"]}')
+    row = get_row(tenant, args['identifier'])
+    return (f'{_envelope(base_url, {"verb": "GetRecord", **args})}'
+            f'<GetRecord>{_record(tenant, row)}</GetRecord></OAI-PMH>')
+
+def list_records(tenant, base_url, verb, args):
+    """Return an iterator over the response's UTF-8 chunks.
+
+    The first record is read before anything is yielded, so an empty result
+    can still be reported as ``noRecordsMatch`` (raised here, not mid-stream).
+    """
+    prefix, since, until, last_published_at, last_id = list_request(args)
+    page_size = current_app.config.get('OAI_PAGE_SIZE', DEFAULT_PAGE_SIZE)
+    columns, item = (RECORD_COLUMNS, _record) if verb == 'ListRecords' else (HEADER_COLUMNS, _header)
+    query = list_query(tenant.id, since, until, last_published_at, last_id, page_size, columns)
+    rows = iter(query.execution_options(yield_per=BATCH_SIZE, stream_results=True))
+    first = next(rows, None)
+    if first is None:
+        raise OAIError('noRecordsMatch', 'No records match the request.')
+    return _stream_list(tenant, base_url, verb, args, item, prefix, since, until, first, rows, page_size)
+
+def _stream_list(tenant, base_url, verb, args, item, prefix, since, until, first, rows, page_size):
+    batch = [_envelope(base_url, {'verb': verb, **args}), f'<{verb}>']
+    last, sent = None, 0
+    for row in _chain(first, rows):
+        if sent == page_size:
+            # The extra row only says another page follows
+            batch.append(f'<resumptionToken>{encode_token(prefix, since, until, last.published_at, last.id)}'
+                         '</resumptionToken>')
+            break
+        batch.append(item(tenant, row))
+        last, sent = row, sent + 1
+        if len(batch) >= BATCH_SIZE:
+            yield ''.join(batch).encode('utf-8')
+            batch = []
+    else:
+        if 'resumptionToken' in args:
+            # The last page of a resumed list carries an empty token
+            batch.append('<resumptionToken/>')
+    batch.append(f'</{verb}></OAI-PMH>')
+    yield ''.join(batch).encode('utf-8')
+
+def _chain(first, rows):
+    yield first
+    yield from rows
@@ -0,0 +1,88 @@
+"""Lightweight read projections for article list pages.
+
+List pages show titles, badges and dates, but a full ``Article`` row also
+carries ``abstract`` and the review notes, each potentially long text (the
+body itself lives in ``article_bodies``, see app/core/content_store.py).
+These helpers restrict list queries to the columns a list row needs.
+
+Touching a column left out of the projection still works, it just costs a
+lazy load per row; add the column to the projection instead.
+
+The same applies to relationships: each list view declares the related rows
+its template renders in ``LIST_RELATIONS`` and they are joined into the list
+query, so a page costs a fixed number of queries instead of one per row.
+"""
+
+from sqlalchemy import func
+from sqlalchemy.orm import joinedload, load_only, with_expression
+
+from app.models.article import Article
+from app.models.tenant import Tenant
+from app.models.user import User
+
+ABSTRACT_PREVIEW_LENGTH = 300
+
+# Everything a list row may render or link with; excludes the Text columns and body_id
+ARTICLE_LIST_COLUMNS = (
+    Article.id,
+    Article.tenant_id,
+    Article.author_id,
+    Article.reviewer_id,
+    Article.editor_id,
+    Article.title,
+    Article.keywords,
+    Article.co_authors,
+    Article.category,
+    Article.status,
+    Article.doi,
+    Article.views,
+    Article.created_at,
+    Article.updated_at,
+    Article.submitted_at,
+    Article.published_at,
+)
+
+# Enough of a user for names, emails and role checks
+USER_SUMMARY_COLUMNS = (User.id, User.first_name, User.last_name, User.email, User.role, User.tenant_id)
+TENANT_SUMMARY_COLUMNS = (Tenant.id, Tenant.name, Tenant.subdomain)
+
+# Many-to-one, so joinedload adds no rows and keeps LIMIT/keyset paging exact
+RELATION_LOADERS = {
+    'author':   lambda: joinedload(Article.author).load_only(*USER_SUMMARY_COLUMNS),
+    'reviewer': lambda: joinedload(Article.reviewer).load_only(*USER_SUMMARY_COLUMNS),
+    'editor':   lambda: joinedload(Article.editor).load_only(*USER_SUMMARY_COLUMNS),
+    'tenant':   lambda: joinedload(Article.tenant).load_only(*TENANT_SUMMARY_COLUMNS),
+}
+
+# Relationships each list view renders per row
+LIST_RELATIONS = {
+    'my_articles':              (),
+    'editor_panel':             ('author', 'reviewer'),
+    'journal_articles':         ('author',),
+    'search':                   ('author', 'tenant'),
+    'dashboard':                ('author',),
+    'trending':                 ('author',),
+    'admin.submissions':        ('author', 'tenant'),
+    'admin.assigned_reviewers': ('author', 'reviewer', 'tenant'),
+    'admin.featured_content':   (),
+    'article_view':             ('author',),
+    'feed':                     ('author',),
+}
+
+def article_list_options(*extra_columns):
+    """Loader option limiting an ``Article`` query to list columns."""
+    return load_only(*ARTICLE_LIST_COLUMNS, *extra_columns)
+
+def article_list_query(query, *extra_columns, view=None):
+    """Apply the list projection and ``view``'s eager loads to ``query``."""
+    options = [article_list_options(*extra_columns)]
+    if view is not None:
+        options.extend(RELATION_LOADERS[name]() for name in LIST_RELATIONS[view])
+    return query.options(*options)
+
+def with_abstract_preview(query, length=ABSTRACT_PREVIEW_LENGTH):
+    """Populate ``Article.abstract_preview`` with the first ``length`` characters.
+
+    Lets result lists show a snippet without transferring whole abstracts.
+    """
+    return query.options(with_expression(Article.abstract_preview, func.substr(Article.abstract, 1, length)))
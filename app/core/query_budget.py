@@ -0,0 +1,56 @@
+"""Count the SQL statements a block of code issues.
+
+``scripts/check_query_budgets.py`` uses this to hold list pages to a fixed
+number of queries however many rows they show; it is also handy in a shell
+when chasing an N+1::
+
+    with QueryCounter() as counter:
+        client.get('/articles/editor/panel')
+    print(counter.count, counter.statements)
+"""
+
+import threading
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app.core.extensions import db
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+class QueryCounter:
+    """Record statements executed on ``engine`` by the current thread."""
+
+    def __init__(self, engine=None):
+        self.engine = engine
+        self.statements = []
+        self._thread_id = None
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if threading.get_ident() == self._thread_id:
+            self.statements.append(statement)
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def __enter__(self):
+        if self.engine is None:
+            self.engine = db.engine
+        self._thread_id = threading.get_ident()
+        event.listen(self.engine, 'before_cursor_execute', self._record)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        event.remove(self.engine, 'before_cursor_execute', self._record)
+        return False
+
+@contextmanager
+def query_budget(limit, label='block'):
+    """Raise ``QueryBudgetExceeded`` if the block runs more than ``limit`` queries."""
+    with QueryCounter() as counter:
+        yield counter
+    if counter.count > limit:
+        listing = '\n'.join(f'  {i}. {" ".join(sql.split())[:160]}' for i, sql in enumerate(counter.statements, 1))
+        raise QueryBudgetExceeded(f'{label} ran {counter.count} queries, budget is {limit}:\n{listing}')
@@ -0,0 +1,289 @@
+"""Report exports streamed straight from the database.
+
+Rows are read as plain column tuples with ``yield_per`` (a server-side cursor
+where the driver supports one) and encoded batch by batch, so memory use
+does not grow with the size of the table. CSV and gzip-compressed CSV can be
+streamed to the client directly; XLSX, and anything over
+``REPORT_STREAM_MAX_ROWS``, is written to disk by a background job and
+downloaded from the reports page.
+"""
+
+import csv
+import io
+import os
+import zipfile
+import zlib
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from flask import current_app
+
+from app.core.extensions import db
+from app.core.jobs import submit_job
+from app.models.article import Article
+from app.models.article_status_event import ArticleStatusEvent
+from app.models.report_export import ReportExport
+from app.models.tenant import Tenant
+from app.models.transaction import Transaction
+from app.models.user import User
+
+BATCH_SIZE = 1000
+DEFAULT_STREAM_MAX_ROWS = 50000
+
+DATE_RANGES = {
+    '7d': timedelta(days=7),
+    '30d': timedelta(days=30),
+    '90d': timedelta(days=90),
+    '1y': timedelta(days=365),
+    'all': None,
+}
+
+FORMATS = {
+    'csv':    ('text/csv', 'csv'),
+    'csv.gz': ('application/gzip', 'csv.gz'),
+    'xlsx':   ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'xlsx'),
+}
+STREAMABLE_FORMATS = ('csv', 'csv.gz')
+
+# report type -> (title, [(header, column)], date column, extra joins)
+REPORTS = {
+    'users': ('Users', [
+        ('ID', User.id), ('First Name', User.first_name), ('Last Name', User.last_name),
+        ('Email', User.email), ('Role', User.role), ('Journal ID', User.tenant_id),
+        ('Active', User.is_active), ('Created', User.created_at), ('Last Login', User.last_login),
+    ], User.created_at, ()),
+    'journals': ('Journals', [
+        ('ID', Tenant.id), ('Name', Tenant.name), ('Subdomain', Tenant.subdomain),
+        ('Plan', Tenant.plan), ('Active', Tenant.is_active), ('Verified', Tenant.is_verified),
+        ('Owner ID', Tenant.owner_id), ('Created', Tenant.created_at),
+    ], Tenant.created_at, ()),
+    'articles': ('Articles', [
+        ('ID', Article.id), ('Journal ID', Article.tenant_id), ('Author ID', Article.author_id),
+        ('Title', Article.title), ('Status', Article.status), ('Category', Article.category),
+        ('Views', Article.views), ('DOI', Article.doi), ('Created', Article.created_at),
+        ('Submitted', Article.submitted_at), ('Published', Article.published_at),
+    ], Article.created_at, ()),
+    'revenue': ('Transactions', [
+        ('ID', Transaction.id), ('Journal ID', Transaction.tenant_id),
+        ('Subscription ID', Transaction.subscription_id), ('Amount', Transaction.amount),
+        ('Currency', Transaction.currency), ('Status', Transaction.status),
+        ('Payment Method', Transaction.payment_method), ('Plan', Transaction.plan),
+        ('Reference', Transaction.reference_id), ('Created', Transaction.created_at),
+        ('Approved', Transaction.approved_at),
+    ], Transaction.created_at, ()),
+    'submissions': ('Submissions', [
+        ('Article ID', Article.id), ('Journal', Tenant.name), ('Title', Article.title),
+        ('Category', Article.category), ('Status', Article.status), ('Reviewer ID', Article.reviewer_id),
+        ('Editor ID', Article.editor_id), ('Submitted', Article.submitted_at),
+        ('Published', Article.published_at),
+    ], Article.submitted_at, ((Tenant, Tenant.id == Article.tenant_id),)),
+    'activity': ('Status Changes', [
+        ('ID', ArticleStatusEvent.id), ('Article ID', ArticleStatusEvent.article_id),
+        ('Journal ID', ArticleStatusEvent.tenant_id), ('Actor ID', ArticleStatusEvent.actor_id),
+        ('From', ArticleStatusEvent.from_status), ('To', ArticleStatusEvent.to_status),
+        ('At', ArticleStatusEvent.created_at),
+    ], ArticleStatusEvent.created_at, ()),
+}
+
+def report_query(report_type, date_range='all'):
+    """Return ``(headers, query)`` selecting plain column tuples."""
+    _, columns, date_column, joins = REPORTS[report_type]
+    query = db.session.query(*[column for _, column in columns])
+    for target, onclause in joins:
+        query = query.join(target, onclause)
+    if report_type == 'submissions':
+        query = query.filter(Article.submitted_at.isnot(None))
+    span = DATE_RANGES.get(date_range)
+    if span is not None:
+        query = query.filter(date_column >= datetime.utcnow() - span)
+    primary = columns[0][1]
+    return [header for header, _ in columns], query.order_by(primary)
+
+def _stream_rows(query):
+    return query.execution_options(yield_per=BATCH_SIZE, stream_results=True)
+
+def _cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ', timespec='seconds')
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, bool):
+        return 'yes' if value else 'no'
+    return value
+
+def iter_csv(headers, query, progress=None):
+    """Yield UTF-8 CSV chunks of about ``BATCH_SIZE`` rows each.
+
+    ``progress['rows']``, when given, counts the data rows written.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(headers)
+    pending = 1
+    for row in _stream_rows(query):
+        writer.writerow([_cell(value) for value in row])
+        pending += 1
+        if progress is not None:
+            progress['rows'] = progress.get('rows', 0) + 1
+        if pending >= BATCH_SIZE:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+def iter_gzip(chunks):
+    """Gzip-compress a stream of byte chunks incrementally."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+def stream_report(report_type, fmt, date_range='all', progress=None):
+    """Yield the encoded bytes of a CSV or gzip CSV report."""
+    headers, query = report_query(report_type, date_range)
+    chunks = iter_csv(headers, query, progress)
+    return iter_gzip(chunks) if fmt == 'csv.gz' else chunks
+
+def report_filename(report_type, fmt, when=None):
+    stamp = (when or datetime.utcnow()).strftime('%Y%m%d-%H%M%S')
+    return f'{report_type}-{stamp}.{FORMATS[fmt][1]}'
+
+def should_run_in_background(report_type, fmt, date_range='all'):
+    if fmt not in STREAMABLE_FORMATS:
+        return True
+    limit = current_app.config.get('REPORT_STREAM_MAX_ROWS', DEFAULT_STREAM_MAX_ROWS)
+    _, query = report_query(report_type, date_range)
+    return query.order_by(None).limit(limit + 1).count() > limit
+
+# ── XLSX ───────────────────────────────────────
+_XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+_XLSX_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+_XLSX_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '</Relationships>'
+)
+
+def _xlsx_workbook(title):
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        f'<sheets><sheet name="{escape(title[:31])}" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    )
+
+def _xlsx_row(values):
+    cells = []
+    for value in values:
+        value = _cell(value)
+        if isinstance(value, (int, float)):
+            cells.append(f'<c><v>{value}</v></c>')
+        else:
+            cells.append(f'<c t="inlineStr"><is><t xml:space="preserve">{escape(str(value))}</t></is></c>')
+    return '<row>' + ''.join(cells) + '</row>'
+
+def write_xlsx(path, title, headers, query):
+    """Write a single-sheet workbook, streaming the sheet XML into the zip."""
+    rows = 0
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', _XLSX_CONTENT_TYPES)
+        archive.writestr('_rels/.rels', _XLSX_ROOT_RELS)
+        archive.writestr('xl/workbook.xml', _xlsx_workbook(title))
+        archive.writestr('xl/_rels/workbook.xml.rels', _XLSX_WORKBOOK_RELS)
+        with archive.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+            sheet.write(b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                        b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                        b'<sheetData>')
+            sheet.write(_xlsx_row(headers).encode('utf-8'))
+            batch = []
+            for row in _stream_rows(query):
+                batch.append(_xlsx_row(row))
+                rows += 1
+                if len(batch) >= BATCH_SIZE:
+                    sheet.write(''.join(batch).encode('utf-8'))
+                    batch = []
+            sheet.write(''.join(batch).encode('utf-8'))
+            sheet.write(b'</sheetData></worksheet>')
+    return rows
+
+# ── Background exports ─────────────────────────
+def export_dir():
+    path = Path(current_app.config.get('REPORT_EXPORT_DIR') or Path(current_app.instance_path) / 'exports')
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+def export_path(export):
+    return export_dir() / export.file_name
+
+def start_export(user_id, report_type, fmt, date_range='all'):
+    """Queue a background export and return its ``ReportExport`` row."""
+    export = ReportExport(user_id=user_id, report_type=report_type, format=fmt, date_range=date_range)
+    db.session.add(export)
+    db.session.commit()
+    submit_job(run_export, export.id)
+    return export
+
+def run_export(export_id):
+    export = ReportExport.query.get(export_id)
+    if export is None:
+        return
+    export.status = 'running'
+    db.session.commit()
+
+    file_name = report_filename(export.report_type, export.format, export.created_at)
+    path = export_dir() / file_name
+    try:
+        title, _, _, _ = REPORTS[export.report_type]
+        headers, query = report_query(export.report_type, export.date_range)
+        if export.format == 'xlsx':
+            rows = write_xlsx(path, title, headers, query)
+        else:
+            progress = {'rows': 0}
+            with open(path, 'wb') as out:
+                for chunk in stream_report(export.report_type, export.format, export.date_range, progress):
+                    out.write(chunk)
+            rows = progress['rows']
+    except Exception as exc:
+        db.session.rollback()
+        if path.exists():
+            path.unlink()
+        export.status = 'failed'
+        export.error = str(exc)[:1000]
+        export.finished_at = datetime.utcnow()
+        db.session.commit()
+        raise
+
+    export.status = 'completed'
+    export.row_count = rows
+    export.file_name = file_name
+    export.file_size = os.path.getsize(path)
+    export.finished_at = datetime.utcnow()
+    db.session.commit()
@@ -0,0 +1,191 @@
+"""Revenue analytics from completed transactions and subscriptions.
+
+Month totals come from grouped range queries on
+``transactions (status, created_at)``, one month at a time. Once a month is
+over its totals are stored in ``revenue_months`` / ``revenue_plan_months``
+and never aggregated again, so a page view only scans the current month's
+transactions no matter how long the history is.
+"""
+
+from datetime import date, datetime
+
+from sqlalchemy import func, or_
+from sqlalchemy.exc import IntegrityError
+
+from app.core.extensions import db
+from app.models.revenue_month import RevenueMonth, RevenuePlanMonth
+from app.models.subscription import Subscription
+from app.models.transaction import Transaction
+
+ACTIVE_SUBSCRIPTION_STATUSES = ('active', 'trialing')
+
+def _month_start(value):
+    return date(value.year, value.month, 1)
+
+def _next_month(month):
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+def _as_datetime(day):
+    return datetime(day.year, day.month, day.day)
+
+def _month_totals(month):
+    """Aggregate one month straight from the base tables."""
+    start, end = _as_datetime(month), _as_datetime(_next_month(month))
+    by_plan = (
+        db.session.query(Transaction.plan, func.count(Transaction.id), func.coalesce(func.sum(Transaction.amount), 0.0))
+        .filter(Transaction.status == 'completed',
+                Transaction.created_at >= start,
+                Transaction.created_at < end)
+        .group_by(Transaction.plan)
+        .all()
+    )
+    new_subscriptions = Subscription.query.filter(
+        Subscription.created_at >= start, Subscription.created_at < end
+    ).count()
+    cancellations = Subscription.query.filter(
+        Subscription.status == 'cancelled',
+        Subscription.cancelled_at >= start,
+        Subscription.cancelled_at < end,
+    ).count()
+    active_at_start = Subscription.query.filter(
+        Subscription.started_at < start,
+        or_(Subscription.cancelled_at.is_(None), Subscription.cancelled_at >= start),
+    ).count()
+
+    row = RevenueMonth(
+        month=month,
+        revenue=float(sum(total for _, _, total in by_plan)),
+        transactions=sum(count for _, count, _ in by_plan),
+        new_subscriptions=new_subscriptions,
+        cancellations=cancellations,
+        active_at_start=active_at_start,
+    )
+    row.plans = [
+        RevenuePlanMonth(month=month, plan=plan or 'other', revenue=float(total), transactions=count)
+        for plan, count, total in by_plan
+    ]
+    return row
+
+def _first_revenue_month():
+    first = db.session.query(func.min(Transaction.created_at)).filter(
+        Transaction.status == 'completed'
+    ).scalar()
+    return _month_start(first) if first else None
+
+def _closed_months(first, current):
+    """Return cached rows for ``first`` up to the month before ``current``,
+    computing and storing any that are missing."""
+    if first is None or first >= current:
+        return []
+    cached = {
+        row.month: row
+        for row in RevenueMonth.query.filter(RevenueMonth.month >= first, RevenueMonth.month < current).all()
+    }
+    missing = []
+    month = first
+    while month < current:
+        if month not in cached:
+            missing.append(_month_totals(month))
+        month = _next_month(month)
+    if missing:
+        db.session.add_all(missing)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Another request filled the same months first; its rows are identical.
+            db.session.rollback()
+            return RevenueMonth.query.filter(RevenueMonth.month >= first, RevenueMonth.month < current) \
+                .order_by(RevenueMonth.month).all()
+        for row in missing:
+            cached[row.month] = row
+    return [cached[key] for key in sorted(cached)]
+
+def invalidate_revenue_month(when):
+    """Drop the cached totals of the month containing ``when``.
+
+    Call when a transaction in a closed month changes status, e.g. an
+    offline payment approved after the month ended. Does not commit.
+    """
+    RevenueMonth.query.filter_by(month=_month_start(when)).delete(synchronize_session=False)
+    RevenuePlanMonth.query.filter_by(month=_month_start(when)).delete(synchronize_session=False)
+
+def recurring_revenue():
+    """Return ``(mrr, {plan: mrr}, paying_subscriptions)`` from active subscriptions."""
+    now = datetime.utcnow()
+    rows = (
+        db.session.query(Subscription.plan, Subscription.billing_cycle,
+                         func.count(Subscription.id), func.coalesce(func.sum(Subscription.amount), 0.0))
+        .filter(Subscription.status.in_(ACTIVE_SUBSCRIPTION_STATUSES),
+                Subscription.plan != 'free',
+                or_(Subscription.expires_at.is_(None), Subscription.expires_at > now))
+        .group_by(Subscription.plan, Subscription.billing_cycle)
+        .all()
+    )
+    by_plan = {}
+    paying = 0
+    for plan, cycle, count, total in rows:
+        monthly = float(total) / 12 if cycle == 'annual' else float(total)
+        by_plan[plan] = by_plan.get(plan, 0.0) + monthly
+        paying += count
+    return sum(by_plan.values()), by_plan, paying
+
+def active_subscription_count():
+    now = datetime.utcnow()
+    return Subscription.query.filter(
+        Subscription.status.in_(ACTIVE_SUBSCRIPTION_STATUSES),
+        or_(Subscription.expires_at.is_(None), Subscription.expires_at > now),
+    ).count()
+
+def revenue_overview(months=12, today=None):
+    """Return headline stats plus monthly and per-plan revenue.
+
+    ``monthly`` holds the last ``months`` months oldest first, the current
+    month computed live and the rest from the closed-month cache.
+    """
+    current = _month_start(today or datetime.utcnow())
+    closed = _closed_months(_first_revenue_month(), current)
+    this_month = _month_totals(current)
+
+    window = closed[-(months - 1):] if months > 1 else []
+    window.append(this_month)
+    monthly = [
+        {
+            'month': row.month,
+            'revenue': row.revenue,
+            'transactions': row.transactions,
+            'by_plan': {p.plan: p.revenue for p in row.plans},
+            'churn_rate': row.churn_rate,
+        }
+        for row in window
+    ]
+
+    by_plan = {}
+    for row in window:
+        for p in row.plans:
+            by_plan[p.plan] = by_plan.get(p.plan, 0.0) + p.revenue
+
+    mrr, mrr_by_plan, paying = recurring_revenue()
+    last_closed = closed[-1] if closed else None
+    stats = {
+        'total_revenue': sum(row.revenue for row in closed) + this_month.revenue,
+        'monthly_revenue': this_month.revenue,
+        'yearly_revenue': sum(row.revenue for row in closed if row.month.year == current.year) + this_month.revenue,
+        'mrr': mrr,
+        'arr': mrr * 12,
+        'active_subscriptions': active_subscription_count(),
+        'paying_subscriptions': paying,
+        'churn_rate': last_closed.churn_rate if last_closed else this_month.churn_rate,
+    }
+    return {
+        'stats': stats,
+        'monthly': monthly,
+        'by_plan': sorted(by_plan.items(), key=lambda item: item[1], reverse=True),
+        'mrr_by_plan': sorted(mrr_by_plan.items(), key=lambda item: item[1], reverse=True),
+    }
+
+def rebuild_revenue_cache():
+    """Drop and recompute every closed month. Returns the number of months."""
+    RevenuePlanMonth.query.delete(synchronize_session=False)
+    RevenueMonth.query.delete(synchronize_session=False)
+    db.session.commit()
+    return len(_closed_months(_first_revenue_month(), _month_start(datetime.utcnow())))
@@ -0,0 +1,330 @@
+"""Reviewer suggestions from a precomputed expertise and workload index.
+
+A member's profile is built from the articles they have reviewed and the
+ones they have had accepted or published: the articles' keywords and
+category, counted with their weights, plus the member's open review count.
+Profiles are stored in ``reviewer_profiles`` and, keyword by keyword, in
+``reviewer_terms``, an inverted index keyed on (journal, keyword). Suggesting
+reviewers for an article therefore reads the postings of that article's own
+keywords, not every member's history, and stays a few indexed queries in a
+journal with thousands of members.
+
+Candidates are ranked by
+
+    overlap = sum(article weight * member weight over shared terms) / member norm
+    score   = overlap / (1 + REVIEWER_WORKLOAD_PENALTY * open reviews)
+
+so expertise comes first and busy reviewers sink. Members with no overlap
+fill any remaining slots, least loaded first.
+
+An assignment or decision rebuilds the profiles of the members it touches
+(the reviewer, the previous reviewer and the author) from their own articles,
+in the same transaction; ``flask analytics rebuild-reviewer-profiles``
+recomputes every profile.
+"""
+
+import heapq
+import math
+from collections import Counter
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import func, or_
+from sqlalchemy.orm import load_only
+
+from app.core.extensions import db
+from app.core.projections import USER_SUMMARY_COLUMNS
+from app.models.article import Article
+from app.models.reviewer_profile import ReviewerProfile, ReviewerTerm
+from app.models.user import User
+
+DEFAULT_SUGGESTIONS = 5
+DEFAULT_WORKLOAD_PENALTY = 0.5
+
+KEYWORD_WEIGHT = 1.0
+CATEGORY_WEIGHT = 0.5
+MAX_TERM_LENGTH = 120
+CATEGORY_PREFIX = 'category:'
+
+AUTHORED_STATUSES = ('accepted', 'published')
+DECIDED_STATUSES = ('accepted', 'rejected', 'published')
+BATCH_SIZE = 500
+
+class Suggestion:
+    """One suggested reviewer for an article."""
+
+    def __init__(self, user, score, open_reviews, matched):
+        self.user = user
+        self.score = score
+        self.open_reviews = open_reviews
+        self.matched = matched
+
+    @property
+    def keywords(self):
+        """Matched keywords, without the category."""
+        return [term for term in self.matched if not term.startswith(CATEGORY_PREFIX)]
+
+    def to_dict(self):
+        return {
+            'id': self.user.id,
+            'name': self.user.full_name,
+            'score': round(self.score, 4),
+            'open_reviews': self.open_reviews,
+            'matched': self.matched,
+        }
+
+def _term(text):
+    return ' '.join(text.lower().split())[:MAX_TERM_LENGTH]
+
+def article_terms(keywords, category):
+    """``{term: weight}`` for an article's comma-separated keywords and category."""
+    terms = {}
+    for keyword in (keywords or '').split(','):
+        term = _term(keyword)
+        if term:
+            terms[term] = KEYWORD_WEIGHT
+    if category:
+        terms[_term(CATEGORY_PREFIX + category)] = CATEGORY_WEIGHT
+    return terms
+
+# Profiles
+
+def refresh_reviewer_profiles(user_ids):
+    """Rebuild the profiles of ``user_ids`` from their articles.
+
+    Runs in the caller's transaction; returns the number of profiles written.
+    """
+    ids = sorted({user_id for user_id in user_ids if user_id})
+    written = 0
+    for start in range(0, len(ids), BATCH_SIZE):
+        written += _refresh_batch(ids[start:start + BATCH_SIZE])
+    return written
+
+def refresh_profiles_for(articles, *user_ids):
+    """Refresh the profiles an assignment or decision on ``articles`` affects.
+
+    That is each article's reviewer and author, plus ``user_ids`` (say, a
+    reviewer who was just replaced).
+    """
+    touched = set(user_ids)
+    for article in articles:
+        touched.update((article.reviewer_id, article.author_id))
+    return refresh_reviewer_profiles(touched)
+
+def _refresh_batch(ids):
+    tenants = dict(db.session.query(User.id, User.tenant_id).filter(User.id.in_(ids)))
+    if not tenants:
+        return 0
+    terms = {user_id: Counter() for user_id in tenants}
+    counts = {user_id: Counter() for user_id in tenants}
+
+    rows = db.session.query(
+        Article.author_id, Article.reviewer_id, Article.status, Article.keywords, Article.category,
+    ).filter(or_(Article.author_id.in_(ids), Article.reviewer_id.in_(ids)))
+    for author_id, reviewer_id, status, keywords, category in rows:
+        weights = article_terms(keywords, category)
+        if reviewer_id in terms:
+            terms[reviewer_id].update(weights)
+            if status == 'under_review':
+                counts[reviewer_id]['open_reviews'] += 1
+            elif status in DECIDED_STATUSES:
+                counts[reviewer_id]['completed_reviews'] += 1
+        if author_id in terms and status in AUTHORED_STATUSES:
+            terms[author_id].update(weights)
+            counts[author_id]['authored'] += 1
+
+    ReviewerTerm.query.filter(ReviewerTerm.user_id.in_(ids)).delete(synchronize_session=False)
+    ReviewerProfile.query.filter(ReviewerProfile.user_id.in_(ids)).delete(synchronize_session=False)
+    now = datetime.utcnow()
+    db.session.execute(ReviewerProfile.__table__.insert(), [
+        {
+            'user_id': user_id,
+            'tenant_id': tenant_id,
+            'open_reviews': counts[user_id]['open_reviews'],
+            'completed_reviews': counts[user_id]['completed_reviews'],
+            'authored': counts[user_id]['authored'],
+            'norm': math.sqrt(sum(w * w for w in terms[user_id].values())),
+            'updated_at': now,
+        }
+        for user_id, tenant_id in tenants.items()
+    ])
+    postings = [
+        {'user_id': user_id, 'term': term, 'tenant_id': tenants[user_id], 'weight': weight}
+        for user_id, weights in terms.items()
+        for term, weight in weights.items()
+    ]
+    if postings:
+        db.session.execute(ReviewerTerm.__table__.insert(), postings)
+    return len(tenants)
+
+def rebuild_reviewer_profiles():
+    """Recompute the profile of every member who can review."""
+    ids = [user_id for (user_id,) in db.session.query(User.id).filter(User.role.in_(User.REVIEWER_ROLES))]
+    written = refresh_reviewer_profiles(ids)
+    db.session.commit()
+    return written
+
+# Suggestions
+
+def _penalty():
+    return current_app.config.get('REVIEWER_WORKLOAD_PENALTY', DEFAULT_WORKLOAD_PENALTY)
+
+def _limit(limit):
+    return limit or current_app.config.get('REVIEWER_SUGGESTIONS', DEFAULT_SUGGESTIONS)
+
+def _gate(terms):
+    """Terms that make a member a candidate for an article.
+
+    The keywords, or the category if the article has none: a category is
+    shared by too many members to narrow anything down on its own, so it
+    only adds to the score of members who match a keyword.
+    """
+    keywords = [term for term in terms if not term.startswith(CATEGORY_PREFIX)]
+    return keywords or list(terms)
+
+def _rank(terms, postings, profiles, exclude, limit, penalty):
+    """Best ``limit`` of the members in ``postings`` as ``(score, user_id, matched)``.
+
+    ``postings`` maps user id to ``{term: weight}`` for the article's terms
+    only; ``profiles`` maps user id to ``(open_reviews, norm)``.
+    """
+    scored = []
+    for user_id, weights in postings.items():
+        if user_id in exclude or user_id not in profiles:
+            continue
+        open_reviews, norm = profiles[user_id]
+        if not norm:
+            continue
+        overlap = sum(terms[term] * weight for term, weight in weights.items()) / norm
+        scored.append((overlap / (1 + penalty * open_reviews), -open_reviews, -user_id))
+    ranked = []
+    for score, _, neg_id in heapq.nlargest(limit, scored):
+        weights = postings[-neg_id]
+        ranked.append((score, -neg_id, sorted(weights, key=lambda term: -terms[term] * weights[term])))
+    return ranked
+
+def _candidates(tenant_ids, terms):
+    """Subquery of the members whose profile has any of ``terms``."""
+    return db.session.query(ReviewerTerm.user_id).filter(
+        ReviewerTerm.tenant_id.in_(tenant_ids), ReviewerTerm.term.in_(terms),
+    )
+
+def _reviewer_members():
+    return User.query.filter(User.role.in_(User.REVIEWER_ROLES), User.is_active.is_(True))
+
+def suggest_reviewers(article, limit=None):
+    """Suggested reviewers for ``article``, best first, as ``Suggestion`` objects.
+
+    Members of the article's journal who can review, excluding its author.
+    """
+    limit = _limit(limit)
+    terms = article_terms(article.keywords, article.category)
+    members = _reviewer_members().filter(User.tenant_id == article.tenant_id, User.id != article.author_id)
+
+    postings, profiles = {}, {}
+    if terms:
+        rows = (
+            db.session.query(ReviewerTerm.user_id, ReviewerTerm.term, ReviewerTerm.weight,
+                             ReviewerProfile.open_reviews, ReviewerProfile.norm)
+            .join(ReviewerProfile, ReviewerProfile.user_id == ReviewerTerm.user_id)
+            .join(User, User.id == ReviewerTerm.user_id)
+            .filter(ReviewerTerm.tenant_id == article.tenant_id, ReviewerTerm.term.in_(list(terms)),
+                    ReviewerTerm.user_id.in_(_candidates([article.tenant_id], _gate(terms))),
+                    User.tenant_id == article.tenant_id, User.role.in_(User.REVIEWER_ROLES),
+                    User.is_active.is_(True), User.id != article.author_id)
+        )
+        for user_id, term, weight, open_reviews, norm in rows:
+            postings.setdefault(user_id, {})[term] = weight
+            profiles[user_id] = (open_reviews, norm)
+    ranked = _rank(terms, postings, profiles, set(), limit, _penalty())
+
+    users = {}
+    if ranked:
+        users = {u.id: u for u in members.options(load_only(*USER_SUMMARY_COLUMNS))
+                 .filter(User.id.in_([user_id for _, user_id, _ in ranked]))}
+    suggestions = [
+        Suggestion(users[user_id], score, profiles[user_id][0], matched)
+        for score, user_id, matched in ranked if user_id in users
+    ]
+
+    # Fill up with the least loaded members
+    if len(suggestions) < limit:
+        open_reviews = func.coalesce(ReviewerProfile.open_reviews, 0)
+        rest = (
+            members.with_entities(User, open_reviews)
+            .options(load_only(*USER_SUMMARY_COLUMNS))
+            .outerjoin(ReviewerProfile, ReviewerProfile.user_id == User.id)
+            .order_by(open_reviews, User.id)
+        )
+        if users:
+            rest = rest.filter(User.id.notin_(list(users)))
+        rest = rest.limit(limit - len(suggestions))
+        suggestions.extend(Suggestion(user, 0.0, count, []) for user, count in rest)
+    return suggestions
+
+def reviewer_choices(articles, limit=None):
+    """Reviewer members for the journals of ``articles`` and suggestions for each.
+
+    Returns ``(members, suggestions)``: members by tenant id, ordered by
+    name, and a list of ``Suggestion`` per article id. Costs two queries
+    however many articles there are, for list pages that offer a reviewer
+    picker on every row.
+    """
+    limit = _limit(limit)
+    tenant_ids = {a.tenant_id for a in articles}
+    if not tenant_ids:
+        return {}, {}
+
+    members, profiles, active = {}, {}, {}
+    rows = (
+        db.session.query(User, func.coalesce(ReviewerProfile.open_reviews, 0),
+                         func.coalesce(ReviewerProfile.norm, 0.0))
+        .options(load_only(*USER_SUMMARY_COLUMNS, User.is_active))
+        .outerjoin(ReviewerProfile, ReviewerProfile.user_id == User.id)
+        .filter(User.tenant_id.in_(tenant_ids), User.role.in_(User.REVIEWER_ROLES))
+        .order_by(User.first_name, User.last_name)
+    )
+    for user, open_reviews, norm in rows:
+        members.setdefault(user.tenant_id, []).append(user)
+        if user.is_active:
+            profiles[user.id] = (open_reviews, norm)
+            active[user.id] = user
+
+    terms_by_article = {a.id: article_terms(a.keywords, a.category) for a in articles}
+    all_terms = set().union(*terms_by_article.values())
+    gates = set().union(*(_gate(terms) for terms in terms_by_article.values()))
+    member_terms = {}   # user_id -> {term: weight}
+    holders = {}        # (tenant_id, term) -> {user_id}
+    if all_terms and profiles:
+        rows = db.session.query(ReviewerTerm.tenant_id, ReviewerTerm.user_id, ReviewerTerm.term, ReviewerTerm.weight) \
+            .filter(ReviewerTerm.tenant_id.in_(tenant_ids), ReviewerTerm.term.in_(list(all_terms)),
+                    ReviewerTerm.user_id.in_(_candidates(tenant_ids, list(gates))))
+        for tenant_id, user_id, term, weight in rows:
+            if user_id in active and active[user_id].tenant_id == tenant_id:
+                member_terms.setdefault(user_id, {})[term] = weight
+                holders.setdefault((tenant_id, term), set()).add(user_id)
+
+    least_loaded = {
+        tenant_id: sorted((u for u in users if u.id in active), key=lambda u: (profiles[u.id][0], u.id))
+        for tenant_id, users in members.items()
+    }
+    penalty = _penalty()
+    suggestions = {}
+    for article in articles:
+        terms = terms_by_article[article.id]
+        candidates = set().union(*(holders.get((article.tenant_id, term), ()) for term in _gate(terms)))
+        postings = {
+            user_id: {term: weight for term, weight in member_terms[user_id].items() if term in terms}
+            for user_id in candidates
+        }
+        ranked = _rank(terms, postings, profiles, {article.author_id}, limit, penalty)
+        picked = [Suggestion(active[user_id], score, profiles[user_id][0], matched)
+                  for score, user_id, matched in ranked]
+        chosen = {s.user.id for s in picked} | {article.author_id}
+        for user in least_loaded.get(article.tenant_id, []):
+            if len(picked) >= limit:
+                break
+            if user.id not in chosen:
+                picked.append(Suggestion(user, 0.0, profiles[user.id][0], []))
+        suggestions[article.id] = picked
+    return members, suggestions
@@ -0,0 +1,244 @@
+"""Delta-encoded revision history for article title, abstract and content.
+
+Saving an article only queues a ``pending`` revision: the new title and
+abstract plus a reference to the (already content-addressed) body, which
+costs one small insert. A background job then encodes pending revisions in
+order, each one either as a full snapshot or as line edits against the
+revision before it, and drops the pending copy.
+
+Every ``REVISION_SNAPSHOT_INTERVAL``-th revision (1, 11, 21, ... by default)
+is a full snapshot, so rebuilding any revision replays at most
+``interval - 1`` deltas. Pending revisions hold complete text and count as
+snapshots until they are encoded.
+"""
+
+import json
+import threading
+import zlib
+from difflib import SequenceMatcher
+
+from flask import current_app
+from sqlalchemy import func
+from sqlalchemy.orm import joinedload, load_only
+
+from app.core.extensions import db
+from app.core.jobs import submit_job
+from app.models.article_revision import ArticleRevision
+
+FIELDS = ('title', 'abstract', 'content')
+DIFF_CONTEXT_LINES = 3
+
+# Encoding reads the previous revision, so one article's revisions must not
+# be encoded by two jobs at once
+_encode_lock = threading.Lock()
+
+def _lines(text):
+    return (text or '').splitlines(keepends=True)
+
+def _pack(obj):
+    return zlib.compress(json.dumps(obj, separators=(',', ':')).encode('utf-8'))
+
+def _unpack(data):
+    return json.loads(zlib.decompress(data).decode('utf-8'))
+
+def encode_delta(old, new):
+    """Line edits turning ``old`` into ``new``.
+
+    ``[['=', n], ['-', n], ['+', [lines]]]``: keep ``n`` lines, drop ``n``
+    lines, insert lines.
+    """
+    old_lines, new_lines = _lines(old), _lines(new)
+    ops = []
+    matcher = SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            ops.append(['=', i2 - i1])
+            continue
+        if i2 > i1:
+            ops.append(['-', i2 - i1])
+        if j2 > j1:
+            ops.append(['+', new_lines[j1:j2]])
+    return ops
+
+def apply_delta(old, ops):
+    old_lines = _lines(old)
+    out, pos = [], 0
+    for op, arg in ops:
+        if op == '=':
+            out.extend(old_lines[pos:pos + arg])
+            pos += arg
+        elif op == '-':
+            pos += arg
+        else:
+            out.extend(arg)
+    return ''.join(out)
+
+def _is_snapshot_number(number, interval):
+    return (number - 1) % max(interval, 1) == 0
+
+def _pending_fields(revision):
+    return {
+        'title': revision.title,
+        'abstract': revision.abstract,
+        'content': revision.body.text if revision.body is not None else None,
+    }
+
+def _apply(fields, revision):
+    """Fields of ``revision`` given the fields of the revision before it."""
+    if revision.kind == 'pending':
+        return _pending_fields(revision)
+    payload = _unpack(revision.data)
+    if revision.kind == 'full':
+        return payload
+    fields = dict(fields)
+    for name, ops in payload.items():
+        fields[name] = apply_delta(fields[name], ops)
+    return fields
+
+def revision_fields(article_id, number):
+    """Rebuild ``{'title', 'abstract', 'content'}`` as of revision ``number``."""
+    base = db.session.query(func.max(ArticleRevision.number)).filter(
+        ArticleRevision.article_id == article_id,
+        ArticleRevision.number <= number,
+        ArticleRevision.kind != 'delta',
+    ).scalar()
+    if base is None:
+        return None
+    chain = ArticleRevision.query.filter(
+        ArticleRevision.article_id == article_id,
+        ArticleRevision.number.between(base, number),
+    ).order_by(ArticleRevision.number).all()
+    fields = None
+    for revision in chain:
+        fields = _apply(fields, revision)
+    return fields
+
+# Recording (request path)
+
+def text_state(article):
+    """What ``record_revision`` compares; take it before changing the article."""
+    return (article.title, article.abstract, article.body)
+
+def _next_number(article):
+    if article.id is None:
+        return 1
+    latest = db.session.query(func.max(ArticleRevision.number)).filter_by(article_id=article.id).scalar()
+    return (latest or 0) + 1
+
+def _queue(article, number, state, author_id):
+    title, abstract, body = state
+    revision = ArticleRevision(
+        article=article, number=number, kind='pending', title=title, abstract=abstract,
+        body=body, author_id=author_id, status=article.status,
+    )
+    db.session.add(revision)
+    return revision
+
+def record_revision(article, author_id=None, before=None):
+    """Queue the article's current text as its next revision.
+
+    ``before`` is ``text_state(article)`` from before an edit: nothing is
+    recorded when the text did not change, and an article saved for the
+    first time since history began gets its earlier text as revision 1.
+    Call ``encode_revisions_later`` once the transaction has committed.
+    """
+    state = text_state(article)
+    if before is not None and before[0] == state[0] and before[1] == state[1] and before[2] is state[2]:
+        return None
+    number = _next_number(article)
+    if before is not None and number == 1:
+        _queue(article, 1, before, None)
+        number = 2
+    return _queue(article, number, state, author_id)
+
+def encode_revisions_later(article_id):
+    submit_job(encode_pending_revisions, article_id)
+
+# Encoding (background)
+
+def encode_pending_revisions(article_id):
+    """Encode the article's pending revisions in order; returns how many."""
+    interval = current_app.config.get('REVISION_SNAPSHOT_INTERVAL', 10)
+    with _encode_lock:
+        pending = ArticleRevision.query.filter_by(article_id=article_id, kind='pending') \
+            .order_by(ArticleRevision.number).all()
+        previous_number, previous = None, None
+        for revision in pending:
+            fields = _pending_fields(revision)
+            if not _is_snapshot_number(revision.number, interval):
+                if previous_number != revision.number - 1:
+                    previous = revision_fields(article_id, revision.number - 1)
+            if previous is None or _is_snapshot_number(revision.number, interval):
+                revision.kind, revision.data = 'full', _pack(fields)
+            else:
+                changes = {name: encode_delta(previous[name], fields[name])
+                           for name in FIELDS if (previous[name] or '') != (fields[name] or '')}
+                revision.kind, revision.data = 'delta', _pack(changes)
+            revision.title = revision.abstract = None
+            revision.body = None
+            previous_number, previous = revision.number, fields
+        db.session.commit()
+        return len(pending)
+
+def encode_all_pending_revisions():
+    """Catch up on revisions a failed or lost job left pending."""
+    article_ids = [row[0] for row in db.session.query(ArticleRevision.article_id)
+                   .filter_by(kind='pending').distinct()]
+    return sum(encode_pending_revisions(article_id) for article_id in article_ids)
+
+# Display
+
+def revision_history(article_id):
+    """Revisions of an article, newest first, without their text."""
+    return ArticleRevision.query.options(
+        load_only(ArticleRevision.id, ArticleRevision.article_id, ArticleRevision.number,
+                  ArticleRevision.kind, ArticleRevision.author_id, ArticleRevision.status,
+                  ArticleRevision.created_at),
+        joinedload(ArticleRevision.author),
+    ).filter_by(article_id=article_id).order_by(ArticleRevision.number.desc()).all()
+
+def _hunks(old, ops, context=DIFF_CONTEXT_LINES):
+    """Group ``ops`` into hunks of ``(tag, line)`` with ``context`` equal lines around changes."""
+    old_lines = _lines(old)
+    rows, pos = [], 0
+    for op, arg in ops:
+        if op == '=':
+            rows.extend((' ', line) for line in old_lines[pos:pos + arg])
+            pos += arg
+        elif op == '-':
+            rows.extend(('-', line) for line in old_lines[pos:pos + arg])
+            pos += arg
+        else:
+            rows.extend(('+', line) for line in arg)
+
+    changed = [i for i, (tag, _) in enumerate(rows) if tag != ' ']
+    hunks, start, end = [], None, None
+    for i in changed:
+        if start is not None and i - context <= end + context:
+            end = i
+            continue
+        if start is not None:
+            hunks.append(rows[max(start - context, 0):end + context + 1])
+        start = end = i
+    if start is not None:
+        hunks.append(rows[max(start - context, 0):end + context + 1])
+    return hunks
+
+def revision_diff(article_id, old_number, new_number):
+    """``{field: hunks}`` for the fields that differ between two revisions.
+
+    Adjacent revisions reuse the stored line edits; other pairs are diffed here.
+    """
+    old = revision_fields(article_id, old_number)
+    if old is None:
+        return {}
+    stored = None
+    if new_number == old_number + 1:
+        revision = ArticleRevision.query.filter_by(article_id=article_id, number=new_number).first()
+        if revision is not None and revision.kind == 'delta':
+            stored = _unpack(revision.data)
+    if stored is None:
+        new = revision_fields(article_id, new_number) or {}
+        stored = {name: encode_delta(old[name], new.get(name))
+                  for name in FIELDS if (old[name] or '') != (new.get(name) or '')}
+    return {name: _hunks(old[name], stored[name]) for name in FIELDS if name in stored}
@@ -0,0 +1,281 @@
+"""Precompressed XML sitemaps of published articles and active journals.
+
+There is one platform-wide set of sitemaps and one per active journal, each
+under its own directory of ``SITEMAP_DIR``:
+
+* ``platform/journals-<n>.xml.gz``: active journals' public pages
+* ``platform/articles-<n>.xml.gz``: published articles of active journals
+* ``journal-<id>/pages.xml.gz``: the journal's public pages
+* ``journal-<id>/articles-<n>.xml.gz``: the journal's published articles
+* ``sitemap.xml.gz`` in each directory: the sitemap index over the others
+
+Rows are chunked by id range, ``n = id // SITEMAP_URLS_PER_FILE`` (at most
+50,000, the protocol's limit), so a row always belongs to the same chunk and
+a change rewrites only the chunks its rows fall in. Publishing or
+unpublishing articles rewrites their article chunks from a post-commit
+status hook; toggling a journal rewrites its journals chunk, the platform
+article chunks holding its articles and its own directory. Each rewrite ends
+with the directory's index, which is just a listing of its chunk files.
+
+Files are gzipped once when written and served as they are to clients that
+accept gzip. A chunk is written to a temporary file and renamed into place,
+so readers never see half a file. ``flask analytics build-sitemaps``
+rebuilds everything.
+"""
+
+import gzip
+import os
+import re
+import shutil
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlsplit
+from xml.sax.saxutils import escape
+
+from flask import Response, abort, current_app, request, send_file
+
+from app.core.extensions import db
+from app.core.status_hooks import on_status_change
+from app.models.article import Article
+from app.models.tenant import Tenant
+
+MAX_URLS_PER_FILE = 50000
+BATCH_SIZE = 1000
+DEFAULT_MAX_AGE = 3600
+
+PLATFORM = 'platform'
+INDEX = 'sitemap'
+SCOPE_PATTERN = re.compile(r'^(platform|journal-\d+)$')
+NAME_PATTERN = re.compile(r'^(sitemap|pages|journals-\d+|articles-\d+)$')
+
+NAMESPACE = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+# Serialises reading rows and writing files within the process, so a chunk
+# written later always reflects a later database state
+_write_lock = threading.Lock()
+
+def sitemap_root():
+    path = Path(current_app.config.get('SITEMAP_DIR') or Path(current_app.instance_path) / 'sitemaps')
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+def urls_per_file():
+    # At least two, so a journal's two URLs always fit one file
+    return max(2, min(current_app.config.get('SITEMAP_URLS_PER_FILE', MAX_URLS_PER_FILE), MAX_URLS_PER_FILE))
+
+def journals_per_file():
+    # Two URLs per journal
+    return urls_per_file() // 2
+
+def journal_scope(tenant_id):
+    return f'journal-{tenant_id}'
+
+def sitemap_path(scope, name):
+    return sitemap_root() / scope / f'{name}.xml.gz'
+
+def _url_builder():
+    """URL adapter for absolute links; works outside a request, so jobs can use it."""
+    base = urlsplit(current_app.config.get('SITEMAP_BASE_URL') or 'http://localhost:5000')
+    adapter = current_app.url_map.bind(base.netloc, script_name=base.path or '/', url_scheme=base.scheme)
+    return lambda endpoint, **values: adapter.build(endpoint, values, force_external=True)
+
+def _lastmod(when):
+    return when.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+def _write(scope, name, root, entries):
+    """Write ``entries`` (XML fragments) inside a ``root`` element to a gzipped
+    file, or delete the file when there are none. Returns the entry count."""
+    path = sitemap_path(scope, name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # A unique temp file per writer: other processes may refresh the same file
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp',
+                                     delete=False) as raw:
+        tmp = Path(raw.name)
+    count = 0
+    try:
+        with gzip.GzipFile(tmp, 'wb', mtime=0) as out:
+            out.write(f'<?xml version="1.0" encoding="UTF-8"?>\n<{root} xmlns="{NAMESPACE}">\n'.encode())
+            batch = []
+            for entry in entries:
+                batch.append(entry)
+                count += 1
+                if len(batch) >= BATCH_SIZE:
+                    out.write(''.join(batch).encode('utf-8'))
+                    batch = []
+            out.write(''.join(batch).encode('utf-8'))
+            out.write(f'</{root}>\n'.encode())
+        if count:
+            os.chmod(tmp, 0o644)
+            os.replace(tmp, path)
+        else:
+            tmp.unlink()
+            path.unlink(missing_ok=True)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return count
+
+def _url(loc, lastmod=None):
+    lastmod = f'<lastmod>{_lastmod(lastmod)}</lastmod>' if lastmod else ''
+    return f'<url><loc>{escape(loc)}</loc>{lastmod}</url>\n'
+
+def _stream(query):
+    return query.execution_options(yield_per=BATCH_SIZE, stream_results=True)
+
+# ── Chunks ─────────────────────────────────────
+def _article_chunk(scope, chunk, tenant_id=None):
+    size = urls_per_file()
+    query = db.session.query(Article.id, Article.published_at).filter(
+        Article.status == 'published', Article.id >= chunk * size, Article.id < (chunk + 1) * size,
+    )
+    if tenant_id is None:
+        query = query.join(Tenant, Tenant.id == Article.tenant_id).filter(Tenant.is_active.is_(True))
+    else:
+        query = query.filter(Article.tenant_id == tenant_id)
+    build = _url_builder()
+    return _write(scope, f'articles-{chunk}', 'urlset', (
+        _url(build('articles.view', article_id=article_id), published_at)
+        for article_id, published_at in _stream(query.order_by(Article.id))
+    ))
+
+def _journal_urls(build, subdomain, updated_at):
+    yield _url(build('tenants.view_journal', subdomain=subdomain), updated_at)
+    yield _url(build('articles.journal_articles', subdomain=subdomain), updated_at)
+
+def _journals_chunk(chunk):
+    size = journals_per_file()
+    query = db.session.query(Tenant.subdomain, Tenant.updated_at).filter(
+        Tenant.is_active.is_(True), Tenant.id >= chunk * size, Tenant.id < (chunk + 1) * size,
+    ).order_by(Tenant.id)
+    build = _url_builder()
+    return _write(PLATFORM, f'journals-{chunk}', 'urlset', (
+        url for subdomain, updated_at in _stream(query) for url in _journal_urls(build, subdomain, updated_at)
+    ))
+
+def _chunk_sort_key(path):
+    kind, _, number = path.name[:-len('.xml.gz')].rpartition('-')
+    return (kind or number, int(number) if number.isdigit() else -1)
+
+def _write_index(scope):
+    directory = sitemap_root() / scope
+    files = sorted((p for p in directory.glob('*.xml.gz') if p.name != f'{INDEX}.xml.gz'), key=_chunk_sort_key)
+    build = _url_builder()
+    entries = (
+        f'<sitemap><loc>{escape(build("main.sitemap_file", scope=scope, name=p.name[:-len(".xml.gz")]))}</loc>'
+        f'<lastmod>{_lastmod(datetime.utcfromtimestamp(p.stat().st_mtime))}</lastmod></sitemap>\n'
+        for p in files
+    )
+    if not _write(scope, INDEX, 'sitemapindex', entries) and directory.is_dir() and scope != PLATFORM:
+        directory.rmdir()
+
+def _article_chunks(query):
+    size = urls_per_file()
+    return sorted(chunk for (chunk,) in query.with_entities(Article.id // size).distinct())
+
+# ── Updates ────────────────────────────────────
+def refresh_article_sitemaps(article_ids):
+    """Rewrite the chunks holding ``article_ids``, platform-wide and per journal."""
+    size = urls_per_file()
+    with _write_lock:
+        rows = db.session.query(Article.id, Article.tenant_id, Tenant.is_active).join(
+            Tenant, Tenant.id == Article.tenant_id,
+        ).filter(Article.id.in_(list(article_ids))).all()
+        platform_chunks = sorted({article_id // size for article_id, _, _ in rows})
+        journal_chunks = sorted({(tenant_id, article_id // size) for article_id, tenant_id, active in rows if active})
+        for chunk in platform_chunks:
+            _article_chunk(PLATFORM, chunk)
+        for tenant_id, chunk in journal_chunks:
+            _article_chunk(journal_scope(tenant_id), chunk, tenant_id)
+        for tenant_id in sorted({tenant_id for tenant_id, _ in journal_chunks}):
+            if not sitemap_path(journal_scope(tenant_id), 'pages').is_file():
+                # First sitemap of a new journal: list its pages, here and platform-wide
+                _journal_pages(db.session.get(Tenant, tenant_id))
+                _journals_chunk(tenant_id // journals_per_file())
+            _write_index(journal_scope(tenant_id))
+        if platform_chunks:
+            _write_index(PLATFORM)
+    return len(platform_chunks) + len(journal_chunks)
+
+def _journal_pages(tenant):
+    build = _url_builder()
+    return _write(journal_scope(tenant.id), 'pages', 'urlset',
+                  _journal_urls(build, tenant.subdomain, tenant.updated_at))
+
+def _build_journal(tenant):
+    scope = journal_scope(tenant.id)
+    shutil.rmtree(sitemap_root() / scope, ignore_errors=True)
+    if not tenant.is_active:
+        return 0
+    written = bool(_journal_pages(tenant))
+    published = Article.query.filter(Article.tenant_id == tenant.id, Article.status == 'published')
+    for chunk in _article_chunks(published):
+        written += bool(_article_chunk(scope, chunk, tenant.id))
+    _write_index(scope)
+    return written
+
+def refresh_journal_sitemaps(tenant_id):
+    """Bring the sitemaps up to date after a journal was activated or deactivated."""
+    tenant = db.session.get(Tenant, tenant_id)
+    if tenant is None:
+        return 0
+    with _write_lock:
+        _journals_chunk(tenant.id // journals_per_file())
+        published = Article.query.filter(Article.tenant_id == tenant.id, Article.status == 'published')
+        chunks = _article_chunks(published)
+        for chunk in chunks:
+            _article_chunk(PLATFORM, chunk)
+        _write_index(PLATFORM)
+        _build_journal(tenant)
+    return len(chunks) + 1
+
+def build_sitemaps():
+    """Rebuild every sitemap from scratch; returns the number of files written."""
+    with _write_lock:
+        root = sitemap_root()
+        for child in root.iterdir():
+            if child.is_dir():
+                shutil.rmtree(child)
+            else:
+                child.unlink()
+        size = journals_per_file()
+        written = 0
+        tenant_ids = [tenant_id for (tenant_id,) in db.session.query(Tenant.id).filter(Tenant.is_active.is_(True))]
+        for chunk in sorted({tenant_id // size for tenant_id in tenant_ids}):
+            written += bool(_journals_chunk(chunk))
+        published = Article.query.join(Tenant, Tenant.id == Article.tenant_id).filter(
+            Article.status == 'published', Tenant.is_active.is_(True),
+        )
+        for chunk in _article_chunks(published):
+            written += bool(_article_chunk(PLATFORM, chunk))
+        _write_index(PLATFORM)
+        for tenant in Tenant.query.filter(Tenant.is_active.is_(True)).order_by(Tenant.id):
+            written += _build_journal(tenant)
+    return written
+
+@on_status_change('published', leaving=True)
+def _refresh_published(article_ids, status):
+    refresh_article_sitemaps(article_ids)
+
+# ── Serving ────────────────────────────────────
+def send_sitemap(scope, name):
+    """Serve a stored sitemap, gzipped as stored when the client accepts it."""
+    if not SCOPE_PATTERN.match(scope) or not NAME_PATTERN.match(name):
+        abort(404)
+    path = sitemap_path(scope, name)
+    if not path.is_file():
+        abort(404)
+    max_age = current_app.config.get('SITEMAP_MAX_AGE', DEFAULT_MAX_AGE)
+    if 'gzip' in request.accept_encodings:
+        response = send_file(path, mimetype='application/xml', conditional=True, max_age=max_age)
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        def inflate():
+            with gzip.open(path, 'rb') as source:
+                while chunk := source.read(64 * 1024):
+                    yield chunk
+        response = Response(inflate(), mimetype='application/xml')
+        response.cache_control.max_age = max_age
+    response.vary.add('Accept-Encoding')
+    return response
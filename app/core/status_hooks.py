@@ -0,0 +1,67 @@
+"""Post-commit hooks for article status changes.
+
+Publishing (or unpublishing) an article changes state that lives outside its
+row: the trending ranking, and anything else that lists published articles.
+Keeping that derived state in the decision's transaction makes every
+decision wait for it, and updating it before the commit lets it run ahead of
+an article that is then rolled back. Instead, :func:`transition_article` and
+:func:`transition_articles` queue each change on the session, and once the
+transaction commits every hook registered for the new status (or, with
+``leaving``, for the status an article left) runs on the background job
+pool with the ids of those articles. A rollback drops the queue, so hooks
+only ever see committed changes.
+
+Hooks take ``(article_ids, status)``, run in their own session, and must be
+safe to run late or twice: they update caches and indexes that can be
+rebuilt, never the source of truth.
+"""
+
+from collections import defaultdict
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.jobs import submit_job
+
+PENDING_KEY = 'status_hooks.pending'
+
+# (hook, statuses or None for every status, also run for articles leaving them)
+_hooks = []
+
+def on_status_change(*statuses, leaving=False):
+    """Register the decorated function to run after articles reach ``statuses``
+    (any status when none are given). With ``leaving`` it also runs for
+    articles that moved out of one of ``statuses``, say, were unpublished."""
+    def register(fn):
+        if not any(hook is fn for hook, _, _ in _hooks):
+            _hooks.append((fn, frozenset(statuses) or None, leaving))
+        return fn
+    return register
+
+def queue_status_change(session, changes):
+    """Remember ``(article_id, previous status, new status)`` changes made in
+    ``session``'s current transaction. Per article, the status it had
+    before the transaction and its latest status are kept."""
+    pending = session.info.setdefault(PENDING_KEY, {})
+    for article_id, previous, status in changes:
+        before = pending[article_id][0] if article_id in pending else previous
+        pending[article_id] = (before, status)
+
+@event.listens_for(Session, 'after_commit')
+def _dispatch(session):
+    pending = session.info.pop(PENDING_KEY, None)
+    if not pending:
+        return
+    for hook, statuses, leaving in _hooks:
+        by_status = defaultdict(list)
+        for article_id, (before, status) in pending.items():
+            if statuses is None or status in statuses or (leaving and before in statuses):
+                by_status[status].append(article_id)
+        for status, article_ids in by_status.items():
+            submit_job(hook, sorted(article_ids), status)
+
+@event.listens_for(Session, 'after_transaction_end')
+def _discard(session, transaction):
+    # Runs after _dispatch on commit; anything still queued was rolled back
+    if transaction.parent is None:
+        session.info.pop(PENDING_KEY, None)
@@ -0,0 +1,287 @@
+"""Editorial KPIs from the article status-history stream.
+
+Every status change goes through :func:`transition_article`, which appends an
+``ArticleStatusEvent`` and adds the change's contribution to the
+``submission_trend_buckets`` row for its month, journal and category:
+
+* a *submission* is an article's first move to ``submitted``;
+* its *first review* is the first move out of ``under_review``;
+* its *decision* is the first move to ``accepted``, ``rejected`` or
+  ``published``; ``accepted`` and ``published`` count as acceptances.
+
+Review and decision times are measured from the first submission. The
+admin page sums a handful of buckets instead of replaying articles.
+
+Each change is also queued for the post-commit hooks in
+:mod:`app.core.status_hooks`.
+"""
+
+from datetime import date, datetime
+
+from sqlalchemy import func
+
+from app.core.extensions import db
+from app.core.status_hooks import queue_status_change
+from app.core.upsert import upsert_increment
+from app.models.article import Article
+from app.models.article_status_event import ArticleStatusEvent
+from app.models.submission_trend import SubmissionTrendBucket
+
+DECISION_STATUSES = ('accepted', 'rejected', 'published')
+ACCEPTED_STATUSES = ('accepted', 'published')
+COUNTERS = ('submissions', 'first_reviews', 'first_review_hours', 'decisions', 'decision_hours', 'accepted')
+
+class _ArticleHistory:
+    """What an article's earlier events mean for the KPIs."""
+
+    def __init__(self):
+        self.submitted_at = None
+        self.reviewed = False
+        self.decided = False
+
+    def apply(self, from_status, to_status, when):
+        """Fold one event in and return its bucket counters, or ``None``."""
+        counters = dict.fromkeys(COUNTERS, 0)
+        if to_status == 'submitted' and self.submitted_at is None:
+            self.submitted_at = when
+            counters['submissions'] = 1
+        if from_status == 'under_review' and not self.reviewed:
+            self.reviewed = True
+            if self.submitted_at is not None:
+                counters['first_reviews'] = 1
+                counters['first_review_hours'] = _hours(self.submitted_at, when)
+        if to_status in DECISION_STATUSES and not self.decided:
+            self.decided = True
+            if self.submitted_at is not None:
+                counters['decisions'] = 1
+                counters['decision_hours'] = _hours(self.submitted_at, when)
+                counters['accepted'] = int(to_status in ACCEPTED_STATUSES)
+        return counters if any(counters.values()) else None
+
+def _hours(start, end):
+    return max((end - start).total_seconds() / 3600, 0.0)
+
+def _month(value):
+    return date(value.year, value.month, 1)
+
+def _bucket_row(month, tenant_id, category, counters):
+    return {'month': month, 'tenant_id': tenant_id, 'category': category or '', **counters}
+
+def transition_article(article, status, actor_id=None, when=None):
+    """Move ``article`` to ``status`` and record the transition.
+
+    No-op when the status does not change. The article must have an id.
+    Does not commit.
+    """
+    previous = article.status
+    if previous == status:
+        return None
+    when = when or datetime.utcnow()
+
+    history = _ArticleHistory()
+    earlier = (
+        db.session.query(ArticleStatusEvent.from_status, ArticleStatusEvent.to_status, ArticleStatusEvent.created_at)
+        .filter(ArticleStatusEvent.article_id == article.id)
+        .order_by(ArticleStatusEvent.created_at, ArticleStatusEvent.id)
+    )
+    for from_status, to_status, created_at in earlier:
+        history.apply(from_status, to_status, created_at)
+
+    article.status = status
+    queue_status_change(db.session, [(article.id, previous, status)])
+    event = ArticleStatusEvent(
+        article_id=article.id,
+        tenant_id=article.tenant_id,
+        actor_id=actor_id,
+        from_status=previous,
+        to_status=status,
+        created_at=when,
+    )
+    db.session.add(event)
+
+    counters = history.apply(previous, status, when)
+    if counters:
+        upsert_increment(SubmissionTrendBucket,
+                         [_bucket_row(_month(when), article.tenant_id, article.category, counters)],
+                         key_columns=('month', 'tenant_id', 'category'), counters=COUNTERS)
+    return event
+
+def transition_articles(articles, status, actor_id=None, when=None):
+    """Batched :func:`transition_article` for many articles.
+
+    Reads every article's history in one query, inserts the events in one
+    statement and folds the bucket counters into one upsert. Articles
+    already in ``status`` are skipped. Does not commit; returns the articles
+    that changed.
+    """
+    changing = [article for article in articles if article.status != status]
+    if not changing:
+        return []
+    when = when or datetime.utcnow()
+
+    histories = {article.id: _ArticleHistory() for article in changing}
+    earlier = (
+        db.session.query(ArticleStatusEvent.article_id, ArticleStatusEvent.from_status,
+                         ArticleStatusEvent.to_status, ArticleStatusEvent.created_at)
+        .filter(ArticleStatusEvent.article_id.in_(list(histories)))
+        .order_by(ArticleStatusEvent.article_id, ArticleStatusEvent.created_at, ArticleStatusEvent.id)
+    )
+    for article_id, from_status, to_status, created_at in earlier:
+        histories[article_id].apply(from_status, to_status, created_at)
+
+    events = []
+    buckets = {}
+    month = _month(when)
+    for article in changing:
+        previous = article.status
+        article.status = status
+        events.append({
+            'article_id': article.id, 'tenant_id': article.tenant_id, 'actor_id': actor_id,
+            'from_status': previous, 'to_status': status, 'created_at': when,
+        })
+        counters = histories[article.id].apply(previous, status, when)
+        if counters:
+            key = (month, article.tenant_id, article.category or '')
+            bucket = buckets.setdefault(key, _bucket_row(month, article.tenant_id, article.category,
+                                                         dict.fromkeys(COUNTERS, 0)))
+            for name, value in counters.items():
+                bucket[name] += value
+
+    db.session.execute(ArticleStatusEvent.__table__.insert(), events)
+    queue_status_change(db.session, [(e['article_id'], e['from_status'], status) for e in events])
+    upsert_increment(SubmissionTrendBucket, list(buckets.values()),
+                     key_columns=('month', 'tenant_id', 'category'), counters=COUNTERS)
+    return changing
+
+def _summarise(rows):
+    out = []
+    for key, submissions, first_reviews, review_hours, decisions, decision_hours, accepted in rows:
+        out.append({
+            'key': key,
+            'submissions': submissions or 0,
+            'first_reviews': first_reviews or 0,
+            'avg_first_review_days': round(review_hours / first_reviews / 24, 1) if first_reviews else None,
+            'decisions': decisions or 0,
+            'avg_decision_days': round(decision_hours / decisions / 24, 1) if decisions else None,
+            'accepted': accepted or 0,
+            'acceptance_rate': round(accepted * 100.0 / decisions, 1) if decisions else None,
+        })
+    return out
+
+def _sums():
+    return (
+        func.sum(SubmissionTrendBucket.submissions),
+        func.sum(SubmissionTrendBucket.first_reviews),
+        func.sum(SubmissionTrendBucket.first_review_hours),
+        func.sum(SubmissionTrendBucket.decisions),
+        func.sum(SubmissionTrendBucket.decision_hours),
+        func.sum(SubmissionTrendBucket.accepted),
+    )
+
+def submission_trends(months=12, tenant_id=None, today=None):
+    """Return KPIs grouped by month, journal and category.
+
+    ``{'monthly': [...], 'by_tenant': [...], 'by_category': [...], 'totals': {...}}``;
+    every entry has ``key`` plus the counts, average days and acceptance rate.
+    Monthly rows run oldest first and include empty months.
+    """
+    current = _month(today or datetime.utcnow())
+    index = current.year * 12 + current.month - 1 - (months - 1)
+    first = date(index // 12, index % 12 + 1, 1)
+
+    def _grouped(column):
+        query = db.session.query(column, *_sums()).filter(SubmissionTrendBucket.month >= first)
+        if tenant_id:
+            query = query.filter(SubmissionTrendBucket.tenant_id == tenant_id)
+        return query.group_by(column)
+
+    by_month = {row['key']: row for row in _summarise(_grouped(SubmissionTrendBucket.month))}
+    monthly = []
+    for offset in range(months):
+        month = date((index + offset) // 12, (index + offset) % 12 + 1, 1)
+        monthly.append(by_month.get(month) or _summarise([(month, 0, 0, 0.0, 0, 0.0, 0)])[0])
+
+    totals_query = db.session.query(func.count(), *_sums()).filter(SubmissionTrendBucket.month >= first)
+    if tenant_id:
+        totals_query = totals_query.filter(SubmissionTrendBucket.tenant_id == tenant_id)
+
+    return {
+        'monthly': monthly,
+        'by_tenant': _summarise(_grouped(SubmissionTrendBucket.tenant_id)),
+        'by_category': _summarise(_grouped(SubmissionTrendBucket.category)),
+        'totals': _summarise([totals_query.one()])[0],
+    }
+
+def backfill_status_events():
+    """Synthesize history for articles that have no recorded events.
+
+    Uses ``submitted_at``, ``published_at`` and the current status, so it
+    only approximates when reviews and decisions happened. Does not commit.
+    """
+    has_events = db.session.query(ArticleStatusEvent.id).filter(
+        ArticleStatusEvent.article_id == Article.id
+    ).exists()
+    articles = (
+        db.session.query(Article.id, Article.tenant_id, Article.status, Article.created_at,
+                         Article.submitted_at, Article.updated_at, Article.published_at)
+        .filter(~has_events)
+        .execution_options(yield_per=500)
+    )
+    added = 0
+    for article_id, tenant_id, status, created_at, submitted_at, updated_at, published_at in articles:
+        if status == 'draft' or status is None:
+            continue
+        submitted = submitted_at or created_at or datetime.utcnow()
+        steps = [(None, 'submitted', submitted)]
+        decided_at = max(updated_at or submitted, submitted)
+        if status == 'under_review':
+            steps.append(('submitted', 'under_review', decided_at))
+        elif status in ('accepted', 'rejected'):
+            steps.append(('submitted', status, decided_at))
+        elif status == 'published':
+            steps.append(('submitted', 'published', max(published_at or decided_at, submitted)))
+        for from_status, to_status, when in steps:
+            db.session.add(ArticleStatusEvent(article_id=article_id, tenant_id=tenant_id,
+                                              from_status=from_status, to_status=to_status, created_at=when))
+            added += 1
+    return added
+
+def rebuild_submission_trends():
+    """Recompute every bucket by replaying the status-event stream.
+
+    Returns the number of events replayed.
+    """
+    backfill_status_events()
+    db.session.flush()
+
+    buckets = {}
+    replayed = 0
+    history = None
+    current_article = None
+    events = (
+        db.session.query(ArticleStatusEvent.article_id, ArticleStatusEvent.from_status,
+                         ArticleStatusEvent.to_status, ArticleStatusEvent.created_at,
+                         Article.tenant_id, Article.category)
+        .join(Article, Article.id == ArticleStatusEvent.article_id)
+        .order_by(ArticleStatusEvent.article_id, ArticleStatusEvent.created_at, ArticleStatusEvent.id)
+        .execution_options(yield_per=1000)
+    )
+    for article_id, from_status, to_status, created_at, tenant_id, category in events:
+        replayed += 1
+        if article_id != current_article:
+            current_article, history = article_id, _ArticleHistory()
+        counters = history.apply(from_status, to_status, created_at)
+        if not counters:
+            continue
+        key = (_month(created_at), tenant_id, category or '')
+        bucket = buckets.setdefault(key, dict.fromkeys(COUNTERS, 0))
+        for name, value in counters.items():
+            bucket[name] += value
+
+    SubmissionTrendBucket.query.delete(synchronize_session=False)
+    db.session.add_all([
+        SubmissionTrendBucket(month=month, tenant_id=tenant_id, category=category, **counters)
+        for (month, tenant_id, category), counters in buckets.items()
+    ])
+    db.session.commit()
+    return replayed
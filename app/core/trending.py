@@ -0,0 +1,302 @@
+"""Trending articles ranked by exponentially time-decayed activity.
+
+Every view or publish event adds ``weight * 2 ** (hours_since_epoch / half_life)``
+to an article's score. Scores are kept as log2 values relative to a fixed
+epoch, so an event only ever touches its own article and the ranking never
+has to be re-decayed: comparing log scores at any instant gives the same
+order as comparing the live decayed scores.
+
+Each process keeps the scores and a bounded top-N list per journal plus one
+platform-wide list in memory. Unpersisted deltas are merged into
+``article_trend_scores`` periodically, so several workers can share the table.
+Publishes and unpublishes are applied by post-commit status hooks, so a
+decision that rolls back never reaches the ranking.
+"""
+
+import bisect
+import heapq
+import math
+import threading
+import time
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import func
+from sqlalchemy.orm import load_only
+
+from app.core.extensions import db
+from app.core.projections import article_list_query
+from app.core.status_hooks import on_status_change
+from app.models.article import Article
+from app.models.trend_score import ArticleTrendScore
+
+EPOCH = datetime(2026, 1, 1)
+DEFAULT_HALF_LIFE_HOURS = 24
+DEFAULT_PUBLISH_WEIGHT = 10.0
+DEFAULT_TOP_N = 20
+DEFAULT_PERSIST_INTERVAL = 60
+
+PLATFORM = None
+
+def _log_add(a, b):
+    """log2(2**a + 2**b) without overflow; ``None`` stands for a zero score."""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    hi, lo = (a, b) if a >= b else (b, a)
+    return hi + math.log2(1 + 2 ** (lo - hi))
+
+class TrendingIndex:
+    def __init__(self, half_life_hours=DEFAULT_HALF_LIFE_HOURS, top_n=DEFAULT_TOP_N):
+        self.half_life_hours = half_life_hours
+        self.top_n = top_n
+        self._scores = {}    # article_id -> (tenant_id, log_score)
+        self._pending = {}   # article_id -> (tenant_id, log_delta) not yet persisted
+        self._top = {}       # scope -> sorted [(-log_score, article_id)], best first
+        self._lock = threading.RLock()
+
+    def _hours(self, when):
+        return (when - EPOCH).total_seconds() / 3600
+
+    def _log_weight(self, weight, when):
+        return self._hours(when) / self.half_life_hours + math.log2(weight)
+
+    def _offer(self, scope, article_id, log_score):
+        top = self._top.setdefault(scope, [])
+        for i, (_, aid) in enumerate(top):
+            if aid == article_id:
+                del top[i]
+                break
+        if len(top) < self.top_n or -log_score < top[-1][0]:
+            bisect.insort(top, (-log_score, article_id))
+            del top[self.top_n:]
+
+    def _set(self, article_id, tenant_id, log_score):
+        self._scores[article_id] = (tenant_id, log_score)
+        self._offer(PLATFORM, article_id, log_score)
+        self._offer(tenant_id, article_id, log_score)
+
+    def _refill(self, scope):
+        candidates = (
+            (-log_score, article_id)
+            for article_id, (tenant_id, log_score) in self._scores.items()
+            if scope is PLATFORM or tenant_id == scope
+        )
+        self._top[scope] = heapq.nsmallest(self.top_n, candidates)
+
+    def record(self, article_id, tenant_id, weight=1.0, when=None):
+        delta = self._log_weight(weight, when or datetime.utcnow())
+        with self._lock:
+            current = self._scores.get(article_id)
+            self._set(article_id, tenant_id, _log_add(current[1] if current else None, delta))
+            pending = self._pending.get(article_id)
+            self._pending[article_id] = (tenant_id, _log_add(pending[1] if pending else None, delta))
+
+    def remove(self, article_id):
+        with self._lock:
+            current = self._scores.pop(article_id, None)
+            self._pending.pop(article_id, None)
+            if current is None:
+                return
+            for scope in (PLATFORM, current[0]):
+                if any(aid == article_id for _, aid in self._top.get(scope, [])):
+                    self._refill(scope)
+
+    def top(self, tenant_id=PLATFORM, limit=5, now=None):
+        """Return ``[(article_id, decayed_score)]`` best first."""
+        now_log = self._hours(now or datetime.utcnow()) / self.half_life_hours
+        with self._lock:
+            entries = list(self._top.get(tenant_id, [])[:limit])
+        return [(article_id, 2 ** (-neg_log - now_log)) for neg_log, article_id in entries]
+
+    def load(self, rows):
+        with self._lock:
+            self._scores = {article_id: (tenant_id, log_score) for article_id, tenant_id, log_score in rows}
+            self._top = {}
+            scopes = {PLATFORM} | {tenant_id for tenant_id, _ in self._scores.values()}
+            for scope in scopes:
+                self._refill(scope)
+
+    def items(self):
+        with self._lock:
+            return list(self._scores.items())
+
+    def take_pending(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return pending
+
+    def restore_pending(self, pending):
+        with self._lock:
+            for article_id, (tenant_id, delta) in pending.items():
+                current = self._pending.get(article_id)
+                self._pending[article_id] = (tenant_id, _log_add(current[1] if current else None, delta))
+
+    def merge_persisted(self, article_id, tenant_id, log_score):
+        with self._lock:
+            if article_id in self._scores:
+                self._set(article_id, tenant_id, max(log_score, self._scores[article_id][1]))
+
+_index = None
+_index_lock = threading.Lock()
+_last_persist = time.monotonic()
+
+def get_trending_index():
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                config = current_app.config
+                index = TrendingIndex(
+                    half_life_hours=config.get('TRENDING_HALF_LIFE_HOURS', DEFAULT_HALF_LIFE_HOURS),
+                    top_n=config.get('TRENDING_TOP_N', DEFAULT_TOP_N),
+                )
+                index.load(db.session.query(
+                    ArticleTrendScore.article_id,
+                    ArticleTrendScore.tenant_id,
+                    ArticleTrendScore.log_score,
+                ).all())
+                _index = index
+    return _index
+
+def persist_trending():
+    """Merge unpersisted score deltas into article_trend_scores."""
+    global _last_persist
+    index = get_trending_index()
+    pending = index.take_pending()
+    _last_persist = time.monotonic()
+    if not pending:
+        return 0
+
+    try:
+        existing = {
+            row.article_id: row
+            for row in ArticleTrendScore.query.filter(ArticleTrendScore.article_id.in_(list(pending))).all()
+        }
+        merged = {}
+        for article_id, (tenant_id, delta) in pending.items():
+            row = existing.get(article_id)
+            if row is None:
+                row = ArticleTrendScore(article_id=article_id, tenant_id=tenant_id, log_score=delta)
+                db.session.add(row)
+            else:
+                row.log_score = _log_add(row.log_score, delta)
+            merged[article_id] = (tenant_id, row.log_score)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        index.restore_pending(pending)
+        raise
+
+    # Pick up deltas other workers persisted for the same articles.
+    for article_id, (tenant_id, log_score) in merged.items():
+        index.merge_persisted(article_id, tenant_id, log_score)
+    return len(merged)
+
+def _maybe_persist():
+    interval = current_app.config.get('TRENDING_PERSIST_INTERVAL', DEFAULT_PERSIST_INTERVAL)
+    if time.monotonic() - _last_persist < interval:
+        return
+    try:
+        persist_trending()
+    except Exception:
+        current_app.logger.exception('Persisting trending scores failed')
+
+def record_trending_view(article):
+    if article.status != 'published':
+        return
+    get_trending_index().record(article.id, article.tenant_id, weight=1.0)
+    _maybe_persist()
+
+def record_trending_publish(article):
+    weight = current_app.config.get('TRENDING_PUBLISH_WEIGHT', DEFAULT_PUBLISH_WEIGHT)
+    get_trending_index().record(article.id, article.tenant_id, weight=weight,
+                                when=article.published_at or datetime.utcnow())
+    _maybe_persist()
+
+@on_status_change('published')
+def _rank_published(article_ids, status):
+    """Give newly published articles their publish weight once the decision
+    has committed."""
+    published = Article.query.options(
+        load_only(Article.id, Article.tenant_id, Article.published_at)
+    ).filter(Article.id.in_(article_ids), Article.status == 'published')
+    for article in published:
+        record_trending_publish(article)
+
+@on_status_change('published', leaving=True)
+def _forget_unpublished(article_ids, status):
+    """Drop articles that were unpublished from every ranking once the
+    decision has committed, along with their persisted scores."""
+    if status == 'published':
+        return
+    # Skip any that were published again before this ran
+    republished = {
+        article_id for (article_id,) in db.session.query(Article.id).filter(
+            Article.id.in_(article_ids), Article.status == 'published',
+        )
+    }
+    article_ids = [article_id for article_id in article_ids if article_id not in republished]
+    if not article_ids:
+        return
+    index = get_trending_index()
+    for article_id in article_ids:
+        index.remove(article_id)
+    ArticleTrendScore.query.filter(ArticleTrendScore.article_id.in_(article_ids)).delete(synchronize_session=False)
+    db.session.commit()
+
+def trending_articles(tenant_id=PLATFORM, limit=5):
+    """Return the currently trending published articles, best first."""
+    ranked = get_trending_index().top(tenant_id, limit=limit)
+    if not ranked:
+        return []
+    by_id = {
+        a.id: a
+        for a in article_list_query(Article.query.filter(
+            Article.id.in_([article_id for article_id, _ in ranked]),
+            Article.status == 'published',
+        ), view='trending').all()
+    }
+    return [by_id[article_id] for article_id, _ in ranked if article_id in by_id]
+
+def rebuild_trending(days=14):
+    """Recompute all scores from publish dates and the daily view history."""
+    from app.models.article_view import ArticleViewDaily
+
+    global _index
+    config = current_app.config
+    index = TrendingIndex(
+        half_life_hours=config.get('TRENDING_HALF_LIFE_HOURS', DEFAULT_HALF_LIFE_HOURS),
+        top_n=config.get('TRENDING_TOP_N', DEFAULT_TOP_N),
+    )
+    since = datetime.utcnow() - timedelta(days=days)
+    publish_weight = config.get('TRENDING_PUBLISH_WEIGHT', DEFAULT_PUBLISH_WEIGHT)
+
+    published = db.session.query(Article.id, Article.tenant_id, Article.published_at).filter(
+        Article.status == 'published', Article.published_at >= since
+    )
+    for article_id, tenant_id, published_at in published:
+        index.record(article_id, tenant_id, weight=publish_weight, when=published_at)
+
+    daily = (
+        db.session.query(ArticleViewDaily.article_id, ArticleViewDaily.tenant_id,
+                         ArticleViewDaily.day, func.sum(ArticleViewDaily.count))
+        .join(Article, Article.id == ArticleViewDaily.article_id)
+        .filter(Article.status == 'published', ArticleViewDaily.day >= since.date())
+        .group_by(ArticleViewDaily.article_id, ArticleViewDaily.tenant_id, ArticleViewDaily.day)
+    )
+    for article_id, tenant_id, day, count in daily:
+        noon = datetime(day.year, day.month, day.day, 12)
+        index.record(article_id, tenant_id, weight=float(count), when=noon)
+
+    ArticleTrendScore.query.delete(synchronize_session=False)
+    db.session.add_all([
+        ArticleTrendScore(article_id=article_id, tenant_id=tenant_id, log_score=log_score)
+        for article_id, (tenant_id, log_score) in index.items()
+    ])
+    db.session.commit()
+    index.take_pending()
+    with _index_lock:
+        _index = index
+    return len(index.items())
@@ -0,0 +1,173 @@
+"""Chunked, resumable uploads of manuscripts and supplementary files.
+
+A client opens an upload with the file's name and size, then PUTs the bytes
+in chunks of at most ``UPLOAD_CHUNK_SIZE`` with a ``Content-Range`` header.
+Each chunk is copied from the request stream to a temp file in small blocks,
+so a worker never holds more than one block of a file in memory. After a
+dropped connection the client asks how many bytes arrived and continues from
+there. The last chunk moves the file into the content-addressed store
+(app/core/file_store.py) and attaches it to the article.
+"""
+
+import os
+import re
+import secrets
+from datetime import datetime, timedelta
+
+from flask import current_app, url_for
+from werkzeug.utils import secure_filename
+
+from app.core.extensions import db
+from app.core.file_store import BLOCK_SIZE, store_file, temp_dir
+from app.models.article_file import ArticleFile
+from app.models.upload_session import UploadSession
+
+PDF_MAGIC = b'%PDF-'
+SUPPLEMENTARY_EXTENSIONS = {
+    'pdf', 'csv', 'tsv', 'txt', 'json', 'xlsx', 'xls', 'docx', 'doc', 'zip', 'gz', 'tar',
+    'png', 'jpg', 'jpeg', 'gif', 'svg', 'mp4', 'webm', 'r', 'py', 'ipynb', 'tex', 'bib',
+}
+CONTENT_RANGE = re.compile(r'^bytes (\d+)-(\d+)/(\d+)$')
+
+class UploadError(Exception):
+    """A rejected upload request; ``status`` is the HTTP status to answer with."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+def parse_content_range(header):
+    """``(start, length, total)`` from ``bytes start-end/total``."""
+    match = CONTENT_RANGE.match((header or '').strip())
+    if not match:
+        raise UploadError('A Content-Range header of the form "bytes start-end/total" is required.')
+    start, end, total = (int(g) for g in match.groups())
+    if end < start:
+        raise UploadError('Invalid Content-Range.', 416)
+    return start, end - start + 1, total
+
+def _temp_path(upload):
+    return temp_dir() / f'{upload.id}.part'
+
+def start_upload(article, user_id, kind, filename, size, content_type=None):
+    """Open an upload session for a file of ``size`` bytes."""
+    if kind not in ArticleFile.KINDS:
+        raise UploadError(f'Unknown file kind: {kind!r}.')
+    name = secure_filename(filename or '')
+    extension = name.rsplit('.', 1)[-1].lower() if '.' in name else ''
+    if not name:
+        raise UploadError('A file name is required.')
+    if kind == 'manuscript' and extension != 'pdf':
+        raise UploadError('The manuscript must be a PDF.')
+    if kind == 'supplementary' and extension not in SUPPLEMENTARY_EXTENSIONS:
+        raise UploadError(f'.{extension or "?"} files cannot be attached.')
+    max_size = current_app.config.get('UPLOAD_MAX_SIZE', 100 * 1024 * 1024)
+    if not isinstance(size, int) or size <= 0:
+        raise UploadError('The file size is required.')
+    if size > max_size:
+        raise UploadError(f'Files may be at most {max_size // (1024 * 1024)} MB.', 413)
+
+    upload = UploadSession(
+        id=secrets.token_hex(16), user_id=user_id, article_id=article.id, kind=kind, filename=name,
+        content_type='application/pdf' if extension == 'pdf' else (content_type or 'application/octet-stream'),
+        total_size=size, received=0,
+    )
+    db.session.add(upload)
+    db.session.commit()
+    return upload
+
+def write_chunk(upload, stream, start, length, total):
+    """Append ``length`` bytes from ``stream`` at offset ``start``.
+
+    A chunk must start where the previous one ended; a short read (the client
+    went away) keeps what arrived. Completes the upload on the last byte.
+    """
+    if upload.is_complete:
+        raise UploadError('This upload is already complete.', 409)
+    if total != upload.total_size:
+        raise UploadError('Content-Range total does not match the upload size.', 416)
+    if start != upload.received:
+        raise UploadError(f'Expected a chunk starting at byte {upload.received}.', 409)
+    if start + length > upload.total_size:
+        raise UploadError('Chunk runs past the end of the file.', 416)
+    if length > current_app.config.get('UPLOAD_CHUNK_SIZE', 8 * 1024 * 1024):
+        raise UploadError('Chunk is larger than UPLOAD_CHUNK_SIZE.', 413)
+
+    path = _temp_path(upload)
+    written = 0
+    with open(path, 'r+b' if path.exists() else 'wb') as f:
+        # Drop bytes of an earlier chunk that arrived after its session update failed
+        f.seek(start)
+        f.truncate()
+        while written < length:
+            block = stream.read(min(BLOCK_SIZE, length - written))
+            if not block:
+                break
+            if start == 0 and written == 0 and upload.kind == 'manuscript' and not block.startswith(PDF_MAGIC):
+                raise UploadError('The manuscript does not look like a PDF.', 415)
+            f.write(block)
+            written += len(block)
+
+    upload.received = start + written
+    if upload.received == upload.total_size:
+        return complete_upload(upload)
+    db.session.commit()
+    return upload
+
+def complete_upload(upload):
+    """Store the finished temp file and attach it to the article."""
+    from app.models.article import Article
+
+    stored = store_file(_temp_path(upload), upload.content_type)
+    article = db.session.get(Article, upload.article_id)
+    if upload.kind == 'manuscript':
+        for previous in article.files.filter_by(kind='manuscript'):
+            db.session.delete(previous)
+    article_file = ArticleFile(
+        article_id=article.id, stored_file=stored, kind=upload.kind,
+        filename=upload.filename, uploaded_by=upload.user_id,
+    )
+    db.session.add(article_file)
+    db.session.flush()
+    if upload.kind == 'manuscript':
+        article.pdf_url = file_url(article_file)
+    article.updated_at = datetime.utcnow()  # new version for the fragment cache
+    upload.status = 'complete'
+    upload.article_file = article_file
+    db.session.commit()
+    return upload
+
+def file_url(article_file):
+    return url_for('articles.download_file', article_id=article_file.article_id,
+                   file_id=article_file.id, filename=article_file.filename)
+
+def upload_state(upload):
+    """JSON body describing an upload to the client."""
+    state = {
+        'id': upload.id,
+        'url': url_for('articles.upload_chunk', upload_id=upload.id),
+        'kind': upload.kind,
+        'filename': upload.filename,
+        'size': upload.total_size,
+        'offset': upload.received,
+        'chunk_size': current_app.config.get('UPLOAD_CHUNK_SIZE', 8 * 1024 * 1024),
+        'status': upload.status,
+    }
+    if upload.article_file is not None:
+        state['file'] = {'id': upload.article_file.id, 'url': file_url(upload.article_file)}
+    return state
+
+def prune_stale_uploads(max_age_hours=None):
+    """Delete open uploads idle longer than ``UPLOAD_SESSION_TTL_HOURS``, and their temp files."""
+    if max_age_hours is None:
+        max_age_hours = current_app.config.get('UPLOAD_SESSION_TTL_HOURS', 24)
+    cutoff = datetime.utcnow() - timedelta(hours=max_age_hours)
+    stale = UploadSession.query.filter(UploadSession.status == 'open', UploadSession.updated_at < cutoff).all()
+    for upload in stale:
+        path = _temp_path(upload)
+        if path.exists():
+            os.remove(path)
+        db.session.delete(upload)
+    db.session.commit()
+    return len(stale)
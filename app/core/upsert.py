@@ -0,0 +1,42 @@
+"""Batched "add to counter" upserts for pre-aggregated tables."""
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.core.extensions import db
+
+def _dialect_insert(table):
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'sqlite':
+        return sqlite.insert(table)
+    if dialect == 'postgresql':
+        return postgresql.insert(table)
+    return None
+
+def upsert_increment(model, rows, key_columns, counters=('count',)):
+    """Add each row's ``counters`` onto the row with the same key, or insert it.
+
+    Uses ``INSERT .. ON CONFLICT DO UPDATE`` on SQLite and PostgreSQL, one
+    statement for the whole batch. Other dialects fall back to
+    update-then-insert per row. Does not commit.
+    """
+    if not rows:
+        return
+    table = model.__table__
+    stmt = _dialect_insert(table)
+    if stmt is not None:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c[name] for name in key_columns],
+            set_={name: table.c[name] + stmt.excluded[name] for name in counters},
+        )
+        db.session.execute(stmt, rows)
+        return
+
+    for row in rows:
+        updated = model.query.filter_by(
+            **{name: row[name] for name in key_columns}
+        ).update(
+            {getattr(model, name): getattr(model, name) + row[name] for name in counters},
+            synchronize_session=False,
+        )
+        if not updated:
+            db.session.add(model(**row))
@@ -0,0 +1,167 @@
+"""Unique-view deduplication with time-rotated Bloom filters.
+
+A view is keyed on (visitor fingerprint, article_id). Each rotation period
+gets its own Bloom filter and the filters covering the window are checked
+together, so a repeat view inside the window is dropped in O(1).
+
+A new key is a false positive when any of the window's filters matches it,
+so each filter is sized for the share of ``error_rate`` that keeps the whole
+window at ``error_rate``: ``1 - (1 - error_rate) ** (1 / filters)``. A filter
+that fills up to ``capacity`` before its period ends is followed by a fresh
+one rather than overfilled. Up to ``capacity`` keys per period the window
+stays within ``error_rate`` and memory within ``max_memory_bytes``; past it
+memory grows by one filter per ``capacity`` extra keys and the error rate
+by at most the per-filter rate for each.
+"""
+
+import hashlib
+import math
+import re
+import threading
+import time
+from collections import deque
+
+from flask import current_app, request
+from flask_login import current_user
+
+DEFAULT_WINDOW_HOURS = 24
+DEFAULT_ROTATE_SECONDS = 3600
+DEFAULT_CAPACITY = 100000
+DEFAULT_ERROR_RATE = 0.01
+
+BOT_USER_AGENT = re.compile(
+    r'bot|crawl|spider|slurp|fetch|preview|monitor|curl|wget|python-requests|headless',
+    re.IGNORECASE,
+)
+
+class BloomFilter:
+    """Fixed-size Bloom filter sized for ``capacity`` keys at ``error_rate``."""
+
+    def __init__(self, capacity, error_rate):
+        if capacity <= 0:
+            raise ValueError('capacity must be positive')
+        if not 0 < error_rate < 1:
+            raise ValueError('error_rate must be between 0 and 1')
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'big')
+        h2 = int.from_bytes(digest[8:], 'big') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def __contains__(self, key):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def add(self, key):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    @property
+    def memory_bytes(self):
+        return len(self.bits)
+
+    @property
+    def estimated_error_rate(self):
+        """False-positive rate expected at the current fill."""
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+class RotatingBloomFilter:
+    """Sliding window of Bloom filters, one per ``rotate_seconds`` period."""
+
+    def __init__(self, window_seconds=DEFAULT_WINDOW_HOURS * 3600,
+                 rotate_seconds=DEFAULT_ROTATE_SECONDS,
+                 capacity=DEFAULT_CAPACITY, error_rate=DEFAULT_ERROR_RATE,
+                 clock=time.time):
+        self.rotate_seconds = rotate_seconds
+        self.max_filters = max(1, int(math.ceil(window_seconds / rotate_seconds)))
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.filter_error_rate = 1 - (1 - error_rate) ** (1 / self.max_filters)
+        self._clock = clock
+        self._filters = deque()  # (period, BloomFilter), oldest first
+        self._lock = threading.Lock()
+
+    def _rotate(self):
+        period = int(self._clock() // self.rotate_seconds)
+        while self._filters and self._filters[0][0] <= period - self.max_filters:
+            self._filters.popleft()
+        if (not self._filters or self._filters[-1][0] != period
+                or self._filters[-1][1].count >= self.capacity):
+            self._filters.append((period, BloomFilter(self.capacity, self.filter_error_rate)))
+        return self._filters[-1][1]
+
+    def __contains__(self, key):
+        """True if ``key`` was seen inside the window; does not record it."""
+        with self._lock:
+            self._rotate()
+            return any(key in bloom for _, bloom in self._filters)
+
+    def seen(self, key):
+        """Return True if ``key`` was seen inside the window, else record it."""
+        with self._lock:
+            current = self._rotate()
+            if any(key in bloom for _, bloom in self._filters):
+                return True
+            current.add(key)
+            return False
+
+    def stats(self):
+        with self._lock:
+            filters = [bloom for _, bloom in self._filters]
+        return {
+            'filters': len(filters),
+            'max_filters': self.max_filters,
+            'keys': sum(bloom.count for bloom in filters),
+            'capacity_per_filter': self.capacity,
+            'error_rate': self.error_rate,
+            'filter_error_rate': self.filter_error_rate,
+            'estimated_error_rate': 1 - math.prod(1 - bloom.estimated_error_rate for bloom in filters),
+            'memory_bytes': sum(bloom.memory_bytes for bloom in filters),
+            'max_memory_bytes': self.max_filters * BloomFilter(self.capacity, self.filter_error_rate).memory_bytes,
+        }
+
+_filter = None
+_filter_lock = threading.Lock()
+
+def get_view_filter():
+    global _filter
+    if _filter is None:
+        with _filter_lock:
+            if _filter is None:
+                config = current_app.config
+                _filter = RotatingBloomFilter(
+                    window_seconds=config.get('VIEW_DEDUP_WINDOW_HOURS', DEFAULT_WINDOW_HOURS) * 3600,
+                    rotate_seconds=config.get('VIEW_DEDUP_ROTATE_SECONDS', DEFAULT_ROTATE_SECONDS),
+                    capacity=config.get('VIEW_DEDUP_CAPACITY', DEFAULT_CAPACITY),
+                    error_rate=config.get('VIEW_DEDUP_ERROR_RATE', DEFAULT_ERROR_RATE),
+                )
+    return _filter
+
+def visitor_fingerprint():
+    """Stable per-visitor key: the user id, or a hash of IP and user agent."""
+    if current_user.is_authenticated:
+        return f'u:{current_user.id}'
+    raw = f'{request.remote_addr or ""}|{request.user_agent.string or ""}'
+    return 'a:' + hashlib.sha256(raw.encode('utf-8')).hexdigest()[:32]
+
+def is_bot_request():
+    agent = request.user_agent.string or ''
+    return not agent or bool(BOT_USER_AGENT.search(agent))
+
+def should_count_view(article_id):
+    """True when this request is a first view of the article in the window."""
+    if not current_app.config.get('VIEW_DEDUP_ENABLED', True):
+        return True
+    if is_bot_request():
+        return False
+    return not get_view_filter().seen(f'{visitor_fingerprint()}:{article_id}')
+
+def view_filter_stats():
+    return get_view_filter().stats()
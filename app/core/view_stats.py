@@ -0,0 +1,200 @@
+"""Per-article daily view time series.
+
+Views are buffered in-process and written to ``article_views_daily`` in
+batches, one upsert per (article, day) instead of one write per hit.
+"""
+
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from app.core.extensions import db
+from app.core.upsert import upsert_increment
+from app.models.article import Article
+from app.models.article_view import ArticleViewDaily
+
+DEFAULT_FLUSH_THRESHOLD = 50
+DEFAULT_FLUSH_INTERVAL = 30
+DEFAULT_RETENTION_DAYS = 90
+
+_pending = Counter()
+_lock = threading.Lock()
+_last_flush = time.monotonic()
+
+def _utc_today():
+    return datetime.utcnow().date()
+
+def record_view(article):
+    """Buffer one view of ``article`` and flush when the batch is due."""
+    config = current_app.config
+    threshold = config.get('VIEW_FLUSH_THRESHOLD', DEFAULT_FLUSH_THRESHOLD)
+    interval = config.get('VIEW_FLUSH_INTERVAL', DEFAULT_FLUSH_INTERVAL)
+
+    with _lock:
+        _pending[(article.id, article.tenant_id, _utc_today())] += 1
+        due = (
+            sum(_pending.values()) >= threshold
+            or time.monotonic() - _last_flush >= interval
+        )
+
+    if due:
+        try:
+            flush_views()
+        except Exception:
+            # A transient failure keeps the batch buffered; never fail the page for it.
+            current_app.logger.exception('Flushing article views failed')
+
+def pending_view_count():
+    with _lock:
+        return sum(_pending.values())
+
+def flush_views():
+    """Write all buffered views in one transaction. Returns views written."""
+    global _last_flush
+    with _lock:
+        batch = dict(_pending)
+        _pending.clear()
+        _last_flush = time.monotonic()
+
+    if not batch:
+        return 0
+
+    rows = [
+        {'article_id': article_id, 'tenant_id': tenant_id, 'day': day, 'count': count}
+        for (article_id, tenant_id, day), count in batch.items()
+    ]
+    try:
+        try:
+            _write_rows(rows)
+        except IntegrityError:
+            # Most likely an article deleted since it was viewed; its views
+            # can never be written, so write the rest without them.
+            db.session.rollback()
+            article_ids = {row['article_id'] for row in rows}
+            existing = {
+                article_id for (article_id,)
+                in db.session.query(Article.id).filter(Article.id.in_(article_ids))
+            }
+            rows = [row for row in rows if row['article_id'] in existing]
+            batch = {key: count for key, count in batch.items() if key[0] in existing}
+            current_app.logger.warning('Dropped views of %d deleted article(s)', len(article_ids - existing))
+            if rows:
+                _write_rows(rows)
+    except OperationalError:
+        db.session.rollback()
+        # Put the batch back so a transient failure does not lose views.
+        with _lock:
+            _pending.update(batch)
+        raise
+    except Exception:
+        # Anything else would fail again on every flush; drop the batch
+        # rather than hold every other article's views behind it.
+        db.session.rollback()
+        raise
+    return sum(batch.values())
+
+def _write_rows(rows):
+    upsert_increment(ArticleViewDaily, rows, key_columns=('article_id', 'day'))
+    db.session.commit()
+
+def _month_start(day):
+    return day.replace(day=1)
+
+def _next_month(day):
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+def compact_views(retention_days=None, today=None):
+    """Fold daily rows of whole months older than the retention window.
+
+    Each such month ends up as one row per article dated on the 1st.
+    Only complete months are folded, so every row before the boundary is a
+    month bucket and every row after it is a day bucket. Returns the number
+    of months compacted.
+    """
+    if retention_days is None:
+        retention_days = current_app.config.get('VIEW_DAILY_RETENTION_DAYS', DEFAULT_RETENTION_DAYS)
+    today = today or _utc_today()
+    boundary = _month_start(today - timedelta(days=retention_days))
+
+    oldest = db.session.query(func.min(ArticleViewDaily.day)).scalar()
+    if oldest is None:
+        return 0
+
+    compacted = 0
+    month = _month_start(oldest)
+    while month < boundary:
+        following = _next_month(month)
+        has_daily_rows = db.session.query(
+            ArticleViewDaily.query.filter(
+                ArticleViewDaily.day > month,
+                ArticleViewDaily.day < following,
+            ).exists()
+        ).scalar()
+
+        if has_daily_rows:
+            in_month = (ArticleViewDaily.day >= month, ArticleViewDaily.day < following)
+            totals = (
+                db.session.query(
+                    ArticleViewDaily.article_id,
+                    ArticleViewDaily.tenant_id,
+                    func.sum(ArticleViewDaily.count),
+                )
+                .filter(*in_month)
+                .group_by(ArticleViewDaily.article_id, ArticleViewDaily.tenant_id)
+                .all()
+            )
+            ArticleViewDaily.query.filter(*in_month).delete(synchronize_session=False)
+            db.session.add_all([
+                ArticleViewDaily(article_id=article_id, tenant_id=tenant_id, day=month, count=int(total))
+                for article_id, tenant_id, total in totals
+            ])
+            db.session.commit()
+            compacted += 1
+
+        month = following
+    return compacted
+
+def daily_view_series(article_id=None, tenant_id=None, days=30, today=None):
+    """Return ``days`` consecutive daily totals ending today, zero-filled.
+
+    Scoped to one article, one journal, or the whole platform when neither
+    is given.
+    """
+    today = today or _utc_today()
+    start = today - timedelta(days=days - 1)
+
+    query = (
+        db.session.query(ArticleViewDaily.day, func.sum(ArticleViewDaily.count))
+        .filter(ArticleViewDaily.day >= start, ArticleViewDaily.day <= today)
+    )
+    if article_id:
+        query = query.filter(ArticleViewDaily.article_id == article_id)
+    elif tenant_id:
+        query = query.filter(ArticleViewDaily.tenant_id == tenant_id)
+    totals = {day: int(total) for day, total in query.group_by(ArticleViewDaily.day).all()}
+
+    series = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        series.append({'day': day, 'label': day.strftime('%d %b'), 'count': totals.get(day, 0)})
+    return series
+
+def views_since(article_ids, since):
+    """Return ``{article_id: views}`` counted from ``since`` (a date) onwards."""
+    article_ids = list(article_ids)
+    if not article_ids:
+        return {}
+    if isinstance(since, datetime):
+        since = since.date()
+    rows = (
+        db.session.query(ArticleViewDaily.article_id, func.sum(ArticleViewDaily.count))
+        .filter(ArticleViewDaily.article_id.in_(article_ids), ArticleViewDaily.day >= since)
+        .group_by(ArticleViewDaily.article_id)
+        .all()
+    )
+    return {article_id: int(total) for article_id, total in rows}
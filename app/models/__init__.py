@@ -1,23 +1,54 @@
 """Models package import surface."""
 
+from app.models.active_user_sketch import ActiveUserSketch
 from app.models.article import Article
+from app.models.article_body import ArticleBody
+from app.models.article_file import ArticleFile
+from app.models.article_revision import ArticleRevision
+from app.models.article_status_event import ArticleStatusEvent
+from app.models.article_view import ArticleViewDaily
 from app.models.custom_domain import CustomDomainRequest
 from app.models.notification import Notification
+from app.models.report_export import ReportExport
+from app.models.revenue_month import RevenueMonth, RevenuePlanMonth
+from app.models.reviewer_profile import ReviewerProfile, ReviewerTerm
 from app.models.role import Role
+from app.models.stored_file import StoredFile
+from app.models.submission_trend import SubmissionTrendBucket
 from app.models.subscription import Subscription
 from app.models.tenant import Tenant
 from app.models.testimonial import Testimonial
+from app.models.trend_score import ArticleTrendScore
 from app.models.transaction import Transaction
+from app.models.upload_session import UploadSession
 from app.models.user import User
+from app.models.user_cohort import UserSignupCount, UserRetention
 
 __all__ = [
     'Role',
     'User',
     'Tenant',
     'Article',
+    'ArticleBody',
+    'ArticleRevision',
+    'ArticleFile',
+    'StoredFile',
+    'UploadSession',
+    'ArticleStatusEvent',
+    'ArticleViewDaily',
+    'ArticleTrendScore',
+    'ActiveUserSketch',
+    'UserSignupCount',
+    'UserRetention',
+    'SubmissionTrendBucket',
+    'ReviewerProfile',
+    'ReviewerTerm',
     'Notification',
     'Testimonial',
     'Subscription',
     'Transaction',
+    'RevenueMonth',
+    'RevenuePlanMonth',
+    'ReportExport',
     'CustomDomainRequest',
 ]
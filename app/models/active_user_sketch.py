@@ -0,0 +1,24 @@
+# app/models/active_user_sketch.py
+
+from app.core.extensions import db
+from datetime import datetime
+
+class ActiveUserSketch(db.Model):
+    """HyperLogLog registers of the users active on one UTC day.
+
+    ``scope`` is ``'platform'`` or ``'tenant:<id>'``. Sketches of several
+    days merge into weekly/monthly uniques without the raw user ids.
+    """
+    __tablename__ = 'active_user_sketches'
+
+    day        = db.Column(db.Date, primary_key=True)
+    scope      = db.Column(db.String(40), primary_key=True)
+    registers  = db.Column(db.LargeBinary, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_active_user_sketches_scope_day', 'scope', 'day'),
+    )
+
+    def __repr__(self):
+        return f'<ActiveUserSketch {self.scope} {self.day}>'
@@ -24,7 +24,8 @@ class Article(db.Model):
     title           = db.Column(db.String(500),  nullable=False)
     abstract        = db.Column(db.Text,          nullable=False)
     keywords        = db.Column(db.String(500),   nullable=True)
-    content         = db.Column(db.Text,          nullable=True)
+    # Full text lives compressed in article_bodies; see the content property
+    body_id         = db.Column(db.Integer, db.ForeignKey('article_bodies.id'), nullable=True)
     pdf_url         = db.Column(db.String(500),   nullable=True)
 
     # Co-authors (comma separated names)
@@ -53,13 +54,41 @@ class Article(db.Model):
     submitted_at    = db.Column(db.DateTime, nullable=True)
     published_at    = db.Column(db.DateTime, nullable=True)
 
+    # Truncated abstract, populated only by list queries that ask for it
+    # (see app.core.projections.with_abstract_preview)
+    abstract_preview = db.query_expression()
+
     # Relationships
     author          = db.relationship('User', foreign_keys=[author_id],   backref='articles')
     reviewer        = db.relationship('User', foreign_keys=[reviewer_id], backref='reviewing')
     editor          = db.relationship('User', foreign_keys=[editor_id],   backref='edited')
     tenant          = db.relationship('Tenant', backref='articles')
+    body            = db.relationship('ArticleBody', lazy='select')
+
+    # Matched to the list queries: equality columns first, then the keyset
+    # sort (sort_column, id). On Postgres the migration declares the sort
+    # columns DESC NULLS LAST to match keyset_paginate's ordering.
+    __table_args__ = (
+        db.Index('ix_articles_author_created', 'author_id', 'created_at', 'id'),
+        db.Index('ix_articles_reviewer_status_created', 'reviewer_id', 'status', 'created_at', 'id'),
+        db.Index('ix_articles_tenant_status_created', 'tenant_id', 'status', 'created_at', 'id'),
+        db.Index('ix_articles_tenant_status_published', 'tenant_id', 'status', 'published_at', 'id'),
+        db.Index('ix_articles_status_created', 'status', 'created_at', 'id'),
+        db.Index('ix_articles_status_published', 'status', 'published_at', 'id'),
+        db.Index('ix_articles_created', 'created_at'),
+    )
 
     # ── Helpers ──────────────────────────────────
+    @property
+    def content(self):
+        """Full text, loaded from article_bodies on first access."""
+        return self.body.text if self.body is not None else None
+
+    @content.setter
+    def content(self, text):
+        from app.core.content_store import store_body
+        self.body = store_body(text) if text else None
+
     @property
     def status_badge(self):
         badges = {
@@ -83,14 +112,22 @@ class Article(db.Model):
         return []
 
     def increment_views(self):
-        self.views += 1
+        # A view is not an edit: keep updated_at, which versions the cached
+        # article page (app.core.fragment_cache)
+        Article.query.filter_by(id=self.id).update(
+            {Article.views: Article.views + 1, Article.updated_at: Article.updated_at},
+            synchronize_session=False,
+        )
         db.session.commit()
 
+    @property
+    def default_doi(self):
+        return f'10.9999/rh.{self.tenant_id}.{self.id}'
+
     def generate_doi(self):
-        """Generate a simple DOI"""
+        """Assign a simple DOI unless the article has one. The caller commits."""
         if not self.doi:
-            self.doi = f'10.9999/rh.{self.tenant_id}.{self.id}'
-            db.session.commit()
+            self.doi = self.default_doi
 
     def __repr__(self):
         return f'<Article {self.title[:50]} [{self.status}]>'
\ No newline at end of file
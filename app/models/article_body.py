@@ -0,0 +1,37 @@
+# app/models/article_body.py
+
+from app.core.extensions import db
+from datetime import datetime
+from functools import cached_property
+
+class ArticleBody(db.Model):
+    """Compressed article text, stored once per distinct content hash.
+
+    Rows are immutable and shared: articles whose text is identical (a
+    resubmission, a re-saved draft) point at the same body. Write through
+    ``app.core.content_store.store_body`` rather than creating rows directly.
+    """
+    __tablename__ = 'article_bodies'
+
+    id           = db.Column(db.Integer, primary_key=True)
+
+    # sha256 of the UTF-8 text
+    content_hash = db.Column(db.String(64), nullable=False, unique=True)
+    codec        = db.Column(db.String(10), nullable=False, default='zlib')
+    data         = db.Column(db.LargeBinary, nullable=False)
+
+    # Uncompressed size in bytes
+    size         = db.Column(db.Integer, nullable=False)
+    created_at   = db.Column(db.DateTime, default=datetime.utcnow)
+
+    @cached_property
+    def text(self):
+        from app.core.content_store import decompress
+        return decompress(self.codec, self.data)
+
+    @property
+    def compressed_size(self):
+        return len(self.data)
+
+    def __repr__(self):
+        return f'<ArticleBody {self.content_hash[:12]} {self.size}B {self.codec}>'
@@ -0,0 +1,37 @@
+# app/models/article_file.py
+
+from app.core.extensions import db
+from datetime import datetime
+
+class ArticleFile(db.Model):
+    """A manuscript PDF or supplementary file attached to an article."""
+    __tablename__ = 'article_files'
+
+    KINDS = ('manuscript', 'supplementary')
+
+    id             = db.Column(db.Integer, primary_key=True)
+    article_id     = db.Column(db.Integer, db.ForeignKey('articles.id', ondelete='CASCADE'), nullable=False)
+    stored_file_id = db.Column(db.Integer, db.ForeignKey('stored_files.id'), nullable=False)
+
+    # Kind: manuscript / supplementary
+    kind           = db.Column(db.String(20), nullable=False, default='supplementary')
+
+    # Name as uploaded, used for the download
+    filename       = db.Column(db.String(255), nullable=False)
+    uploaded_by    = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='SET NULL'), nullable=True)
+    created_at     = db.Column(db.DateTime, default=datetime.utcnow)
+
+    article        = db.relationship('Article', backref=db.backref('files', lazy='dynamic',
+                                                                   cascade='all, delete-orphan'))
+    stored_file    = db.relationship('StoredFile')
+
+    __table_args__ = (
+        db.Index('ix_article_files_article_kind', 'article_id', 'kind'),
+    )
+
+    @property
+    def size(self):
+        return self.stored_file.size
+
+    def __repr__(self):
+        return f'<ArticleFile {self.article_id} {self.kind} {self.filename}>'
@@ -0,0 +1,51 @@
+# app/models/article_revision.py
+
+from app.core.extensions import db
+from datetime import datetime
+
+class ArticleRevision(db.Model):
+    """One saved version of an article's title, abstract and content.
+
+    A revision is recorded as ``pending`` (the raw title and abstract plus a
+    reference to the content body) and encoded later by a background job,
+    either as a ``full`` snapshot or as a ``delta`` against the revision
+    before it. See app/core/revisions.py.
+    """
+    __tablename__ = 'article_revisions'
+
+    id          = db.Column(db.Integer, primary_key=True)
+    article_id  = db.Column(db.Integer, db.ForeignKey('articles.id', ondelete='CASCADE'), nullable=False)
+
+    # 1, 2, 3 ... per article
+    number      = db.Column(db.Integer, nullable=False)
+
+    # Kind: pending / full / delta
+    kind        = db.Column(db.String(10), nullable=False, default='pending')
+
+    # Pending revisions only; cleared once encoded
+    title       = db.Column(db.String(500), nullable=True)
+    abstract    = db.Column(db.Text, nullable=True)
+    body_id     = db.Column(db.Integer, db.ForeignKey('article_bodies.id'), nullable=True)
+
+    # zlib-compressed JSON: the fields (full) or line edits against number - 1 (delta)
+    data        = db.Column(db.LargeBinary, nullable=True)
+
+    author_id   = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='SET NULL'), nullable=True)
+    status      = db.Column(db.String(50), nullable=True)
+    created_at  = db.Column(db.DateTime, default=datetime.utcnow)
+
+    article     = db.relationship('Article', backref=db.backref('revisions', lazy='dynamic',
+                                                                  cascade='all, delete-orphan'))
+    body        = db.relationship('ArticleBody')
+    author      = db.relationship('User')
+
+    __table_args__ = (
+        db.UniqueConstraint('article_id', 'number', name='uq_article_revisions_article_number'),
+    )
+
+    @property
+    def is_pending(self):
+        return self.kind == 'pending'
+
+    def __repr__(self):
+        return f'<ArticleRevision {self.article_id}#{self.number} [{self.kind}]>'
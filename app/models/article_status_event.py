@@ -0,0 +1,24 @@
+# app/models/article_status_event.py
+
+from app.core.extensions import db
+from datetime import datetime
+
+class ArticleStatusEvent(db.Model):
+    """One status transition of an article, in the order it happened."""
+    __tablename__ = 'article_status_events'
+
+    id          = db.Column(db.Integer, primary_key=True)
+    article_id  = db.Column(db.Integer, db.ForeignKey('articles.id', ondelete='CASCADE'), nullable=False)
+    tenant_id   = db.Column(db.Integer, db.ForeignKey('tenants.id', ondelete='CASCADE'), nullable=False)
+    actor_id    = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='SET NULL'), nullable=True)
+    from_status = db.Column(db.String(50), nullable=True)
+    to_status   = db.Column(db.String(50), nullable=False)
+    created_at  = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_article_status_events_article_created', 'article_id', 'created_at'),
+        db.Index('ix_article_status_events_tenant_created', 'tenant_id', 'created_at'),
+    )
+
+    def __repr__(self):
+        return f'<ArticleStatusEvent article={self.article_id} {self.from_status}->{self.to_status}>'
@@ -0,0 +1,27 @@
+# app/models/article_view.py
+
+from app.core.extensions import db
+
+class ArticleViewDaily(db.Model):
+    """Per-article view counts bucketed by UTC day.
+
+    Rows older than the retention window are compacted into one row per
+    month, stored on the first day of that month.
+    """
+    __tablename__ = 'article_views_daily'
+
+    article_id = db.Column(db.Integer, db.ForeignKey('articles.id', ondelete='CASCADE'), primary_key=True)
+    day        = db.Column(db.Date, primary_key=True)
+
+    # Denormalised so per-journal trends are a range scan on (tenant_id, day)
+    tenant_id  = db.Column(db.Integer, db.ForeignKey('tenants.id', ondelete='CASCADE'), nullable=False)
+
+    count      = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.Index('ix_article_views_daily_tenant_day', 'tenant_id', 'day'),
+        db.Index('ix_article_views_daily_day', 'day'),
+    )
+
+    def __repr__(self):
+        return f'<ArticleViewDaily article={self.article_id} {self.day} count={self.count}>'
@@ -35,6 +35,12 @@ class CustomDomainRequest(db.Model):
     tenant = db.relationship('Tenant', backref='custom_domain_requests')
     approved_by = db.relationship('User', backref='approved_domains', foreign_keys='CustomDomainRequest.approved_by_id')
 
+    __table_args__ = (
+        db.Index('ix_custom_domain_requests_status_requested', 'status', 'request_date'),
+        db.Index('ix_custom_domain_requests_requested', 'request_date'),
+        db.Index('ix_custom_domain_requests_domain', 'custom_domain'),
+    )
+
     @property
     def school_name(self):
         """Return the tenant/school name"""
@@ -0,0 +1,37 @@
+# app/models/report_export.py
+
+from app.core.extensions import db
+from datetime import datetime
+
+class ReportExport(db.Model):
+    """A report export written to disk by a background job."""
+    __tablename__ = 'report_exports'
+
+    id           = db.Column(db.Integer, primary_key=True)
+    user_id      = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    report_type  = db.Column(db.String(50), nullable=False)
+    format       = db.Column(db.String(20), nullable=False)
+    date_range   = db.Column(db.String(20), nullable=False, default='all')
+
+    # Status: pending / running / completed / failed
+    status       = db.Column(db.String(20), nullable=False, default='pending')
+    row_count    = db.Column(db.Integer, nullable=True)
+    file_name    = db.Column(db.String(255), nullable=True)
+    file_size    = db.Column(db.Integer, nullable=True)
+    error        = db.Column(db.Text, nullable=True)
+
+    created_at   = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at  = db.Column(db.DateTime, nullable=True)
+
+    user         = db.relationship('User', backref=db.backref('report_exports', lazy='dynamic'))
+
+    __table_args__ = (
+        db.Index('ix_report_exports_user_created', 'user_id', 'created_at'),
+    )
+
+    @property
+    def is_ready(self):
+        return self.status == 'completed' and bool(self.file_name)
+
+    def __repr__(self):
+        return f'<ReportExport {self.report_type}.{self.format} [{self.status}]>'
@@ -0,0 +1,44 @@
+# app/models/revenue_month.py
+
+from app.core.extensions import db
+from datetime import datetime
+
+class RevenueMonth(db.Model):
+    """Revenue and subscription movement of one closed calendar month.
+
+    Rows are written once the month is over and read instead of
+    re-aggregating its transactions.
+    """
+    __tablename__ = 'revenue_months'
+
+    month             = db.Column(db.Date, primary_key=True)   # first day of the month
+    revenue           = db.Column(db.Float, nullable=False, default=0.0)
+    transactions      = db.Column(db.Integer, nullable=False, default=0)
+    new_subscriptions = db.Column(db.Integer, nullable=False, default=0)
+    cancellations     = db.Column(db.Integer, nullable=False, default=0)
+    active_at_start   = db.Column(db.Integer, nullable=False, default=0)
+    computed_at       = db.Column(db.DateTime, default=datetime.utcnow)
+
+    plans = db.relationship('RevenuePlanMonth', backref='revenue_month',
+                            cascade='all, delete-orphan', lazy='selectin')
+
+    @property
+    def churn_rate(self):
+        if not self.active_at_start:
+            return 0.0
+        return round(self.cancellations * 100.0 / self.active_at_start, 1)
+
+    def __repr__(self):
+        return f'<RevenueMonth {self.month:%Y-%m} {self.revenue:.2f}>'
+
+class RevenuePlanMonth(db.Model):
+    """Completed-transaction revenue of one plan in a closed month."""
+    __tablename__ = 'revenue_plan_months'
+
+    month        = db.Column(db.Date, db.ForeignKey('revenue_months.month', ondelete='CASCADE'), primary_key=True)
+    plan         = db.Column(db.String(50), primary_key=True)
+    revenue      = db.Column(db.Float, nullable=False, default=0.0)
+    transactions = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<RevenuePlanMonth {self.month:%Y-%m} {self.plan} {self.revenue:.2f}>'
@@ -0,0 +1,45 @@
+# app/models/reviewer_profile.py
+
+from app.core.extensions import db
+from datetime import datetime
+
+class ReviewerProfile(db.Model):
+    """Precomputed expertise and workload of one member, for reviewer suggestions.
+
+    ``norm`` is the Euclidean length of the member's term weights (see
+    ``ReviewerTerm``), so keyword overlap can be normalised without reading
+    every term. Rebuilt per member by ``app.core.reviewer_index``.
+    """
+    __tablename__ = 'reviewer_profiles'
+
+    user_id           = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    tenant_id         = db.Column(db.Integer, db.ForeignKey('tenants.id', ondelete='CASCADE'), nullable=True)
+    open_reviews      = db.Column(db.Integer, nullable=False, default=0)
+    completed_reviews = db.Column(db.Integer, nullable=False, default=0)
+    authored          = db.Column(db.Integer, nullable=False, default=0)
+    norm              = db.Column(db.Float, nullable=False, default=0.0)
+    updated_at        = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_reviewer_profiles_tenant_open', 'tenant_id', 'open_reviews'),
+    )
+
+    def __repr__(self):
+        return f'<ReviewerProfile user={self.user_id} open={self.open_reviews}>'
+
+class ReviewerTerm(db.Model):
+    """One keyword of a member's profile with its weight: an inverted index
+    from (journal, keyword) to the members who know about it."""
+    __tablename__ = 'reviewer_terms'
+
+    user_id   = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    term      = db.Column(db.String(120), primary_key=True)
+    tenant_id = db.Column(db.Integer, db.ForeignKey('tenants.id', ondelete='CASCADE'), nullable=True)
+    weight    = db.Column(db.Float, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_reviewer_terms_tenant_term', 'tenant_id', 'term'),
+    )
+
+    def __repr__(self):
+        return f'<ReviewerTerm user={self.user_id} {self.term!r} {self.weight:.2f}>'
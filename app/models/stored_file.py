@@ -0,0 +1,21 @@
+# app/models/stored_file.py
+
+from app.core.extensions import db
+from datetime import datetime
+
+class StoredFile(db.Model):
+    """A file blob in the content-addressed store, one row per distinct SHA-256.
+
+    The bytes live on disk under ``FILE_STORE_DIR`` (see app/core/file_store.py);
+    uploads of identical files share one blob and one row.
+    """
+    __tablename__ = 'stored_files'
+
+    id           = db.Column(db.Integer, primary_key=True)
+    sha256       = db.Column(db.String(64), nullable=False, unique=True)
+    size         = db.Column(db.BigInteger, nullable=False)
+    content_type = db.Column(db.String(100), nullable=False, default='application/octet-stream')
+    created_at   = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<StoredFile {self.sha256[:12]} {self.size}B>'
@@ -0,0 +1,29 @@
+# app/models/submission_trend.py
+
+from app.core.extensions import db
+
+class SubmissionTrendBucket(db.Model):
+    """Editorial KPIs for one month, journal and category.
+
+    Durations are stored as sums of hours so buckets add up across
+    months, journals and categories; averages are ``hours / count``.
+    ``category`` is ``''`` for uncategorised articles.
+    """
+    __tablename__ = 'submission_trend_buckets'
+
+    month              = db.Column(db.Date, primary_key=True)
+    tenant_id          = db.Column(db.Integer, db.ForeignKey('tenants.id', ondelete='CASCADE'), primary_key=True)
+    category           = db.Column(db.String(200), primary_key=True, default='')
+    submissions        = db.Column(db.Integer, nullable=False, default=0)
+    first_reviews      = db.Column(db.Integer, nullable=False, default=0)
+    first_review_hours = db.Column(db.Float, nullable=False, default=0.0)
+    decisions          = db.Column(db.Integer, nullable=False, default=0)
+    decision_hours     = db.Column(db.Float, nullable=False, default=0.0)
+    accepted           = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.Index('ix_submission_trend_buckets_tenant_month', 'tenant_id', 'month'),
+    )
+
+    def __repr__(self):
+        return f'<SubmissionTrendBucket {self.month:%Y-%m} tenant={self.tenant_id} {self.category!r}>'
@@ -36,6 +36,11 @@ class Subscription(db.Model):
     # Relationship
     tenant          = db.relationship('Tenant', backref='subscription', uselist=False)
 
+    __table_args__ = (
+        db.Index('ix_subscriptions_status_created', 'status', 'created_at'),
+        db.Index('ix_subscriptions_tenant', 'tenant_id'),
+    )
+
     # ── Plan Limits ──────────────────────────────
     PLAN_LIMITS = {
         'free': {
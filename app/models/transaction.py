@@ -27,6 +27,12 @@ class Transaction(db.Model):
     tenant       = db.relationship('Tenant', backref='transactions')
     approved_by  = db.relationship('User', foreign_keys=[approved_by_id])
 
+    __table_args__ = (
+        db.Index('ix_transactions_status_created', 'status', 'created_at'),
+        db.Index('ix_transactions_tenant_status_created', 'tenant_id', 'status', 'created_at'),
+        db.Index('ix_transactions_tenant_created', 'tenant_id', 'created_at'),
+    )
+
     @property
     def status_label(self):
         return {
@@ -0,0 +1,25 @@
+# app/models/trend_score.py
+
+from app.core.extensions import db
+from datetime import datetime
+
+class ArticleTrendScore(db.Model):
+    """Persisted time-decayed trending score of a published article.
+
+    ``log_score`` is log2 of the decayed score scaled to the trending
+    epoch, so ordering by it is the live ranking and it never needs
+    rewriting as time passes.
+    """
+    __tablename__ = 'article_trend_scores'
+
+    article_id = db.Column(db.Integer, db.ForeignKey('articles.id', ondelete='CASCADE'), primary_key=True)
+    tenant_id  = db.Column(db.Integer, db.ForeignKey('tenants.id', ondelete='CASCADE'), nullable=False)
+    log_score  = db.Column(db.Float, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_article_trend_scores_tenant_score', 'tenant_id', 'log_score'),
+    )
+
+    def __repr__(self):
+        return f'<ArticleTrendScore article={self.article_id} log_score={self.log_score:.3f}>'
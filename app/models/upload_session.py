@@ -0,0 +1,42 @@
+# app/models/upload_session.py
+
+from app.core.extensions import db
+from datetime import datetime
+
+class UploadSession(db.Model):
+    """An in-progress chunked upload; the bytes so far sit in a temp file.
+
+    Clients resume by asking for ``received`` and sending the rest from
+    there. See app/core/uploads.py.
+    """
+    __tablename__ = 'upload_sessions'
+
+    # Random token, also the name of the temp file
+    id             = db.Column(db.String(32), primary_key=True)
+    user_id        = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    article_id     = db.Column(db.Integer, db.ForeignKey('articles.id', ondelete='CASCADE'), nullable=False)
+    kind           = db.Column(db.String(20), nullable=False)
+    filename       = db.Column(db.String(255), nullable=False)
+    content_type   = db.Column(db.String(100), nullable=False)
+    total_size     = db.Column(db.BigInteger, nullable=False)
+    received       = db.Column(db.BigInteger, nullable=False, default=0)
+
+    # Status: open / complete
+    status         = db.Column(db.String(20), nullable=False, default='open')
+    article_file_id = db.Column(db.Integer, db.ForeignKey('article_files.id', ondelete='SET NULL'), nullable=True)
+
+    created_at     = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at     = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    article_file   = db.relationship('ArticleFile')
+
+    __table_args__ = (
+        db.Index('ix_upload_sessions_status_updated', 'status', 'updated_at'),
+    )
+
+    @property
+    def is_complete(self):
+        return self.status == 'complete'
+
+    def __repr__(self):
+        return f'<UploadSession {self.id} {self.received}/{self.total_size} [{self.status}]>'
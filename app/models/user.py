@@ -9,6 +9,8 @@ import secrets
 class User(UserMixin, db.Model):
     __tablename__ = 'users'
 
+    REVIEWER_ROLES = ('reviewer', 'editor', 'tenant_owner', 'admin', 'super_admin')
+
     id           = db.Column(db.Integer, primary_key=True)
 
     # Which tenant this user belongs to (NULL = super admin)
@@ -53,6 +55,10 @@ class User(UserMixin, db.Model):
         cascade='all, delete-orphan',
     )
 
+    __table_args__ = (
+        db.Index('ix_users_tenant_role', 'tenant_id', 'role'),
+    )
+
     # ── Password ─────────────────────────────────
     def set_password(self, password):
         self.password_hash = generate_password_hash(password)
@@ -117,7 +123,7 @@ class User(UserMixin, db.Model):
         return self.role in ['author', 'editor', 'tenant_owner', 'admin', 'super_admin']
 
     def is_reviewer(self):
-        return self.role in ['reviewer', 'editor', 'tenant_owner', 'admin', 'super_admin']
+        return self.role in self.REVIEWER_ROLES
 
     def can_manage_tenant(self):
         return self.role in ['tenant_owner', 'admin', 'super_admin']
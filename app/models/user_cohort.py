@@ -0,0 +1,28 @@
+# app/models/user_cohort.py
+
+from app.core.extensions import db
+
+class UserSignupCount(db.Model):
+    """Number of accounts created per calendar month and role."""
+    __tablename__ = 'user_signup_counts'
+
+    month = db.Column(db.Date, primary_key=True)   # first day of the month
+    role  = db.Column(db.String(50), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<UserSignupCount {self.month:%Y-%m} {self.role}={self.count}>'
+
+class UserRetention(db.Model):
+    """Users of a signup cohort who were active in a later month.
+
+    Each user is counted at most once per (cohort_month, activity_month).
+    """
+    __tablename__ = 'user_retention'
+
+    cohort_month   = db.Column(db.Date, primary_key=True)
+    activity_month = db.Column(db.Date, primary_key=True)
+    count          = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<UserRetention {self.cohort_month:%Y-%m} -> {self.activity_month:%Y-%m} = {self.count}>'
@@ -5,7 +5,7 @@ from functools import wraps
 from pathlib import Path
 from uuid import uuid4
 
-from flask import render_template, redirect, url_for, flash, request, current_app
+from flask import render_template, redirect, url_for, flash, request, current_app, abort, send_file, Response, stream_with_context
 from flask_login import login_required, current_user
 from sqlalchemy import case
 from werkzeug.utils import secure_filename
@@ -17,9 +17,25 @@ from app.core.notifications import (
     mark_all_notifications_read_for_user,
     mark_notification_read,
 )
+from app.core.active_users import active_user_counts
+from app.core.cohorts import cohort_grid, monthly_signups, total_signups
+from app.core.editorial import BulkActionError, bulk_set_status, load_articles
 from app.core.extensions import db
+from app.core.fragment_cache import get_fragment_cache
+from app.core.jobs import submit_job
+from app.core.projections import article_list_query
+from app.core.reports import (
+    DATE_RANGES, FORMATS, REPORTS, export_path, report_filename, should_run_in_background,
+    start_export, stream_report,
+)
+from app.core.revenue import revenue_overview
+from app.core.reviewer_index import refresh_profiles_for
+from app.core.sitemaps import refresh_journal_sitemaps
+from app.core.submission_trends import submission_trends as submission_trend_stats, transition_article
+from app.core.trending import trending_articles
 from app.models.article import Article
 from app.models.custom_domain import CustomDomainRequest
+from app.models.report_export import ReportExport
 from app.models.tenant import Tenant
 from app.models.testimonial import Testimonial
 from app.models.user import User
@@ -90,7 +106,7 @@ def dashboard():
     }
 
     recent_articles = (
-        scoped_articles
+        article_list_query(scoped_articles, view='dashboard')
         .order_by(Article.created_at.desc())
         .limit(8)
         .all()
@@ -106,36 +122,15 @@ def dashboard():
     unread_notification_count = count_unread_notifications(current_user.id)
 
     # ── Analytics data for dashboard (for all admin roles) ────────────────────
-    scoped_q = _scoped_articles_query()
-    all_articles_for_analytics = scoped_q.all()
-    published_arts  = [a for a in all_articles_for_analytics if a.status == 'published']
-    under_review_arts = [a for a in all_articles_for_analytics if a.status == 'under_review']
-    submitted_arts  = [a for a in all_articles_for_analytics if a.status == 'submitted']
-    rejected_arts   = [a for a in all_articles_for_analytics if a.status == 'rejected']
-    draft_arts      = [a for a in all_articles_for_analytics if a.status == 'draft']
-
-    status_data = {
-        'Published':    len(published_arts),
-        'Under Review': len(under_review_arts),
-        'Submitted':    len(submitted_arts),
-        'Rejected':     len(rejected_arts),
-        'Draft':        len(draft_arts),
-    }
-    top_articles = sorted(published_arts, key=lambda a: a.views, reverse=True)[:5]
-
-    monthly_data = []
-    for i in range(5, -1, -1):
-        month_start = datetime.utcnow().replace(day=1) - timedelta(days=30 * i)
-        month_end   = month_start + timedelta(days=31)
-        count = len([a for a in all_articles_for_analytics
-                     if month_start <= a.created_at < month_end])
-        monthly_data.append({'month': month_start.strftime('%b %Y'), 'count': count})
-
-    categories = {}
-    for a in all_articles_for_analytics:
-        cat = getattr(a, 'category', None) or 'Uncategorized'
-        categories[cat] = categories.get(cat, 0) + 1
-    top_categories = sorted(categories.items(), key=lambda x: x[1], reverse=True)[:6]
+    # Status, monthly and category charts load from /api/metrics after render.
+    top_articles = (
+        article_list_query(_scoped_articles_query(), view='dashboard')
+        .filter(Article.status == 'published')
+        .order_by(Article.views.desc())
+        .limit(5)
+        .all()
+    )
+    trending = trending_articles(limit=5)
 
     # Team breakdown — scoped to current admin's tenant if they have one
     analytics_tenant_id = current_user.tenant_id
@@ -162,10 +157,9 @@ def dashboard():
         top_notifications=top_notifications,
         unread_notification_count=unread_notification_count,
         # Analytics data
-        status_data=status_data,
-        monthly_data=monthly_data,
+        metrics_dashboard='admin',
         top_articles=top_articles,
-        top_categories=top_categories,
+        trending=trending,
         authors=authors,
         reviewers=reviewers,
         editors=editors,
@@ -312,6 +306,7 @@ def toggle_journal_active(journal_id):
     j = Tenant.query.get_or_404(journal_id)
     j.is_active = not j.is_active
     db.session.commit()
+    submit_job(refresh_journal_sitemaps, j.id)
     flash(f'Journal {"activated" if j.is_active else "deactivated"}.', 'success')
     return redirect(url_for('admin.journals'))
 
@@ -334,7 +329,7 @@ def submissions():
     if status_filter:
         query = query.filter_by(status=status_filter)
 
-    articles_paginated = query.order_by(Article.created_at.desc()).paginate(page=page, per_page=20, error_out=False)
+    articles_paginated = article_list_query(query, view='admin.submissions').order_by(Article.created_at.desc()).paginate(page=page, per_page=20, error_out=False)
 
     return render_template(
         'admin/submissions.html',
@@ -352,11 +347,33 @@ def change_article_status(article_id):
     new_status = request.form.get('status')
     valid = ['draft', 'submitted', 'under_review', 'accepted', 'rejected', 'published']
     if new_status in valid:
-        a.status = new_status
+        changed = transition_article(a, new_status, actor_id=current_user.id)
+        if changed is not None and new_status == 'published':
+            a.published_at = datetime.utcnow()
+        refresh_profiles_for([a])
         db.session.commit()
         flash(f'Article status changed to {new_status}.', 'success')
     return redirect(url_for('admin.submissions'))
 
+@admin_bp.route('/submissions/bulk-status', methods=['POST'])
+@login_required
+@platform_admin_required
+def bulk_change_article_status():
+    new_status = request.form.get('status')
+    back = url_for('admin.submissions', status=request.form.get('status_filter') or None,
+                   q=request.form.get('q') or None)
+    if new_status not in ['draft', 'submitted', 'under_review', 'accepted', 'rejected', 'published']:
+        flash('Invalid status.', 'danger')
+        return redirect(back)
+    try:
+        articles = load_articles(request.form.getlist('article_ids', type=int))
+    except BulkActionError as exc:
+        flash(str(exc), 'warning')
+        return redirect(back)
+    changed = bulk_set_status(articles, new_status, current_user.id, notify=False)
+    flash(f'{len(changed)} article(s) changed to {new_status}.', 'success' if changed else 'info')
+    return redirect(back)
+
 # SUPER ADMIN - PLATFORM MANAGEMENT
 
 @admin_bp.route('/system-health')
@@ -399,6 +416,8 @@ def system_health():
     except Exception:
         uptime = None
 
+    from app.core.view_dedup import view_filter_stats
+
     health_data = {
         'cpu': {'usage': cpu_percent, 'cores': psutil.cpu_count()},
         'memory': {
@@ -409,6 +428,7 @@ def system_health():
         'disk': disk_data,
         'db_status': db_status,
         'uptime': uptime,
+        'view_dedup': view_filter_stats(),
     }
     return render_template('admin/system_health.html', health=health_data, now_str=datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
 
@@ -541,19 +561,82 @@ def journal_admins():
 @platform_admin_required
 def journal_analytics():
     """Journal analytics - articles, acceptance rate, etc."""
-    journals = Tenant.query.all()
-    analytics = []
-    for journal in journals:
-        total_articles = Article.query.filter_by(tenant_id=journal.id).count()
-        published = Article.query.filter_by(tenant_id=journal.id, status='published').count()
-        acceptance_rate = (published / total_articles * 100) if total_articles > 0 else 0
-        analytics.append({
-            'journal': journal,
-            'total_articles': total_articles,
-            'published': published,
-            'acceptance_rate': round(acceptance_rate, 1)
-        })
-    return render_template('admin/journal_analytics.html', analytics=analytics)
+    page = request.args.get('page', 1, type=int)
+    sort = request.args.get('sort', 'total_articles')
+    direction = request.args.get('dir', 'desc')
+
+    # Per-journal article and member stats in one grouped statement.
+    article_stats = (
+        db.session.query(
+            Article.tenant_id.label('tenant_id'),
+            db.func.count(Article.id).label('total_articles'),
+            db.func.sum(case((Article.status == 'published', 1), else_=0)).label('published'),
+            db.func.sum(Article.views).label('views'),
+        )
+        .group_by(Article.tenant_id)
+        .subquery()
+    )
+    member_stats = (
+        db.session.query(
+            User.tenant_id.label('tenant_id'),
+            db.func.count(User.id).label('members'),
+        )
+        .filter(User.tenant_id.isnot(None))
+        .group_by(User.tenant_id)
+        .subquery()
+    )
+
+    total_articles = db.func.coalesce(article_stats.c.total_articles, 0)
+    published = db.func.coalesce(article_stats.c.published, 0)
+    acceptance_rate = db.func.coalesce(
+        published * 100.0 / db.func.nullif(total_articles, 0), 0
+    )
+    metrics = {
+        'name': Tenant.name,
+        'total_articles': total_articles,
+        'published': published,
+        'acceptance_rate': acceptance_rate,
+        'members': db.func.coalesce(member_stats.c.members, 0),
+        'views': db.func.coalesce(article_stats.c.views, 0),
+        'created_at': Tenant.created_at,
+    }
+    if sort not in metrics:
+        sort = 'total_articles'
+    order = metrics[sort].asc() if direction == 'asc' else metrics[sort].desc()
+
+    query = (
+        db.session.query(
+            Tenant,
+            metrics['total_articles'].label('total_articles'),
+            metrics['published'].label('published'),
+            metrics['acceptance_rate'].label('acceptance_rate'),
+            metrics['members'].label('members'),
+            metrics['views'].label('views'),
+        )
+        .outerjoin(article_stats, article_stats.c.tenant_id == Tenant.id)
+        .outerjoin(member_stats, member_stats.c.tenant_id == Tenant.id)
+        .order_by(order, Tenant.id.asc())
+    )
+    pagination = query.paginate(page=page, per_page=50, error_out=False)
+
+    analytics = [
+        {
+            'journal': row.Tenant,
+            'total_articles': int(row.total_articles),
+            'published': int(row.published),
+            'acceptance_rate': round(float(row.acceptance_rate), 1),
+            'members': int(row.members),
+            'views': int(row.views),
+        }
+        for row in pagination.items
+    ]
+    return render_template(
+        'admin/journal_analytics.html',
+        analytics=analytics,
+        pagination=pagination,
+        sort=sort,
+        direction=direction,
+    )
 
 @admin_bp.route('/archived-journals')
 @login_required
@@ -585,8 +668,17 @@ def workflow_stages():
 @platform_admin_required
 def assigned_reviewers():
     """View reviewer assignments across platform."""
-    # Get all articles with assigned reviewers
-    articles = Article.query.filter(Article.status.in_(['under_review', 'submitted'])).all()
+    page = request.args.get('page', 1, type=int)
+    # Articles in review that have a reviewer assigned
+    query = Article.query.filter(
+        Article.status.in_(['under_review', 'submitted']),
+        Article.reviewer_id.isnot(None),
+    )
+    articles = (
+        article_list_query(query, view='admin.assigned_reviewers')
+        .order_by(Article.updated_at.desc())
+        .paginate(page=page, per_page=20, error_out=False)
+    )
     return render_template('admin/assigned_reviewers.html', articles=articles)
 
 @admin_bp.route('/plagiarism-checks')
@@ -703,21 +795,16 @@ def refunds():
 @platform_admin_required
 def revenue_analytics():
     """Revenue analytics and charts."""
-    from datetime import datetime, timedelta
-
-    # Calculate revenue stats
-    total_revenue = 0  # Placeholder - sum from transactions
-    monthly_revenue = 0
-    yearly_revenue = 0
-
-    stats = {
-        'total_revenue': total_revenue,
-        'monthly_revenue': monthly_revenue,
-        'yearly_revenue': yearly_revenue,
-        'active_subscriptions': 0,
-        'churn_rate': 0,
-    }
-    return render_template('admin/revenue_analytics.html', stats=stats)
+    overview = revenue_overview(months=12)
+    peak = max([month['revenue'] for month in overview['monthly']] + [1])
+    return render_template(
+        'admin/revenue_analytics.html',
+        stats=overview['stats'],
+        monthly=overview['monthly'],
+        by_plan=overview['by_plan'],
+        mrr_by_plan=overview['mrr_by_plan'],
+        peak=peak,
+    )
 
 @admin_bp.route('/custom-domains')
 @login_required
@@ -917,11 +1004,13 @@ def edit_custom_domain(request_id):
 @platform_admin_required
 def platform_analytics():
     """Comprehensive platform analytics dashboard."""
-    from datetime import timedelta
     thirty_days_ago = datetime.utcnow() - timedelta(days=30)
+    active = active_user_counts()
     stats = {
         'total_users': User.query.count(),
-        'active_users_24h': 0,  # Would calculate from sessions
+        'active_users_24h': active['dau'],
+        'active_users_7d': active['wau'],
+        'active_users_30d': active['mau'],
         'new_users_this_month': User.query.filter(
             User.created_at >= thirty_days_ago
         ).count(),
@@ -935,31 +1024,88 @@ def platform_analytics():
 @platform_admin_required
 def user_growth():
     """User growth analytics and charts."""
-    # Get user growth over time
-    growth_data = []  # Would aggregate by month
-    return render_template('admin/user_growth.html', growth=growth_data)
+    growth_data = monthly_signups()
+    cohorts = cohort_grid()
+    roles = sorted({role for month in growth_data for role in month['by_role']})
+    peak = max([month['total'] for month in growth_data] + [1])
+    stats = {
+        'total_signups': total_signups(),
+        'last_12_months': sum(month['total'] for month in growth_data[-12:]),
+        'this_month': growth_data[-1]['total'] if growth_data else 0,
+        'last_month': growth_data[-2]['total'] if len(growth_data) > 1 else 0,
+    }
+    return render_template(
+        'admin/user_growth.html',
+        growth=growth_data,
+        cohorts=cohorts,
+        roles=roles,
+        peak=peak,
+        stats=stats,
+    )
 
 @admin_bp.route('/submission-trends')
 @login_required
 @platform_admin_required
 def submission_trends():
     """Submission trends analytics."""
-    # Get submission trends by month and status
-    trends = []  # Would aggregate from articles
-    return render_template('admin/submission_trends.html', trends=trends)
+    tenant_id = request.args.get('tenant', type=int)
+    months = min(max(request.args.get('months', 12, type=int), 1), 36)
+    trends = submission_trend_stats(months=months, tenant_id=tenant_id)
+    tenant_names = dict(db.session.query(Tenant.id, Tenant.name).all())
+    return render_template(
+        'admin/submission_trends.html',
+        trends=trends,
+        tenant_names=tenant_names,
+        selected_tenant=tenant_id,
+        months=months,
+    )
 
 @admin_bp.route('/download-reports', methods=['GET', 'POST'])
 @login_required
 @platform_admin_required
 def download_reports():
-    """Download reports in PDF/Excel format."""
+    """Export platform data as CSV, gzip CSV or Excel."""
     if request.method == 'POST':
         report_type = request.form.get('report_type')
-        date_range = request.form.get('date_range')
-        format_type = request.form.get('format', 'excel')
-        flash(f'Generating {report_type} report in {format_type} format...', 'info')
-    report_types = ['users', 'journals', 'articles', 'revenue', 'submissions', 'activity']
-    return render_template('admin/download_reports.html', report_types=report_types)
+        date_range = request.form.get('date_range', 'all')
+        format_type = request.form.get('format', 'csv')
+        if report_type not in REPORTS or date_range not in DATE_RANGES or format_type not in FORMATS:
+            flash('Invalid report options.', 'danger')
+            return redirect(url_for('admin.download_reports'))
+
+        if should_run_in_background(report_type, format_type, date_range):
+            start_export(current_user.id, report_type, format_type, date_range)
+            flash(f'Generating {report_type} report in the background. It will be listed below when ready.', 'info')
+            return redirect(url_for('admin.download_reports'))
+
+        mimetype, _ = FORMATS[format_type]
+        return Response(
+            stream_with_context(stream_report(report_type, format_type, date_range)),
+            mimetype=mimetype,
+            headers={'Content-Disposition': f'attachment; filename="{report_filename(report_type, format_type)}"'},
+        )
+
+    exports = (
+        ReportExport.query.filter_by(user_id=current_user.id)
+        .order_by(ReportExport.created_at.desc())
+        .limit(20)
+        .all()
+    )
+    report_types = list(REPORTS)
+    return render_template('admin/download_reports.html', report_types=report_types, exports=exports)
+
+@admin_bp.route('/download-reports/<int:export_id>')
+@login_required
+@platform_admin_required
+def download_report_export(export_id):
+    export = ReportExport.query.filter_by(id=export_id, user_id=current_user.id).first_or_404()
+    if not export.is_ready:
+        abort(404)
+    path = export_path(export)
+    if not path.exists():
+        abort(404)
+    mimetype, _ = FORMATS[export.format]
+    return send_file(path, mimetype=mimetype, as_attachment=True, download_name=export.file_name)
 
 # SUPER ADMIN - CONTENT MANAGEMENT
 
@@ -1097,7 +1243,7 @@ def featured_content():
         flash('Featured content updated.', 'success')
         return redirect(url_for('admin.featured_content'))
     journals = Tenant.query.filter_by(is_active=True).all()
-    articles = Article.query.filter_by(status='published').order_by(Article.created_at.desc()).limit(50).all()
+    articles = article_list_query(Article.query.filter_by(status='published'), view='admin.featured_content').order_by(Article.created_at.desc()).limit(50).all()
     return render_template('admin/featured_content.html', journals=journals, articles=articles)
 
 @admin_bp.route('/blog-posts', methods=['GET', 'POST'])
@@ -1264,6 +1410,8 @@ def cache_management():
     """Cache clear and management."""
     if request.method == 'POST':
         cache_type = request.form.get('cache_type')
+        if cache_type in ('all', 'template'):
+            get_fragment_cache().clear()
         if cache_type == 'all':
             flash('All caches cleared.', 'success')
         elif cache_type == 'query':
@@ -1271,7 +1419,7 @@ def cache_management():
         elif cache_type == 'template':
             flash('Template cache cleared.', 'success')
         return redirect(url_for('admin.cache_management'))
-    return render_template('admin/cache_management.html')
+    return render_template('admin/cache_management.html', fragment_stats=get_fragment_cache().stats())
 
 @admin_bp.route('/api-management', methods=['GET', 'POST'])
 @login_required
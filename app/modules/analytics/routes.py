@@ -1,12 +1,16 @@
 # app/modules/analytics/routes.py
 
-from flask import render_template, abort
+from flask import render_template, abort, request
 from flask_login import login_required, current_user
 from app.modules.analytics import analytics_bp
 from app.models.article import Article
 from app.models.user import User
 from app.models.tenant import Tenant
 from app.core.extensions import db
+from app.core.active_users import active_user_counts
+from app.core.trending import trending_articles
+from app.core.dashboard_metrics import scoped_articles, status_counts, view_totals
+from app.core.view_stats import views_since
 from datetime import datetime, timedelta
 
 def _resolve_analytics_tenant_id():
@@ -32,29 +36,43 @@ def dashboard():
 
     # ── Article stats ──────────────────────────
     if tenant_id:
-        all_articles = Article.query.filter_by(tenant_id=tenant_id).all()
+        scope = ('tenant', tenant_id)
     elif current_user.is_admin():
         # Super/platform admin: show platform-wide article stats
-        all_articles = Article.query.all()
+        scope = ('platform', None)
     else:
-        all_articles = []
+        scope = ('none', None)
+    articles_q = scoped_articles(scope)
 
-    total_articles   = len(all_articles)
-    published        = [a for a in all_articles if a.status == 'published']
-    under_review     = [a for a in all_articles if a.status == 'under_review']
-    submitted        = [a for a in all_articles if a.status == 'submitted']
-    rejected         = [a for a in all_articles if a.status == 'rejected']
-    drafts           = [a for a in all_articles if a.status == 'draft']
-
-    total_views      = sum(a.views for a in all_articles)
-    published_views  = sum(a.views for a in published)
+    counts         = status_counts(articles_q)
+    total_articles = sum(counts.values())
+    total_views, published_views = view_totals(articles_q)
 
     # ── Top articles by views ──────────────────
-    top_articles = sorted(published, key=lambda a: a.views, reverse=True)[:5]
+    top_articles = (
+        articles_q.filter(Article.status == 'published')
+        .order_by(Article.views.desc())
+        .limit(5)
+        .all()
+    )
+    week_views = views_since([a.id for a in top_articles], datetime.utcnow() - timedelta(days=6))
+
+    # ── Trending now (time-decayed) ────────────
+    if tenant_id or current_user.is_admin():
+        trending = trending_articles(tenant_id, limit=5)
+    else:
+        trending = []
 
-    # ── Recent activity (last 30 days) ─────────
-    thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-    recent_articles = [a for a in all_articles if a.created_at >= thirty_days_ago]
+    # ── View trend article ─────────────────────
+    # Charts are fetched from /api/metrics after the page renders;
+    # ?article=<id> narrows the view trend to one article in scope.
+    trend_article = None
+    trend_article_id = request.args.get('article', type=int)
+    if trend_article_id:
+        candidate = Article.query.get(trend_article_id)
+        if candidate and (candidate.tenant_id == tenant_id or
+                          (not tenant_id and current_user.is_admin())):
+            trend_article = candidate
 
     # ── Member stats ───────────────────────────
     if tenant_id:
@@ -67,50 +85,28 @@ def dashboard():
         total_members = 0
         authors = reviewers = editors = []
 
-    # ── Status breakdown for chart ─────────────
-    status_data = {
-        'Published':    len(published),
-        'Under Review': len(under_review),
-        'Submitted':    len(submitted),
-        'Rejected':     len(rejected),
-        'Draft':        len(drafts),
-    }
-
-    # ── Monthly submissions (last 6 months) ────
-    monthly_data = []
-    for i in range(5, -1, -1):
-        month_start = datetime.utcnow().replace(day=1) - timedelta(days=30 * i)
-        month_end   = month_start + timedelta(days=31)
-        count = len([a for a in all_articles
-                     if month_start <= a.created_at < month_end])
-        monthly_data.append({
-            'month': month_start.strftime('%b %Y'),
-            'count': count
-        })
-
-    # ── Category breakdown ─────────────────────
-    categories = {}
-    for a in all_articles:
-        cat = a.category or 'Uncategorized'
-        categories[cat] = categories.get(cat, 0) + 1
-    top_categories = sorted(categories.items(), key=lambda x: x[1], reverse=True)[:6]
+    # ── Active users (HyperLogLog estimates) ───
+    if tenant_id or current_user.is_admin():
+        active_users = active_user_counts(tenant_id)
+    else:
+        active_users = {'dau': 0, 'wau': 0, 'mau': 0}
 
     return render_template(
         'analytics/dashboard.html',
         user            = current_user,
         total_articles  = total_articles,
-        total_published = len(published),
+        total_published = counts.get('published', 0),
         total_views     = total_views,
         published_views = published_views,
         total_members   = total_members,
-        under_review    = len(under_review),
-        submitted_count = len(submitted),
+        active_users    = active_users,
+        under_review    = counts.get('under_review', 0),
+        submitted_count = counts.get('submitted', 0),
         top_articles    = top_articles,
-        recent_articles = recent_articles,
-        status_data     = status_data,
-        monthly_data    = monthly_data,
-        top_categories  = top_categories,
+        week_views      = week_views,
+        trending        = trending,
+        trend_article   = trend_article,
         authors         = authors,
         reviewers       = reviewers,
         editors         = editors,
-    )
\ No newline at end of file
+    )
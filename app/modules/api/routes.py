@@ -0,0 +1,65 @@
+# app/modules/api/routes.py
+
+import hashlib
+
+from flask import current_app, jsonify, request
+from flask_login import current_user
+from app.modules.api import api_bp
+from app.models.article import Article
+from app.core.dashboard_metrics import (
+    DASHBOARDS,
+    dashboard_scope,
+    monthly_submissions,
+    scoped_articles,
+    status_breakdown,
+    top_categories,
+)
+from app.core.view_stats import daily_view_series
+
+DEFAULT_MAX_AGE = 60
+
+def _view_trend(scope):
+    kind, scope_id = scope
+    article_id = request.args.get('article', type=int)
+    if article_id:
+        article = Article.query.get(article_id)
+        if article is None or not (kind == 'platform' or (kind == 'tenant' and article.tenant_id == scope_id)):
+            return None
+        series = daily_view_series(article_id=article.id)
+    elif kind in ('platform', 'tenant'):
+        series = daily_view_series(tenant_id=scope_id)
+    else:
+        series = []
+    return [{'label': row['label'], 'count': row['count']} for row in series]
+
+DATASETS = {
+    'status':     lambda scope: status_breakdown(scoped_articles(scope)),
+    'monthly':    lambda scope: monthly_submissions(scoped_articles(scope)),
+    'categories': lambda scope: top_categories(scoped_articles(scope)),
+    'views':      _view_trend,
+}
+
+def _error(message, status):
+    return jsonify({'error': message}), status
+
+# ── Chart data ─────────────────────────────────
+@api_bp.route('/metrics/<dashboard>/<dataset>')
+def metrics(dashboard, dataset):
+    """One chart's data as JSON, revalidated with a strong ETag."""
+    if not current_user.is_authenticated:
+        return _error('Authentication required.', 401)
+    if dashboard not in DASHBOARDS or dataset not in DATASETS:
+        return _error('Unknown metric.', 404)
+    scope = dashboard_scope(current_user, dashboard)
+    if scope is None:
+        return _error('Access denied.', 403)
+    items = DATASETS[dataset](scope)
+    if items is None:
+        return _error('Unknown metric.', 404)
+
+    response = jsonify({'dashboard': dashboard, 'dataset': dataset, 'items': items})
+    response.set_etag(hashlib.sha256(response.get_data()).hexdigest()[:32])
+    max_age = current_app.config.get('METRICS_CACHE_MAX_AGE', DEFAULT_MAX_AGE)
+    response.headers['Cache-Control'] = f'private, max-age={max_age}, must-revalidate'
+    response.vary.add('Cookie')
+    return response.make_conditional(request)
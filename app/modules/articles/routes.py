@@ -1,14 +1,38 @@
 # app/modules/articles/routes.py
 
-from flask import render_template, redirect, url_for, flash, request, abort
+from flask import render_template, redirect, url_for, flash, request, abort, jsonify, current_app, Response
 from flask_login import login_required, current_user
+from markupsafe import Markup
+from sqlalchemy.orm import joinedload
+from werkzeug.http import is_resource_modified
 from app.modules.articles import articles_bp
 from app.modules.articles.forms import SubmitArticleForm, ReviewArticleForm, EditorDecisionForm
 from app.models.article import Article
+from app.models.article_file import ArticleFile
+from app.models.upload_session import UploadSession
 from app.models.tenant import Tenant
 from app.models.user import User
-from app.core.notifications import create_notifications_for_users, notify_platform_admins
+from app.core.dashboard_metrics import status_counts
+from app.core.editorial import DECISIONS, BulkActionError, bulk_assign_reviewer, bulk_decide, load_articles
+from app.core.feeds import (
+    DEFAULT_MAX_AGE as DEFAULT_FEED_MAX_AGE, FORMATS as FEED_FORMATS, feed_etag, feed_state, feed_updated,
+    render_feed,
+)
+from app.core.notifications import bulk_create_notifications, notify_platform_admins
+from app.core.pagination import keyset_paginate, per_page_arg
+from app.core.projections import article_list_query
+from app.core.reviewer_index import refresh_profiles_for, reviewer_choices, suggest_reviewers
+from app.core.revisions import (
+    encode_revisions_later, record_revision, revision_diff, revision_history, text_state,
+)
+from app.core.submission_trends import transition_article
+from app.core.trending import record_trending_view
+from app.core.view_dedup import should_count_view
+from app.core.view_stats import record_view
 from app.core.extensions import db
+from app.core.file_store import send_stored_file
+from app.core.fragment_cache import cached_fragment
+from app.core.uploads import UploadError, parse_content_range, start_upload, upload_state, write_chunk
 from datetime import datetime
 
 def _resolve_editor_tenant_id():
@@ -29,13 +53,18 @@ def _resolve_editor_tenant_id():
 @articles_bp.route('/my-articles')
 @login_required
 def my_articles():
-    articles = Article.query.filter_by(
-        author_id=current_user.id
-    ).order_by(Article.created_at.desc()).all()
+    query = Article.query.filter_by(author_id=current_user.id)
+    articles = keyset_paginate(
+        article_list_query(query, view='my_articles'), Article.created_at, Article.id,
+        cursor=request.args.get('after'), per_page=per_page_arg(request.args),
+    )
+    counts = status_counts(query)
 
     return render_template(
         'articles/my_articles.html',
         articles=articles,
+        counts=counts,
+        total=sum(counts.values()),
         user=current_user
     )
 
@@ -71,13 +100,18 @@ def submit():
         if form.save_draft.data:
             article.status = 'draft'
             db.session.add(article)
+            record_revision(article, author_id=current_user.id)
             db.session.commit()
+            encode_revisions_later(article.id)
             flash('Article saved as draft.', 'info')
         else:
-            article.status       = 'submitted'
             article.submitted_at = datetime.utcnow()
             db.session.add(article)
+            db.session.flush()
+            transition_article(article, 'submitted', actor_id=current_user.id)
+            record_revision(article, author_id=current_user.id)
             db.session.commit()
+            encode_revisions_later(article.id)
             notify_platform_admins(
                 title='Article submitted',
                 message=f'"{article.title}" submitted by {current_user.full_name}.',
@@ -92,23 +126,51 @@ def submit():
 
 # VIEW ARTICLE (public)
 
+def _is_editor_of(article):
+    if not current_user.is_editor():
+        return False
+    tenant_id = _resolve_editor_tenant_id()
+    return not (tenant_id and article.tenant_id != tenant_id)
+
+def _can_read(article):
+    """Only published articles are public; authors, editors and reviewers see their own."""
+    if article.status == 'published':
+        return True
+    if not current_user.is_authenticated:
+        return False
+    return (current_user.id == article.author_id or
+            _is_editor_of(article) or
+            current_user.id == article.reviewer_id)
+
 @articles_bp.route('/article/<int:article_id>')
 def view(article_id):
-    article = Article.query.get_or_404(article_id)
+    # The body (abstract, text, files) comes from the fragment cache when it
+    # can, so only the columns the page chrome needs are loaded up front
+    article = article_list_query(Article.query, view='article_view').filter_by(id=article_id).first_or_404()
+    if not _can_read(article):
+        abort(404)
+
+    if article.status == 'published':
+        body_html = cached_fragment('article_body', article.id, article.updated_at,
+                                    lambda: _render_article_body(article))
+    else:
+        body_html = Markup(_render_article_body(article))
+
+    # Reloads, repeat visits inside the dedup window and bots are not views.
+    if should_count_view(article.id):
+        article.increment_views()
+        record_view(article)
+        record_trending_view(article)
 
-    # Only published articles are publicly visible
-    # Authors, editors, reviewers can see their own
-    if article.status != 'published':
-        if not current_user.is_authenticated:
-            abort(404)
-        if (current_user.id != article.author_id and
-                not current_user.is_editor() and
-                current_user.id != article.reviewer_id):
-            abort(404)
+    return render_template('articles/view.html', article=article, body_html=body_html, user=current_user)
 
-    article.increment_views()
+def _article_files(article):
+    return article.files.options(joinedload(ArticleFile.stored_file)) \
+        .order_by(ArticleFile.kind, ArticleFile.created_at).all()
 
-    return render_template('articles/view.html', article=article, user=current_user)
+def _render_article_body(article):
+    files = _article_files(article)
+    return render_template('articles/view_body.html', article=article, files=files)
 
 # EDIT ARTICLE (author, draft/submitted only)
 
@@ -129,6 +191,7 @@ def edit(article_id):
     form = SubmitArticleForm(obj=article)
 
     if form.validate_on_submit():
+        before             = text_state(article)
         article.title      = form.title.data.strip()
         article.abstract   = form.abstract.data.strip()
         article.keywords   = form.keywords.data
@@ -138,14 +201,17 @@ def edit(article_id):
         article.updated_at = datetime.utcnow()
 
         if form.save_draft.data:
-            article.status = 'draft'
+            transition_article(article, 'draft', actor_id=current_user.id)
             flash('Draft saved.', 'info')
         else:
-            article.status       = 'submitted'
+            transition_article(article, 'submitted', actor_id=current_user.id)
             article.submitted_at = datetime.utcnow()
             flash('Article resubmitted successfully!', 'success')
 
+        revision = record_revision(article, author_id=current_user.id, before=before)
         db.session.commit()
+        if revision is not None:
+            encode_revisions_later(article.id)
         if not form.save_draft.data:
             notify_platform_admins(
                 title='Article resubmitted',
@@ -155,7 +221,8 @@ def edit(article_id):
             )
         return redirect(url_for('articles.my_articles'))
 
-    return render_template('articles/submit.html', form=form, article=article, user=current_user)
+    files = _article_files(article)
+    return render_template('articles/submit.html', form=form, article=article, files=files, user=current_user)
 
 # DELETE ARTICLE (draft only)
 
@@ -177,55 +244,142 @@ def delete(article_id):
     flash('Article deleted.', 'info')
     return redirect(url_for('articles.my_articles'))
 
-# EDITOR PANEL — all articles (editors) or assigned (reviewers)
+# FILES — chunked uploads and downloads
 
-@articles_bp.route('/editor/panel')
+def _can_attach(article):
+    if _is_editor_of(article):
+        return True
+    return article.author_id == current_user.id and article.status in ['draft', 'submitted']
+
+def _upload_error(error):
+    return jsonify({'error': error.message}), error.status
+
+@articles_bp.route('/article/<int:article_id>/uploads', methods=['POST'])
 @login_required
-def editor_panel():
-    is_editor  = current_user.is_editor()
-    is_reviewer = current_user.is_reviewer()
+def start_file_upload(article_id):
+    article = Article.query.get_or_404(article_id)
+    if not _can_attach(article):
+        abort(403)
+    data = request.get_json(silent=True) or {}
+    try:
+        upload = start_upload(
+            article, current_user.id, data.get('kind', 'supplementary'),
+            data.get('filename'), data.get('size'), data.get('content_type'),
+        )
+    except UploadError as error:
+        return _upload_error(error)
+    return jsonify(upload_state(upload)), 201
 
-    if not is_editor and not is_reviewer:
-        flash('Editor or Reviewer access required.', 'danger')
+@articles_bp.route('/uploads/<upload_id>', methods=['GET', 'PUT'])
+@login_required
+def upload_chunk(upload_id):
+    """GET reports how many bytes arrived (to resume); PUT sends the next chunk."""
+    upload = db.session.get(UploadSession, upload_id, with_for_update=request.method == 'PUT')
+    if upload is None or upload.user_id != current_user.id:
+        abort(404)
+    if request.method == 'PUT':
+        try:
+            start, length, total = parse_content_range(request.headers.get('Content-Range'))
+            write_chunk(upload, request.stream, start, length, total)
+        except UploadError as error:
+            db.session.rollback()
+            response, status = _upload_error(error)
+            response.headers['Upload-Offset'] = str(upload.received)
+            return response, status
+    response = jsonify(upload_state(upload))
+    response.headers['Upload-Offset'] = str(upload.received)
+    return response
+
+@articles_bp.route('/article/<int:article_id>/files/<int:file_id>/<path:filename>')
+def download_file(article_id, file_id, filename):
+    article_file = ArticleFile.query.filter_by(id=file_id, article_id=article_id).first_or_404()
+    if not _can_read(article_file.article):
+        abort(404)
+    return send_stored_file(article_file.stored_file, article_file.filename,
+                            as_attachment=article_file.kind != 'manuscript',
+                            public=article_file.article.status == 'published')
+
+@articles_bp.route('/article/<int:article_id>/files/<int:file_id>/delete', methods=['POST'])
+@login_required
+def delete_file(article_id, file_id):
+    article_file = ArticleFile.query.filter_by(id=file_id, article_id=article_id).first_or_404()
+    article = article_file.article
+    if not _can_attach(article):
         abort(403)
+    if article_file.kind == 'manuscript':
+        article.pdf_url = None
+    article.updated_at = datetime.utcnow()
+    db.session.delete(article_file)
+    db.session.commit()
+    flash(f'Removed {article_file.filename}.', 'info')
+    return redirect(request.referrer or url_for('articles.view', article_id=article.id))
+
+# EDITOR PANEL — all articles (editors) or assigned (reviewers)
+
+EDITOR_TABS = ('submitted', 'under_review', 'accepted', 'published', 'rejected')
 
-    if is_editor:
+def _editor_panel_query():
+    """Articles visible in the editor panel, or abort for other roles."""
+    if current_user.is_editor():
         # Resolve tenant_id properly for tenant_owners (who may own a tenant
         # via Tenant.owner_id but have a null tenant_id on their user record)
         effective_tenant_id = _resolve_editor_tenant_id()
         if effective_tenant_id:
-            articles = Article.query.filter_by(
-                tenant_id=effective_tenant_id
-            ).order_by(Article.created_at.desc()).all()
-        else:
-            # Platform admin — show all articles
-            articles = Article.query.order_by(Article.created_at.desc()).all()
-    else:
+            return Article.query.filter_by(tenant_id=effective_tenant_id)
+        # Platform admin — show all articles
+        return Article.query
+    if current_user.is_reviewer():
         # Reviewers only see articles assigned to them
-        articles = Article.query.filter_by(
-            reviewer_id=current_user.id
-        ).order_by(Article.created_at.desc()).all()
+        return Article.query.filter_by(reviewer_id=current_user.id)
+    flash('Editor or Reviewer access required.', 'danger')
+    abort(403)
+
+def _editor_tab(query, tab):
+    """Template context for one editor panel tab."""
+    page = keyset_paginate(
+        article_list_query(query.filter(Article.status == tab), view='editor_panel'), Article.created_at, Article.id,
+        cursor=request.args.get('after'), per_page=per_page_arg(request.args),
+    )
+    # Reviewer choices for every journal on the page and suggestions for
+    # every row, from the reviewer index in two queries
+    reviewers, suggestions = {}, {}
+    if tab == 'submitted' and page.items:
+        reviewers, suggestions = reviewer_choices(page.items)
+    return {'tab': tab, 'page': page, 'reviewers': reviewers, 'suggestions': suggestions}
+
+@articles_bp.route('/editor/panel')
+@login_required
+def editor_panel():
+    query = _editor_panel_query()
 
-    submitted    = [a for a in articles if a.status == 'submitted']
-    under_review = [a for a in articles if a.status == 'under_review']
-    accepted     = [a for a in articles if a.status == 'accepted']
-    published    = [a for a in articles if a.status == 'published']
-    rejected     = [a for a in articles if a.status == 'rejected']
-    drafts       = [a for a in articles if a.status == 'draft']
+    # Tab counts come from one GROUP BY; only the active tab's rows are
+    # loaded here, the other tabs fetch editor_panel_tab when opened.
+    active_tab = request.args.get('tab', 'submitted')
+    if active_tab not in EDITOR_TABS:
+        active_tab = 'submitted'
+    counts = status_counts(query)
 
     return render_template(
         'articles/editor_panel.html',
-        user         = current_user,
-        all_articles = articles,
-        submitted    = submitted,
-        under_review = under_review,
-        accepted     = accepted,
-        published    = published,
-        rejected     = rejected,
-        drafts       = drafts,
-        is_editor    = is_editor,
+        user       = current_user,
+        counts     = counts,
+        total      = sum(counts.values()),
+        tabs       = EDITOR_TABS,
+        active_tab = active_tab,
+        is_editor  = current_user.is_editor(),
+        **_editor_tab(query, active_tab),
     )
 
+@articles_bp.route('/editor/panel/tab')
+@login_required
+def editor_panel_tab():
+    """One tab of the editor panel as an HTML fragment."""
+    query = _editor_panel_query()
+    tab = request.args.get('tab')
+    if tab not in EDITOR_TABS:
+        abort(404)
+    return render_template('articles/editor_panel_tab.html', **_editor_tab(query, tab))
+
 # EDITOR — assign reviewer
 
 @articles_bp.route('/editor/article/<int:article_id>/assign', methods=['POST'])
@@ -251,22 +405,36 @@ def assign_reviewer(article_id):
         flash('Reviewer must belong to the same journal.', 'danger')
         return redirect(url_for('articles.editor_panel'))
 
+    previous_reviewer_id = article.reviewer_id
     article.reviewer_id = reviewer.id
-    article.status      = 'under_review'
     article.editor_id   = current_user.id
+    transition_article(article, 'under_review', actor_id=current_user.id)
+    refresh_profiles_for([article], previous_reviewer_id)
+    bulk_create_notifications([{
+        'user_id': reviewer.id,
+        'title': 'New review assignment',
+        'message': f'You were assigned to review "{article.title}".',
+        'link_url': url_for('articles.review_article', article_id=article.id),
+        'category': 'review_assignment',
+    }], commit=False)
     db.session.commit()
 
-    create_notifications_for_users(
-        user_ids=[reviewer.id],
-        title='New review assignment',
-        message=f'You were assigned to review "{article.title}".',
-        link_url=url_for('articles.review_article', article_id=article.id),
-        category='review_assignment',
-    )
-
     flash(f'Article assigned to {reviewer.full_name} for review.', 'success')
     return redirect(url_for('articles.editor_panel'))
 
+@articles_bp.route('/editor/article/<int:article_id>/reviewer-suggestions')
+@login_required
+def reviewer_suggestions(article_id):
+    """Suggested reviewers for one article as JSON, best first."""
+    if not current_user.is_editor():
+        abort(403)
+    article = article_list_query(Article.query).filter_by(id=article_id).first_or_404()
+    tenant_id = _resolve_editor_tenant_id()
+    if tenant_id and article.tenant_id != tenant_id:
+        abort(404)
+    limit = min(request.args.get('limit', 0, type=int), 50) or None
+    return jsonify({'suggestions': [s.to_dict() for s in suggest_reviewers(article, limit=limit)]})
+
 # EDITOR — final decision (publish/reject)
 
 @articles_bp.route('/editor/article/<int:article_id>/decision', methods=['GET', 'POST'])
@@ -279,40 +447,20 @@ def editor_decision(article_id):
     form    = EditorDecisionForm()
 
     if form.validate_on_submit():
-        article.editor_id    = current_user.id
+        # Status, DOI and notification commit together; the ranking and other
+        # derived state follow from the status hooks
+        status = DECISIONS[form.decision.data]
+        # The notes are kept even when the status does not change
+        article.editor_id = current_user.id
         article.editor_notes = form.editor_notes.data
-        notification_title = None
-        notification_message = None
-        notification_link = url_for('articles.my_articles')
-
-        if form.decision.data == 'publish':
-            article.status       = 'published'
-            article.published_at = datetime.utcnow()
-            article.generate_doi()
-            notification_title = 'Article published'
-            notification_message = f'Your article "{article.title}" is now published.'
-            notification_link = url_for('articles.view', article_id=article.id)
-            flash(f'Article published! DOI: {article.doi}', 'success')
-        elif form.decision.data == 'accept':
-            article.status = 'accepted'
-            notification_title = 'Article accepted'
-            notification_message = f'Your article "{article.title}" has been accepted.'
-            flash('Article accepted.', 'success')
-        elif form.decision.data == 'reject':
-            article.status = 'rejected'
-            notification_title = 'Article rejected'
-            notification_message = f'Your article "{article.title}" was rejected.'
-            flash('Article rejected.', 'info')
-
-        db.session.commit()
-        if notification_title and notification_message:
-            create_notifications_for_users(
-                user_ids=[article.author_id],
-                title=notification_title,
-                message=notification_message,
-                link_url=notification_link,
-                category='article_status',
-            )
+        if bulk_decide([article], form.decision.data, current_user.id, editor_notes=form.editor_notes.data):
+            if status == 'published':
+                flash(f'Article published! DOI: {article.doi}', 'success')
+            else:
+                flash(f'Article {status}.', 'success' if status == 'accepted' else 'info')
+        else:
+            db.session.commit()
+            flash(f'Article is already {status}; notes saved.', 'info')
         return redirect(url_for('articles.editor_panel'))
 
     return render_template(
@@ -320,6 +468,39 @@ def editor_decision(article_id):
         article=article, form=form, user=current_user
     )
 
+# EDITOR — bulk actions on a selection from the panel
+
+@articles_bp.route('/editor/bulk', methods=['POST'])
+@login_required
+def editor_bulk_action():
+    if not current_user.is_editor():
+        abort(403)
+
+    action = request.form.get('action')
+    tab = request.form.get('tab', 'submitted')
+    back = url_for('articles.editor_panel', tab=tab if tab in EDITOR_TABS else 'submitted')
+    try:
+        articles = load_articles(request.form.getlist('article_ids', type=int),
+                                 tenant_id=_resolve_editor_tenant_id())
+        if action == 'assign':
+            reviewer = db.session.get(User, request.form.get('reviewer_id', type=int) or 0)
+            if not reviewer or not reviewer.is_reviewer():
+                raise BulkActionError('Please select a reviewer.')
+            changed = bulk_assign_reviewer(articles, reviewer, current_user.id)
+            message = f'{len(changed)} article(s) assigned to {reviewer.full_name} for review.'
+        else:
+            changed = bulk_decide(articles, action, current_user.id)
+            message = f'{len(changed)} article(s) marked {DECISIONS[action]}.'
+    except BulkActionError as exc:
+        flash(str(exc), 'warning')
+        return redirect(back)
+
+    skipped = len(articles) - len(changed)
+    if skipped:
+        message += f' {skipped} skipped.'
+    flash(message, 'success' if changed else 'info')
+    return redirect(back)
+
 # REVIEWER — submit review
 
 @articles_bp.route('/review/article/<int:article_id>', methods=['GET', 'POST'])
@@ -339,19 +520,30 @@ def review_article(article_id):
         article.review_notes = form.review_notes.data
 
         if form.decision.data == 'accept':
-            article.status = 'accepted'
+            transition_article(article, 'accepted', actor_id=current_user.id)
         elif form.decision.data in ['minor_revision', 'major_revision']:
-            article.status = 'submitted'  # Sends back for revision
+            transition_article(article, 'submitted', actor_id=current_user.id)  # Sends back for revision
         elif form.decision.data == 'reject':
-            article.status = 'rejected'
+            transition_article(article, 'rejected', actor_id=current_user.id)
 
+        refresh_profiles_for([article])
         db.session.commit()
         flash('Review submitted successfully!', 'success')
         return redirect(url_for('articles.editor_panel'))
 
+    # Changes between two submissions, newest pair by default
+    revisions = revision_history(article.id)
+    numbers = [r.number for r in revisions]
+    compare_to = request.args.get('to', numbers[0] if numbers else 0, type=int)
+    compare_from = request.args.get('from', compare_to - 1, type=int)
+    diff = None
+    if compare_from in numbers and compare_to in numbers and compare_from != compare_to:
+        diff = revision_diff(article.id, compare_from, compare_to)
+
     return render_template(
         'articles/review.html',
-        article=article, form=form, user=current_user
+        article=article, form=form, user=current_user,
+        revisions=revisions, compare_from=compare_from, compare_to=compare_to, diff=diff,
     )
 
 # JOURNAL PUBLIC PAGE — published articles
@@ -362,13 +554,35 @@ def journal_articles(subdomain):
         subdomain=subdomain, is_active=True
     ).first_or_404()
 
-    articles = Article.query.filter_by(
-        tenant_id=tenant.id,
-        status='published'
-    ).order_by(Article.published_at.desc()).all()
+    articles = keyset_paginate(
+        article_list_query(Article.query.filter_by(tenant_id=tenant.id, status='published'), view='journal_articles'),
+        Article.published_at, Article.id,
+        cursor=request.args.get('after'), per_page=per_page_arg(request.args),
+    )
 
     return render_template(
         'articles/journal_articles.html',
         tenant=tenant,
         articles=articles
     )
+
+# JOURNAL FEEDS — latest published articles as Atom or RSS
+
+@articles_bp.route('/journal/<subdomain>/feed.<any(atom, rss):fmt>')
+def journal_feed(subdomain, fmt):
+    tenant = Tenant.query.filter_by(subdomain=subdomain, is_active=True).first_or_404()
+
+    # Validators come from one aggregate; unchanged feeds answer 304 unrendered
+    state = feed_state(tenant.id)
+    etag = feed_etag(tenant.id, fmt, state)
+    last_modified = feed_updated(state)
+    if is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        response = Response(render_feed(tenant, fmt, state), mimetype=FEED_FORMATS[fmt][1])
+    else:
+        response = Response(status=304)
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified
+    max_age = current_app.config.get('FEED_MAX_AGE', DEFAULT_FEED_MAX_AGE)
+    response.headers['Cache-Control'] = f'public, max-age={max_age}'
+    return response
@@ -9,6 +9,7 @@ from app.models.user import User
 from app.models.tenant import Tenant
 from app.models.subscription import Subscription
 from app.core.notifications import notify_platform_admins
+from app.core.cohorts import record_signup, record_login
 from app.core.extensions import db
 from app.core.email import send_email
 from datetime import datetime
@@ -107,6 +108,7 @@ def register():
         db.session.add(user)
         db.session.flush()
         _ensure_non_admin_owner_setup(user)
+        record_signup(user)
         db.session.commit()
         notify_platform_admins(
             title='New user registered',
@@ -130,6 +132,7 @@ def login():
                 flash('Account deactivated. Contact support.', 'danger')
                 return redirect(url_for('auth.login'))
             login_user(user, remember=form.remember_me.data)
+            record_login(user, user.last_login)
             user.last_login = datetime.utcnow()
             _ensure_non_admin_owner_setup(user)
             db.session.commit()
@@ -7,6 +7,7 @@ from app.models.article import Article
 from app.models.transaction import Transaction
 from app.core.extensions import db
 from app.core.decorators import tenant_owner_required
+from app.core.revenue import invalidate_revenue_month
 from datetime import datetime, timedelta
 from types import SimpleNamespace
 import hashlib
@@ -442,8 +443,9 @@ def transactions():
     if method_filter:
         query = query.filter_by(payment_method=method_filter)
     all_txns      = query.order_by(Transaction.created_at.desc()).all()
-    completed_txns = Transaction.query.filter_by(tenant_id=tenant.id, status='completed').all()
-    total_paid    = sum(t.amount for t in completed_txns)
+    total_paid    = db.session.query(db.func.coalesce(db.func.sum(Transaction.amount), 0)).filter(
+        Transaction.tenant_id == tenant.id, Transaction.status == 'completed'
+    ).scalar()
     pending_count = Transaction.query.filter_by(tenant_id=tenant.id, status='pending').count()
     failed_count  = Transaction.query.filter_by(tenant_id=tenant.id, status='failed').count()
     return render_template(
@@ -638,6 +640,7 @@ def approve_payment(txn_id):
         t = Tenant.query.get(txn.tenant_id)
         if t:
             t.plan = txn.plan
+    invalidate_revenue_month(txn.created_at)
     db.session.commit()
     flash('Payment approved and subscription activated.', 'success')
     return redirect(url_for('billing.pending_requests'))
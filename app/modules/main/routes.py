@@ -1,12 +1,14 @@
 from flask import render_template, redirect, url_for
 from flask_login import login_required, current_user
+from app.core.dashboard_metrics import effective_tenant_id
 from app.core.extensions import db
+from app.core.projections import article_list_query
+from app.core.sitemaps import PLATFORM as SITEMAP_PLATFORM, send_sitemap
 from app.models.article import Article
 from app.models.tenant import Tenant
 from app.models.user import User
 from app.models.testimonial import Testimonial
 from app.modules.main import main_bp
-from datetime import datetime, timedelta
 
 DEFAULT_TESTIMONIALS = [
     {
@@ -65,6 +67,14 @@ def index():
     )
     return render_template('main/index.html', testimonials=testimonials)
 
+@main_bp.route('/sitemap.xml')
+def sitemap_index():
+    return send_sitemap(SITEMAP_PLATFORM, 'sitemap')
+
+@main_bp.route('/sitemaps/<scope>/<name>.xml')
+def sitemap_file(scope, name):
+    return send_sitemap(scope, name)
+
 @main_bp.route('/dashboard')
 @login_required
 def dashboard():
@@ -84,53 +94,25 @@ def dashboard():
             ).scalar() or 0
         ),
     }
-    recent_articles = scoped_articles.order_by(Article.created_at.desc()).limit(8).all()
+    recent_articles = article_list_query(scoped_articles, view='dashboard').order_by(Article.created_at.desc()).limit(8).all()
     my_tenant = Tenant.query.get(current_user.tenant_id) if current_user.tenant_id else None
 
     # ── Analytics data (scoped to tenant if tenant_owner, else author-only) ──────
-    # Resolve tenant_id: tenant_owners own a journal via Tenant.owner_id
-    # but their user.tenant_id may be null
-    effective_tenant_id = current_user.tenant_id
-    if not effective_tenant_id and current_user.is_tenant_owner():
-        owned_tenant = Tenant.query.filter_by(owner_id=current_user.id).first()
-        if owned_tenant:
-            effective_tenant_id = owned_tenant.id
-
-    if effective_tenant_id:
-        all_a = Article.query.filter_by(tenant_id=effective_tenant_id).all()
+    # Status, monthly and category charts load from /api/metrics after render.
+    analytics_tenant_id = effective_tenant_id(current_user)
+    if analytics_tenant_id:
+        analytics_q = Article.query.filter_by(tenant_id=analytics_tenant_id)
     else:
-        all_a = Article.query.filter_by(author_id=current_user.id).all()
-
-    published_arts    = [a for a in all_a if a.status == 'published']
-    under_review_arts = [a for a in all_a if a.status == 'under_review']
-    submitted_arts    = [a for a in all_a if a.status == 'submitted']
-    rejected_arts     = [a for a in all_a if a.status == 'rejected']
-    draft_arts        = [a for a in all_a if a.status == 'draft']
-
-    status_data = {
-        'Published':    len(published_arts),
-        'Under Review': len(under_review_arts),
-        'Submitted':    len(submitted_arts),
-        'Rejected':     len(rejected_arts),
-        'Draft':        len(draft_arts),
-    }
-    top_articles = sorted(published_arts, key=lambda a: a.views, reverse=True)[:5]
-
-    monthly_data = []
-    for i in range(5, -1, -1):
-        month_start = datetime.utcnow().replace(day=1) - timedelta(days=30 * i)
-        month_end   = month_start + timedelta(days=31)
-        count = len([a for a in all_a if month_start <= a.created_at < month_end])
-        monthly_data.append({'month': month_start.strftime('%b %Y'), 'count': count})
-
-    categories = {}
-    for a in all_a:
-        cat = getattr(a, 'category', None) or 'Uncategorized'
-        categories[cat] = categories.get(cat, 0) + 1
-    top_categories = sorted(categories.items(), key=lambda x: x[1], reverse=True)[:6]
+        analytics_q = scoped_articles
+    top_articles = (
+        article_list_query(analytics_q, view='dashboard').filter(Article.status == 'published')
+        .order_by(Article.views.desc())
+        .limit(5)
+        .all()
+    )
 
-    if effective_tenant_id:
-        members   = User.query.filter_by(tenant_id=effective_tenant_id).all()
+    if analytics_tenant_id:
+        members   = User.query.filter_by(tenant_id=analytics_tenant_id).all()
         authors   = [m for m in members if m.role == 'author']
         reviewers = [m for m in members if m.role == 'reviewer']
         editors   = [m for m in members if m.role in ['editor', 'tenant_owner']]
@@ -145,10 +127,8 @@ def dashboard():
         stats=stats,
         recent_articles=recent_articles,
         # Analytics data
-        status_data=status_data,
-        monthly_data=monthly_data,
+        metrics_dashboard='member',
         top_articles=top_articles,
-        top_categories=top_categories,
         authors=authors,
         reviewers=reviewers,
         editors=editors,
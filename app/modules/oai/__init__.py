@@ -0,0 +1,2 @@
+from flask import Blueprint
+oai_bp = Blueprint('oai', __name__)
\ No newline at end of file
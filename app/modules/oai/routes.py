@@ -0,0 +1,37 @@
+# app/modules/oai/routes.py
+
+from flask import Response, request, stream_with_context, url_for
+from app.modules.oai import oai_bp
+from app.models.tenant import Tenant
+from app.core.extensions import csrf
+from app.core.oai import (
+    OAIError, error_response, get_record, identify, list_metadata_formats, list_records, validate_arguments,
+)
+
+XML_MIMETYPE = 'text/xml'
+
+# OAI-PMH 2.0 — harvesters may send the same arguments as a form POST
+
+@oai_bp.route('/<subdomain>', methods=['GET', 'POST'])
+@csrf.exempt
+def repository(subdomain):
+    tenant = Tenant.query.filter_by(subdomain=subdomain, is_active=True).first_or_404()
+    base_url = url_for('oai.repository', subdomain=subdomain, _external=True)
+    args = request.form if request.method == 'POST' else request.args
+    try:
+        verb, given = validate_arguments(args)
+        if verb == 'Identify':
+            body = identify(tenant, base_url)
+        elif verb == 'ListMetadataFormats':
+            body = list_metadata_formats(tenant, base_url, given)
+        elif verb == 'ListSets':
+            if 'resumptionToken' in given:
+                raise OAIError('badResumptionToken', 'The resumptionToken is invalid.')
+            raise OAIError('noSetHierarchy', 'This repository does not support sets.')
+        elif verb == 'GetRecord':
+            body = get_record(tenant, base_url, given)
+        else:
+            body = stream_with_context(list_records(tenant, base_url, verb, given))
+    except OAIError as exc:
+        body = error_response(base_url, exc, args.to_dict())
+    return Response(body, mimetype=XML_MIMETYPE)
@@ -7,6 +7,7 @@ from app.models.article import Article
 from app.models.tenant import Tenant
 from app.models.user import User
 from app.core.extensions import db
+from app.core.projections import article_list_query, with_abstract_preview
 
 @search_bp.route('/search')
 @login_required
@@ -18,11 +19,12 @@ def search():
     articles = []
     journals = []
     authors  = []
+    article_counts = {}
     total    = 0
 
     if query:
         if search_type in ('all', 'articles'):
-            articles = Article.query.filter(
+            articles = with_abstract_preview(article_list_query(Article.query, view='search')).filter(
                 Article.status == 'published',
                 db.or_(
                     Article.title.ilike(f'%{query}%'),
@@ -48,6 +50,14 @@ def search():
                     User.last_name.ilike(f'%{query}%'),
                 )
             ).all()
+            if authors:
+                # One grouped count instead of loading every author's articles
+                article_counts = dict(
+                    db.session.query(Article.author_id, db.func.count(Article.id))
+                    .filter(Article.author_id.in_([a.id for a in authors]))
+                    .group_by(Article.author_id)
+                    .all()
+                )
 
         total = len(articles) + len(journals) + len(authors)
 
@@ -58,5 +68,6 @@ def search():
         articles=articles,
         journals=journals,
         authors=authors,
+        article_counts=article_counts,
         total=total,
     )
@@ -9,6 +9,7 @@ from app.models.user import User
 from app.core.notifications import notify_platform_admins
 from app.core.extensions import db
 from app.core.decorators import tenant_owner_required
+from app.core.trending import trending_articles
 from datetime import datetime
 
 def _managed_tenant_for_current_user():
@@ -193,5 +194,7 @@ def view_journal(subdomain):
         is_active=True
     ).first_or_404()
 
-    return render_template('tenants/journal_public.html', tenant=tenant)
+    trending = trending_articles(tenant.id, limit=5)
+
+    return render_template('tenants/journal_public.html', tenant=tenant, trending=trending)
 
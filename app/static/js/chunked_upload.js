@@ -0,0 +1,133 @@
+/* ═══════════════════════════════════════════════════════
+   RESEARCH HUB — CHUNKED UPLOAD
+   Sends a file in Content-Range chunks to the resumable
+   upload endpoint. After a network error it asks the server
+   how much arrived and continues from there; an upload cut
+   off by a page reload resumes when the same file is picked.
+═══════════════════════════════════════════════════════ */
+
+(function () {
+    'use strict';
+
+    var MAX_RETRIES = 5;
+
+    function storageKey(startUrl, kind, file) {
+        return 'upload:' + startUrl + ':' + kind + ':' + file.name + ':' + file.size + ':' + file.lastModified;
+    }
+
+    function request(method, url, csrf, body, headers) {
+        var init = { method: method, credentials: 'same-origin', headers: headers || {} };
+        init.headers['X-CSRFToken'] = csrf;
+        init.headers['Accept'] = 'application/json';
+        if (body !== undefined) init.body = body;
+        return fetch(url, init).then(function (response) {
+            return response.json().catch(function () { return {}; }).then(function (data) {
+                data.httpStatus = response.status;
+                return data;
+            });
+        });
+    }
+
+    function wait(ms) {
+        return new Promise(function (resolve) { setTimeout(resolve, ms); });
+    }
+
+    function Uploader(root) {
+        this.root = root;
+        this.startUrl = root.getAttribute('data-start-url');
+        this.csrf = root.getAttribute('data-csrf-token');
+        this.kind = root.querySelector('[data-upload-kind]');
+        this.input = root.querySelector('[data-upload-file]');
+        this.progress = root.querySelector('.upload-progress');
+        this.bar = root.querySelector('.upload-progress-bar');
+        this.status = root.querySelector('.upload-status');
+        this.input.addEventListener('change', this.onChange.bind(this));
+    }
+
+    Uploader.prototype.report = function (offset, size, text) {
+        var pct = size ? Math.floor(offset * 100 / size) : 0;
+        this.progress.classList.add('active');
+        this.bar.style.width = pct + '%';
+        this.status.textContent = text || (pct + '% uploaded');
+    };
+
+    Uploader.prototype.onChange = function () {
+        var file = this.input.files[0];
+        if (!file) return;
+        var self = this;
+        var kind = this.kind.value;
+        var key = storageKey(this.startUrl, kind, file);
+        this.input.disabled = this.kind.disabled = true;
+
+        this.open(file, kind, key)
+            .then(function (upload) { return self.send(file, upload, 0); })
+            .then(function (upload) {
+                localStorage.removeItem(key);
+                self.report(upload.size, upload.size, 'Upload complete.');
+                window.location.reload();
+            })
+            .catch(function (error) {
+                self.status.textContent = (error && error.message) || 'Upload failed.';
+                self.input.disabled = self.kind.disabled = false;
+            });
+    };
+
+    // Resume an earlier upload of the same file, or start a new one
+    Uploader.prototype.open = function (file, kind, key) {
+        var self = this;
+        var saved = localStorage.getItem(key);
+        var resume = saved
+            ? request('GET', saved, this.csrf).then(function (data) {
+                return data.httpStatus === 200 && data.status === 'open' ? data : null;
+            })
+            : Promise.resolve(null);
+        return resume.then(function (upload) {
+            if (upload) return upload;
+            var body = JSON.stringify({ kind: kind, filename: file.name, size: file.size, content_type: file.type });
+            return request('POST', self.startUrl, self.csrf, body, { 'Content-Type': 'application/json' })
+                .then(function (data) {
+                    if (data.httpStatus !== 201) throw new Error(data.error || 'Could not start the upload.');
+                    localStorage.setItem(key, data.url);
+                    return data;
+                });
+        });
+    };
+
+    Uploader.prototype.send = function (file, upload, retries) {
+        var self = this;
+        if (upload.status === 'complete') return Promise.resolve(upload);
+        var start = upload.offset;
+        var end = Math.min(start + upload.chunk_size, file.size);
+        this.report(start, file.size);
+        var headers = {
+            'Content-Type': 'application/octet-stream',
+            'Content-Range': 'bytes ' + start + '-' + (end - 1) + '/' + file.size
+        };
+        return request('PUT', upload.url, this.csrf, file.slice(start, end), headers)
+            .then(function (data) {
+                if (data.httpStatus === 200) return self.send(file, data, 0);
+                if (data.httpStatus !== 409) throw new Error(data.error || 'Upload failed.');
+                return self.resume(file, upload, retries);  // out of step: ask where to continue
+            }, function () {
+                return self.resume(file, upload, retries);  // network error
+            });
+    };
+
+    Uploader.prototype.resume = function (file, upload, retries) {
+        var self = this;
+        if (retries >= MAX_RETRIES) return Promise.reject(new Error('Upload interrupted; pick the file again to resume.'));
+        this.status.textContent = 'Connection lost, retrying…';
+        return wait(1000 * Math.pow(2, retries))
+            .then(function () { return request('GET', upload.url, self.csrf); })
+            .then(function (data) {
+                if (data.httpStatus !== 200) throw new Error(data.error || 'Upload failed.');
+                return self.send(file, data, retries + 1);
+            }, function () {
+                return self.resume(file, upload, retries + 1);
+            });
+    };
+
+    document.querySelectorAll('[data-chunked-upload]').forEach(function (root) {
+        new Uploader(root);
+    });
+})();
@@ -0,0 +1,112 @@
+/* ═══════════════════════════════════════════════════════
+   RESEARCH HUB — DASHBOARD CHARTS
+   Fills [data-chart-src] placeholders from /api/metrics
+   after first paint. The browser revalidates with the
+   ETag, so unchanged charts come back as 304s.
+═══════════════════════════════════════════════════════ */
+
+(function () {
+    'use strict';
+
+    function el(tag, className, text) {
+        var node = document.createElement(tag);
+        if (className) node.className = className;
+        if (text !== undefined) node.textContent = text;
+        return node;
+    }
+
+    function maxCount(items) {
+        var max = 0;
+        items.forEach(function (item) { if (item.count > max) max = item.count; });
+        return max > 0 ? max : 1;
+    }
+
+    function truncate(label, length) {
+        if (!length || label.length <= length) return label;
+        return label.slice(0, length) + '…';
+    }
+
+    /* Horizontal bars: status breakdown, categories */
+    function renderBars(container, items) {
+        var colors = JSON.parse(container.getAttribute('data-colors') || '{}');
+        var fillClass = container.getAttribute('data-fill-class') || '';
+        var labelLength = parseInt(container.getAttribute('data-label-length') || '0', 10);
+        var max = maxCount(items);
+        items.forEach(function (item) {
+            var row = el('div', 'bar-row');
+            row.appendChild(el('div', 'bar-label', truncate(item.label, labelLength)));
+            var track = el('div', 'bar-track');
+            var fill = el('div', ('bar-fill ' + (colors[item.key] || fillClass)).trim());
+            fill.style.width = Math.floor(item.count / max * 100) + '%';
+            if (item.count > 0) fill.appendChild(el('span', '', String(item.count)));
+            track.appendChild(fill);
+            row.appendChild(track);
+            container.appendChild(row);
+        });
+    }
+
+    /* Vertical columns: monthly submissions, daily views */
+    function renderColumns(container, items) {
+        var unit = container.getAttribute('data-unit') || '';
+        var every = parseInt(container.getAttribute('data-label-every') || '1', 10);
+        var labelTooltip = container.hasAttribute('data-tooltip-label');
+        var max = maxCount(items);
+        items.forEach(function (item, index) {
+            var col = el('div', 'month-col');
+            var bar = el('div', 'month-bar');
+            bar.style.height = Math.floor(item.count / max * 110) + 'px';
+            var tip = item.count + ' ' + unit;
+            bar.appendChild(el('div', 'tooltip', labelTooltip ? item.label + ' · ' + tip : tip));
+            col.appendChild(bar);
+            if (index % every === 0 || index === items.length - 1) {
+                col.appendChild(el('div', 'month-label', item.label));
+            }
+            container.appendChild(col);
+        });
+    }
+
+    function showMessage(container, message) {
+        var parent = container.parentNode;
+        var note = el('div', 'empty-state', message);
+        parent.replaceChild(note, container);
+    }
+
+    function load(container) {
+        fetch(container.getAttribute('data-chart-src'), {
+            credentials: 'same-origin',
+            headers: { 'Accept': 'application/json' }
+        })
+            .then(function (response) {
+                if (!response.ok) throw new Error(response.status);
+                return response.json();
+            })
+            .then(function (payload) {
+                var items = payload.items || [];
+                var hasData = items.some(function (item) { return item.count > 0; });
+                if (!items.length || (!hasData && container.hasAttribute('data-hide-empty'))) {
+                    showMessage(container, container.getAttribute('data-empty') || 'No data available yet.');
+                    return;
+                }
+                container.innerHTML = '';
+                if (container.getAttribute('data-chart') === 'columns') {
+                    renderColumns(container, items);
+                } else {
+                    renderBars(container, items);
+                }
+            })
+            .catch(function () {
+                showMessage(container, 'Could not load chart data.');
+            });
+    }
+
+    function init() {
+        var charts = document.querySelectorAll('[data-chart-src]');
+        Array.prototype.forEach.call(charts, load);
+    }
+
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', init);
+    } else {
+        init();
+    }
+})();
@@ -0,0 +1,49 @@
+/* ═══════════════════════════════════════════════════════
+   RESEARCH HUB — LOAD MORE
+   Progressive enhancement for keyset-paginated lists:
+   fetches the next page and appends its rows in place.
+   Without JS the "Load more" link simply navigates.
+═══════════════════════════════════════════════════════ */
+
+(function () {
+    'use strict';
+
+    function loadMore(link) {
+        var controls = link.closest('[data-load-more-for]');
+        var listId = controls.getAttribute('data-load-more-for');
+        var list = document.querySelector('[data-keyset-list="' + listId + '"]');
+        if (!list) return false;
+
+        controls.classList.add('loading');
+        fetch(link.href, { credentials: 'same-origin', headers: { 'Accept': 'text/html' } })
+            .then(function (response) {
+                if (!response.ok) throw new Error(response.status);
+                return response.text();
+            })
+            .then(function (html) {
+                var doc = new DOMParser().parseFromString(html, 'text/html');
+                var nextList = doc.querySelector('[data-keyset-list="' + listId + '"]');
+                var nextControls = doc.querySelector('[data-load-more-for="' + listId + '"]');
+                if (nextList) {
+                    while (nextList.firstElementChild) list.appendChild(nextList.firstElementChild);
+                }
+                var more = nextControls && nextControls.querySelector('[data-load-more]');
+                if (more) {
+                    link.href = more.href;
+                    controls.classList.remove('loading');
+                } else {
+                    controls.remove();
+                }
+            })
+            .catch(function () {
+                window.location.href = link.href;
+            });
+        return true;
+    }
+
+    document.addEventListener('click', function (event) {
+        var link = event.target.closest('[data-load-more]');
+        if (!link || event.metaKey || event.ctrlKey || event.shiftKey) return;
+        if (loadMore(link)) event.preventDefault();
+    });
+})();
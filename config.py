@@ -46,6 +46,44 @@ class Config:
     MAIL_USERNAME = os.environ.get('MAIL_USERNAME', '')
     MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD', '')
     MAIL_DEFAULT_SENDER = os.environ.get('MAIL_USERNAME', 'noreply@researchhub.com')
+    VIEW_FLUSH_THRESHOLD = int(os.environ.get('VIEW_FLUSH_THRESHOLD', 50))
+    VIEW_FLUSH_INTERVAL = int(os.environ.get('VIEW_FLUSH_INTERVAL', 30))
+    VIEW_DAILY_RETENTION_DAYS = int(os.environ.get('VIEW_DAILY_RETENTION_DAYS', 90))
+    VIEW_DEDUP_ENABLED = os.environ.get('VIEW_DEDUP_ENABLED', 'true').lower() != 'false'
+    VIEW_DEDUP_WINDOW_HOURS = int(os.environ.get('VIEW_DEDUP_WINDOW_HOURS', 24))
+    VIEW_DEDUP_ROTATE_SECONDS = int(os.environ.get('VIEW_DEDUP_ROTATE_SECONDS', 3600))
+    VIEW_DEDUP_CAPACITY = int(os.environ.get('VIEW_DEDUP_CAPACITY', 100000))
+    VIEW_DEDUP_ERROR_RATE = float(os.environ.get('VIEW_DEDUP_ERROR_RATE', 0.01))
+    TRENDING_HALF_LIFE_HOURS = float(os.environ.get('TRENDING_HALF_LIFE_HOURS', 24))
+    TRENDING_PUBLISH_WEIGHT = float(os.environ.get('TRENDING_PUBLISH_WEIGHT', 10))
+    TRENDING_TOP_N = int(os.environ.get('TRENDING_TOP_N', 20))
+    TRENDING_PERSIST_INTERVAL = int(os.environ.get('TRENDING_PERSIST_INTERVAL', 60))
+    ACTIVE_USERS_HLL_PRECISION = int(os.environ.get('ACTIVE_USERS_HLL_PRECISION', 12))
+    ACTIVE_USERS_PERSIST_INTERVAL = int(os.environ.get('ACTIVE_USERS_PERSIST_INTERVAL', 60))
+    METRICS_CACHE_MAX_AGE = int(os.environ.get('METRICS_CACHE_MAX_AGE', 60))
+    REPORT_STREAM_MAX_ROWS = int(os.environ.get('REPORT_STREAM_MAX_ROWS', 50000))
+    REPORT_EXPORT_DIR = os.environ.get('REPORT_EXPORT_DIR', '')
+    BACKGROUND_JOB_WORKERS = int(os.environ.get('BACKGROUND_JOB_WORKERS', 2))
+    REVISION_SNAPSHOT_INTERVAL = int(os.environ.get('REVISION_SNAPSHOT_INTERVAL', 10))
+    FILE_STORE_DIR = os.environ.get('FILE_STORE_DIR', '')
+    FILE_SENDFILE = os.environ.get('FILE_SENDFILE', '')  # '', 'x-sendfile' or 'x-accel-redirect'
+    FILE_ACCEL_PREFIX = os.environ.get('FILE_ACCEL_PREFIX', '/_files/')
+    UPLOAD_CHUNK_SIZE = int(os.environ.get('UPLOAD_CHUNK_SIZE', 8 * 1024 * 1024))
+    UPLOAD_MAX_SIZE = int(os.environ.get('UPLOAD_MAX_SIZE', 200 * 1024 * 1024))
+    UPLOAD_SESSION_TTL_HOURS = int(os.environ.get('UPLOAD_SESSION_TTL_HOURS', 24))
+    FRAGMENT_CACHE_ENABLED = os.environ.get('FRAGMENT_CACHE_ENABLED', 'true').lower() != 'false'
+    FRAGMENT_CACHE_MAX_BYTES = int(os.environ.get('FRAGMENT_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+    FRAGMENT_CACHE_TTL = int(os.environ.get('FRAGMENT_CACHE_TTL', 3600))
+    REVIEWER_SUGGESTIONS = int(os.environ.get('REVIEWER_SUGGESTIONS', 5))
+    REVIEWER_WORKLOAD_PENALTY = float(os.environ.get('REVIEWER_WORKLOAD_PENALTY', 0.5))
+    FEED_ENTRIES = int(os.environ.get('FEED_ENTRIES', 20))
+    FEED_MAX_AGE = int(os.environ.get('FEED_MAX_AGE', 300))
+    OAI_PAGE_SIZE = int(os.environ.get('OAI_PAGE_SIZE', 500))
+    OAI_REPOSITORY_IDENTIFIER = os.environ.get('OAI_REPOSITORY_IDENTIFIER', '')
+    SITEMAP_DIR = os.environ.get('SITEMAP_DIR', '')
+    SITEMAP_BASE_URL = os.environ.get('SITEMAP_BASE_URL', 'http://localhost:5000')
+    SITEMAP_URLS_PER_FILE = int(os.environ.get('SITEMAP_URLS_PER_FILE', 50000))
+    SITEMAP_MAX_AGE = int(os.environ.get('SITEMAP_MAX_AGE', 3600))
 
 class DevelopmentConfig(Config):
     DEBUG = True
@@ -0,0 +1,36 @@
+"""Add article_views_daily table
+
+Revision ID: 5c1f7e2a9d40
+Revises: 4385cbe8714b
+Create Date: 2026-10-18 09:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '5c1f7e2a9d40'
+down_revision = '4385cbe8714b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'article_views_daily',
+        sa.Column('article_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('tenant_id', sa.Integer(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['article_id'], ['articles.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('article_id', 'day'),
+    )
+    op.create_index('ix_article_views_daily_tenant_day', 'article_views_daily', ['tenant_id', 'day'], unique=False)
+    op.create_index('ix_article_views_daily_day', 'article_views_daily', ['day'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_article_views_daily_day', table_name='article_views_daily')
+    op.drop_index('ix_article_views_daily_tenant_day', table_name='article_views_daily')
+    op.drop_table('article_views_daily')
@@ -0,0 +1,34 @@
+"""Add article_trend_scores table
+
+Revision ID: 8e3b6d1c4f27
+Revises: 5c1f7e2a9d40
+Create Date: 2026-10-18 10:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '8e3b6d1c4f27'
+down_revision = '5c1f7e2a9d40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'article_trend_scores',
+        sa.Column('article_id', sa.Integer(), nullable=False),
+        sa.Column('tenant_id', sa.Integer(), nullable=False),
+        sa.Column('log_score', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['article_id'], ['articles.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('article_id'),
+    )
+    op.create_index('ix_article_trend_scores_tenant_score', 'article_trend_scores', ['tenant_id', 'log_score'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_article_trend_scores_tenant_score', table_name='article_trend_scores')
+    op.drop_table('article_trend_scores')
@@ -0,0 +1,32 @@
+"""Add active_user_sketches table
+
+Revision ID: a47d2c9e8b15
+Revises: 8e3b6d1c4f27
+Create Date: 2026-10-18 11:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'a47d2c9e8b15'
+down_revision = '8e3b6d1c4f27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'active_user_sketches',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('scope', sa.String(length=40), nullable=False),
+        sa.Column('registers', sa.LargeBinary(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('day', 'scope'),
+    )
+    op.create_index('ix_active_user_sketches_scope_day', 'active_user_sketches', ['scope', 'day'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_active_user_sketches_scope_day', table_name='active_user_sketches')
+    op.drop_table('active_user_sketches')
@@ -0,0 +1,60 @@
+"""Add composite indexes for the hot list and billing queries
+
+Revision ID: a8d3e6f1c924
+Revises: f1c6a3d8b247
+Create Date: 2026-10-18 16:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'a8d3e6f1c924'
+down_revision = 'f1c6a3d8b247'
+branch_labels = None
+depends_on = None
+
+
+# (name, table, leading equality columns, keyset sort column or None)
+KEYSET_INDEXES = [
+    ('ix_articles_author_created', 'articles', ['author_id'], 'created_at'),
+    ('ix_articles_reviewer_status_created', 'articles', ['reviewer_id', 'status'], 'created_at'),
+    ('ix_articles_tenant_status_created', 'articles', ['tenant_id', 'status'], 'created_at'),
+    ('ix_articles_tenant_status_published', 'articles', ['tenant_id', 'status'], 'published_at'),
+    ('ix_articles_status_created', 'articles', ['status'], 'created_at'),
+    ('ix_articles_status_published', 'articles', ['status'], 'published_at'),
+]
+
+PLAIN_INDEXES = [
+    ('ix_articles_created', 'articles', ['created_at']),
+    ('ix_transactions_tenant_status_created', 'transactions', ['tenant_id', 'status', 'created_at']),
+    ('ix_transactions_tenant_created', 'transactions', ['tenant_id', 'created_at']),
+    ('ix_subscriptions_tenant', 'subscriptions', ['tenant_id']),
+    ('ix_custom_domain_requests_status_requested', 'custom_domain_requests', ['status', 'request_date']),
+    ('ix_custom_domain_requests_requested', 'custom_domain_requests', ['request_date']),
+    ('ix_custom_domain_requests_domain', 'custom_domain_requests', ['custom_domain']),
+    ('ix_users_tenant_role', 'users', ['tenant_id', 'role']),
+]
+
+
+def _keyset_columns(leading, sort_column):
+    # Keyset pages order by (sort DESC NULLS LAST, id DESC). Postgres only
+    # walks an index in that order if it is declared so; SQLite sorts NULLs
+    # first ascending, so a plain index read backwards already matches.
+    if op.get_context().dialect.name == 'postgresql':
+        return leading + [sa.text(f'{sort_column} DESC NULLS LAST'), sa.text('id DESC')]
+    return leading + [sort_column, 'id']
+
+
+def upgrade():
+    for name, table, leading, sort_column in KEYSET_INDEXES:
+        op.create_index(name, table, _keyset_columns(leading, sort_column), unique=False)
+    for name, table, columns in PLAIN_INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    for name, table, _ in reversed(PLAIN_INDEXES):
+        op.drop_index(name, table_name=table)
+    for name, table, _, _ in reversed(KEYSET_INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,109 @@
+"""Move article content into the compressed article_bodies store
+
+Revision ID: b3f9d2e7a415
+Revises: a8d3e6f1c924
+Create Date: 2026-10-18 17:00:00.000000
+"""
+
+import hashlib
+import zlib
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'b3f9d2e7a415'
+down_revision = 'a8d3e6f1c924'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+
+articles = sa.table(
+    'articles',
+    sa.column('id', sa.Integer),
+    sa.column('content', sa.Text),
+    sa.column('body_id', sa.Integer),
+)
+article_bodies = sa.table(
+    'article_bodies',
+    sa.column('id', sa.Integer),
+    sa.column('content_hash', sa.String),
+    sa.column('codec', sa.String),
+    sa.column('data', sa.LargeBinary),
+    sa.column('size', sa.Integer),
+    sa.column('created_at', sa.DateTime),
+)
+
+
+def _move_content_to_bodies(conn):
+    body_ids = {}
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(articles.c.id, articles.c.content)
+            .where(articles.c.id > last_id, articles.c.content.isnot(None), articles.c.content != '')
+            .order_by(articles.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            return
+        for article_id, content in rows:
+            raw = content.encode('utf-8')
+            digest = hashlib.sha256(raw).hexdigest()
+            if digest not in body_ids:
+                body_ids[digest] = conn.execute(
+                    article_bodies.insert()
+                    .values(content_hash=digest, codec='zlib', data=zlib.compress(raw, 6), size=len(raw),
+                            created_at=sa.func.current_timestamp())
+                    .returning(article_bodies.c.id)
+                ).scalar_one()
+            conn.execute(articles.update().where(articles.c.id == article_id).values(body_id=body_ids[digest]))
+        last_id = rows[-1][0]
+
+
+def _move_bodies_to_content(conn):
+    rows = conn.execute(
+        sa.select(articles.c.id, article_bodies.c.data)
+        .select_from(articles.join(article_bodies, articles.c.body_id == article_bodies.c.id))
+    )
+    for article_id, data in rows.all():
+        conn.execute(
+            articles.update().where(articles.c.id == article_id)
+            .values(content=zlib.decompress(data).decode('utf-8'))
+        )
+
+
+def upgrade():
+    op.create_table(
+        'article_bodies',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('content_hash', sa.String(length=64), nullable=False),
+        sa.Column('codec', sa.String(length=10), nullable=False),
+        sa.Column('data', sa.LargeBinary(), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('content_hash'),
+    )
+    with op.batch_alter_table('articles', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('body_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key('fk_articles_body_id', 'article_bodies', ['body_id'], ['id'])
+
+    _move_content_to_bodies(op.get_bind())
+
+    with op.batch_alter_table('articles', schema=None) as batch_op:
+        batch_op.drop_column('content')
+
+
+def downgrade():
+    with op.batch_alter_table('articles', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('content', sa.Text(), nullable=True))
+
+    _move_bodies_to_content(op.get_bind())
+
+    with op.batch_alter_table('articles', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_articles_body_id', type_='foreignkey')
+        batch_op.drop_column('body_id')
+
+    op.drop_table('article_bodies')
@@ -0,0 +1,37 @@
+"""Add user_signup_counts and user_retention tables
+
+Revision ID: c2e81f4b7a63
+Revises: a47d2c9e8b15
+Create Date: 2026-10-18 12:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'c2e81f4b7a63'
+down_revision = 'a47d2c9e8b15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'user_signup_counts',
+        sa.Column('month', sa.Date(), nullable=False),
+        sa.Column('role', sa.String(length=50), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('month', 'role'),
+    )
+    op.create_table(
+        'user_retention',
+        sa.Column('cohort_month', sa.Date(), nullable=False),
+        sa.Column('activity_month', sa.Date(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('cohort_month', 'activity_month'),
+    )
+
+
+def downgrade():
+    op.drop_table('user_retention')
+    op.drop_table('user_signup_counts')
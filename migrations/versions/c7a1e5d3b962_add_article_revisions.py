@@ -0,0 +1,41 @@
+"""Add article_revisions for delta-encoded revision history
+
+Revision ID: c7a1e5d3b962
+Revises: b3f9d2e7a415
+Create Date: 2026-10-18 18:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'c7a1e5d3b962'
+down_revision = 'b3f9d2e7a415'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'article_revisions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('article_id', sa.Integer(), nullable=False),
+        sa.Column('number', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=10), nullable=False),
+        sa.Column('title', sa.String(length=500), nullable=True),
+        sa.Column('abstract', sa.Text(), nullable=True),
+        sa.Column('body_id', sa.Integer(), nullable=True),
+        sa.Column('data', sa.LargeBinary(), nullable=True),
+        sa.Column('author_id', sa.Integer(), nullable=True),
+        sa.Column('status', sa.String(length=50), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['article_id'], ['articles.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['body_id'], ['article_bodies.id']),
+        sa.ForeignKeyConstraint(['author_id'], ['users.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('article_id', 'number', name='uq_article_revisions_article_number'),
+    )
+
+
+def downgrade():
+    op.drop_table('article_revisions')
@@ -0,0 +1,71 @@
+"""Add stored_files, article_files and upload_sessions for chunked uploads
+
+Revision ID: d2b8f4c6e913
+Revises: c7a1e5d3b962
+Create Date: 2026-10-18 19:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'd2b8f4c6e913'
+down_revision = 'c7a1e5d3b962'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'stored_files',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('size', sa.BigInteger(), nullable=False),
+        sa.Column('content_type', sa.String(length=100), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('sha256'),
+    )
+    op.create_table(
+        'article_files',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('article_id', sa.Integer(), nullable=False),
+        sa.Column('stored_file_id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=20), nullable=False),
+        sa.Column('filename', sa.String(length=255), nullable=False),
+        sa.Column('uploaded_by', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['article_id'], ['articles.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['stored_file_id'], ['stored_files.id']),
+        sa.ForeignKeyConstraint(['uploaded_by'], ['users.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_article_files_article_kind', 'article_files', ['article_id', 'kind'])
+    op.create_table(
+        'upload_sessions',
+        sa.Column('id', sa.String(length=32), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('article_id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=20), nullable=False),
+        sa.Column('filename', sa.String(length=255), nullable=False),
+        sa.Column('content_type', sa.String(length=100), nullable=False),
+        sa.Column('total_size', sa.BigInteger(), nullable=False),
+        sa.Column('received', sa.BigInteger(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('article_file_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['article_id'], ['articles.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['article_file_id'], ['article_files.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_upload_sessions_status_updated', 'upload_sessions', ['status', 'updated_at'])
+
+
+def downgrade():
+    op.drop_index('ix_upload_sessions_status_updated', table_name='upload_sessions')
+    op.drop_table('upload_sessions')
+    op.drop_index('ix_article_files_article_kind', table_name='article_files')
+    op.drop_table('article_files')
+    op.drop_table('stored_files')
@@ -0,0 +1,58 @@
+"""Add article_status_events and submission_trend_buckets tables
+
+Revision ID: d5a3c8e1f902
+Revises: c2e81f4b7a63
+Create Date: 2026-10-18 13:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'd5a3c8e1f902'
+down_revision = 'c2e81f4b7a63'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'article_status_events',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('article_id', sa.Integer(), nullable=False),
+        sa.Column('tenant_id', sa.Integer(), nullable=False),
+        sa.Column('actor_id', sa.Integer(), nullable=True),
+        sa.Column('from_status', sa.String(length=50), nullable=True),
+        sa.Column('to_status', sa.String(length=50), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['article_id'], ['articles.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['actor_id'], ['users.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_article_status_events_article_created', 'article_status_events', ['article_id', 'created_at'], unique=False)
+    op.create_index('ix_article_status_events_tenant_created', 'article_status_events', ['tenant_id', 'created_at'], unique=False)
+
+    op.create_table(
+        'submission_trend_buckets',
+        sa.Column('month', sa.Date(), nullable=False),
+        sa.Column('tenant_id', sa.Integer(), nullable=False),
+        sa.Column('category', sa.String(length=200), nullable=False),
+        sa.Column('submissions', sa.Integer(), nullable=False),
+        sa.Column('first_reviews', sa.Integer(), nullable=False),
+        sa.Column('first_review_hours', sa.Float(), nullable=False),
+        sa.Column('decisions', sa.Integer(), nullable=False),
+        sa.Column('decision_hours', sa.Float(), nullable=False),
+        sa.Column('accepted', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('month', 'tenant_id', 'category'),
+    )
+    op.create_index('ix_submission_trend_buckets_tenant_month', 'submission_trend_buckets', ['tenant_id', 'month'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_submission_trend_buckets_tenant_month', table_name='submission_trend_buckets')
+    op.drop_table('submission_trend_buckets')
+    op.drop_index('ix_article_status_events_tenant_created', table_name='article_status_events')
+    op.drop_index('ix_article_status_events_article_created', table_name='article_status_events')
+    op.drop_table('article_status_events')
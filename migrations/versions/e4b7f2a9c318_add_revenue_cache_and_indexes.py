@@ -0,0 +1,48 @@
+"""Add revenue month cache tables and status/created_at indexes
+
+Revision ID: e4b7f2a9c318
+Revises: d5a3c8e1f902
+Create Date: 2026-10-18 14:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'e4b7f2a9c318'
+down_revision = 'd5a3c8e1f902'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_transactions_status_created', 'transactions', ['status', 'created_at'], unique=False)
+    op.create_index('ix_subscriptions_status_created', 'subscriptions', ['status', 'created_at'], unique=False)
+
+    op.create_table(
+        'revenue_months',
+        sa.Column('month', sa.Date(), nullable=False),
+        sa.Column('revenue', sa.Float(), nullable=False),
+        sa.Column('transactions', sa.Integer(), nullable=False),
+        sa.Column('new_subscriptions', sa.Integer(), nullable=False),
+        sa.Column('cancellations', sa.Integer(), nullable=False),
+        sa.Column('active_at_start', sa.Integer(), nullable=False),
+        sa.Column('computed_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('month'),
+    )
+    op.create_table(
+        'revenue_plan_months',
+        sa.Column('month', sa.Date(), nullable=False),
+        sa.Column('plan', sa.String(length=50), nullable=False),
+        sa.Column('revenue', sa.Float(), nullable=False),
+        sa.Column('transactions', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['month'], ['revenue_months.month'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('month', 'plan'),
+    )
+
+
+def downgrade():
+    op.drop_table('revenue_plan_months')
+    op.drop_table('revenue_months')
+    op.drop_index('ix_subscriptions_status_created', table_name='subscriptions')
+    op.drop_index('ix_transactions_status_created', table_name='transactions')
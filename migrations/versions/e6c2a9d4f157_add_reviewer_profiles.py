@@ -0,0 +1,53 @@
+"""Add reviewer_profiles and reviewer_terms for reviewer suggestions
+
+Run ``flask analytics rebuild-reviewer-profiles`` after upgrading; until
+then reviewer suggestions ignore expertise and workload.
+
+Revision ID: e6c2a9d4f157
+Revises: d2b8f4c6e913
+Create Date: 2026-10-18 20:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'e6c2a9d4f157'
+down_revision = 'd2b8f4c6e913'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'reviewer_profiles',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('tenant_id', sa.Integer(), nullable=True),
+        sa.Column('open_reviews', sa.Integer(), nullable=False),
+        sa.Column('completed_reviews', sa.Integer(), nullable=False),
+        sa.Column('authored', sa.Integer(), nullable=False),
+        sa.Column('norm', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+    op.create_index('ix_reviewer_profiles_tenant_open', 'reviewer_profiles', ['tenant_id', 'open_reviews'])
+    op.create_table(
+        'reviewer_terms',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('term', sa.String(length=120), nullable=False),
+        sa.Column('tenant_id', sa.Integer(), nullable=True),
+        sa.Column('weight', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'term'),
+    )
+    op.create_index('ix_reviewer_terms_tenant_term', 'reviewer_terms', ['tenant_id', 'term'])
+
+
+def downgrade():
+    op.drop_index('ix_reviewer_terms_tenant_term', table_name='reviewer_terms')
+    op.drop_table('reviewer_terms')
+    op.drop_index('ix_reviewer_profiles_tenant_open', table_name='reviewer_profiles')
+    op.drop_table('reviewer_profiles')
@@ -0,0 +1,41 @@
+"""Add report_exports table for background report downloads
+
+Revision ID: f1c6a3d8b247
+Revises: e4b7f2a9c318
+Create Date: 2026-10-18 15:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'f1c6a3d8b247'
+down_revision = 'e4b7f2a9c318'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'report_exports',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('report_type', sa.String(length=50), nullable=False),
+        sa.Column('format', sa.String(length=20), nullable=False),
+        sa.Column('date_range', sa.String(length=20), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('row_count', sa.Integer(), nullable=True),
+        sa.Column('file_name', sa.String(length=255), nullable=True),
+        sa.Column('file_size', sa.Integer(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_report_exports_user_created', 'report_exports', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_report_exports_user_created', table_name='report_exports')
+    op.drop_table('report_exports')
@@ -0,0 +1,32 @@
+"""Backfill published_at for published articles that have none
+
+Articles published through the old admin status change got no
+``published_at``; feeds, OAI-PMH and sitemaps order and date published
+articles by it. The backfill uses ``updated_at``, or ``created_at`` when
+that is missing too.
+
+Revision ID: f3a7c1e9d605
+Revises: e6c2a9d4f157
+Create Date: 2026-10-19 09:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'f3a7c1e9d605'
+down_revision = 'e6c2a9d4f157'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute(sa.text(
+        "UPDATE articles SET published_at = COALESCE(updated_at, created_at) "
+        "WHERE status = 'published' AND published_at IS NULL"
+    ))
+
+
+def downgrade():
+    # The backfilled dates cannot be told apart from real ones; leave them
+    pass
@@ -0,0 +1,154 @@
+"""Benchmark: article text inline in ``articles`` vs the article_bodies store.
+
+Seeds a throwaway SQLite database with articles through the ORM (so bodies go
+through ``app.core.content_store``), then builds ``articles_inline``, a copy
+of the table with the text back in a ``content`` column, as it was stored
+before. It then compares the on-disk size of the two layouts and the time of
+metadata-only queries that have to scan the table.
+
+Usage:
+    python scripts/bench_article_bodies.py [--articles 2000] [--content-kb 24] [--duplicates 0.1]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+WORDS = ('the results of the experiment show that the proposed method improves accuracy over baseline '
+         'models across all datasets while reducing training time and memory use significantly').split()
+
+# Metadata queries list pages and reports run; none of them needs the text
+QUERIES = {
+    'count by status':   'SELECT status, COUNT(*) FROM {table} GROUP BY status',
+    'title search':      "SELECT id, title FROM {table} WHERE title LIKE '%article 1%'",
+    'views by category': 'SELECT category, SUM(views) FROM {table} GROUP BY category',
+}
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--articles', type=int, default=2000, help='articles to seed (default 2000)')
+    parser.add_argument('--content-kb', type=int, default=24, help='approximate size of each body in KB')
+    parser.add_argument('--duplicates', type=float, default=0.1,
+                        help='share of articles re-using an earlier body, e.g. resubmissions (default 0.1)')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per query; the best is reported')
+    return parser.parse_args()
+
+def make_body(rng, kb):
+    words = []
+    size = 0
+    while size < kb * 1024:
+        word = rng.choice(WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return ' '.join(words)
+
+def seed(db, args):
+    from app.models.article import Article
+    from app.models.tenant import Tenant
+    from app.models.user import User
+
+    db.create_all()
+    user = User(first_name='Bench', last_name='Author', email='bench@example.com', role='super_admin')
+    user.set_password('bench')
+    db.session.add(user)
+    db.session.flush()
+    tenant = Tenant(name='Bench Journal', subdomain='bench', owner_id=user.id)
+    db.session.add(tenant)
+    db.session.flush()
+
+    rng = random.Random(42)
+    bodies = []
+    start = datetime.utcnow() - timedelta(days=args.articles)
+    statuses = ('published', 'submitted', 'under_review', 'published', 'rejected')
+    for i in range(args.articles):
+        if bodies and rng.random() < args.duplicates:
+            content = rng.choice(bodies)
+        else:
+            content = make_body(rng, args.content_kb)
+            bodies.append(content)
+        db.session.add(Article(
+            tenant_id=tenant.id, author_id=user.id, title=f'Benchmark article {i}',
+            abstract='A short abstract.', content=content, category=rng.choice(('physics', 'biology', 'cs')),
+            status=statuses[i % len(statuses)], created_at=start + timedelta(days=i), views=i,
+        ))
+        if i % 100 == 99:
+            db.session.commit()
+    db.session.commit()
+
+def build_inline_copy(db):
+    """Recreate the old layout, with the text in its old place after ``keywords``.
+
+    Where the column sits matters: SQLite has to walk a row's overflow pages
+    to reach any column stored after a long one.
+    """
+    from app.models.article import Article
+
+    columns = [row[1] for row in db.session.execute(db.text('PRAGMA table_info(articles)'))]
+    columns.remove('body_id')
+    layout = columns[:columns.index('keywords') + 1] + ['content'] + columns[columns.index('keywords') + 1:]
+    db.session.execute(db.text(f'CREATE TABLE articles_inline ({", ".join(layout)})'))
+    insert = db.text(
+        f'INSERT INTO articles_inline ({", ".join(layout)}) VALUES ({", ".join(":" + c for c in layout)})'
+    )
+    for article in Article.query.yield_per(200):
+        row = {column: getattr(article, column) for column in columns}
+        db.session.execute(insert, {**row, 'content': article.content})
+    db.session.commit()
+
+def table_bytes(db, *tables):
+    names = ', '.join(f"'{t}'" for t in tables)
+    return db.session.execute(db.text(
+        f'SELECT COALESCE(SUM(pgsize), 0) FROM dbstat WHERE name IN ({names})'
+    )).scalar()
+
+def best_time(db, sql, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        db.session.execute(db.text(sql)).all()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    args = parse_args()
+    db_path = os.path.join(tempfile.mkdtemp(prefix='bench-bodies-'), 'bench.db')
+    os.environ['DATABASE_URL'] = 'sqlite:///' + db_path
+
+    from app import create_app
+    from app.core.content_store import store_stats
+    from app.core.extensions import db
+
+    app = create_app('development')
+    with app.app_context():
+        seed(db, args)
+        build_inline_copy(db)
+        db.session.execute(db.text('VACUUM'))
+        stats = store_stats()
+
+        inline = table_bytes(db, 'articles_inline')
+        split = table_bytes(db, 'articles')
+        bodies = table_bytes(db, 'article_bodies')
+        print(f'{args.articles} articles, ~{args.content_kb} KB bodies, {stats["bodies"]} distinct\n')
+        print(f'{"":<22}{"before":>12}{"after":>12}')
+        print(f'{"articles table":<22}{inline / 1048576:>10.1f}MB{split / 1048576:>10.1f}MB')
+        print(f'{"+ article_bodies":<22}{"":>12}{bodies / 1048576:>10.1f}MB')
+        print(f'{"total":<22}{inline / 1048576:>10.1f}MB{(split + bodies) / 1048576:>10.1f}MB\n')
+
+        print(f'{"query":<22}{"before":>12}{"after":>12}')
+        for name, sql in QUERIES.items():
+            before = best_time(db, sql.format(table='articles_inline'), args.repeat)
+            after = best_time(db, sql.format(table='articles'), args.repeat)
+            print(f'{name:<22}{before * 1000:>10.1f}ms{after * 1000:>10.1f}ms')
+
+    os.remove(db_path)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""Benchmark the published article page with and without the fragment cache.
+
+Seeds a throwaway SQLite database with one published article carrying a
+large body and a few attached files, then times ``GET /articles/article/<id>``
+through the Flask test client with ``FRAGMENT_CACHE_ENABLED`` off and on,
+counting the SQL statements of each request. Every request comes from the
+same client, so view deduplication counts only the first one and the runs
+measure page rendering.
+
+Usage:
+    python scripts/bench_article_page.py [--requests 200] [--content-kb 64]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=200, help='requests per run (default 200)')
+    parser.add_argument('--content-kb', type=int, default=64, help='size of the article body in KB')
+    return parser.parse_args()
+
+def seed(db, content_kb):
+    from app.models.article import Article
+    from app.models.article_file import ArticleFile
+    from app.models.stored_file import StoredFile
+    from app.models.tenant import Tenant
+    from app.models.user import User
+
+    db.create_all()
+    user = User(first_name='Bench', last_name='Author', email='bench@example.com', role='author')
+    user.set_password('bench')
+    db.session.add(user)
+    db.session.flush()
+    tenant = Tenant(name='Bench Journal', subdomain='bench', owner_id=user.id)
+    db.session.add(tenant)
+    db.session.flush()
+    paragraph = 'The measured effect persists across every cohort and dataset we examined. ' * 12
+    article = Article(
+        tenant_id=tenant.id, author_id=user.id, title='A benchmark article on caching',
+        abstract='An abstract of moderate length. ' * 20, keywords='caching, latency, benchmark',
+        category='computer_science', content='\n\n'.join([paragraph] * (content_kb * 1024 // len(paragraph))),
+        status='published', published_at=datetime.utcnow(), review_notes='Looks good.',
+    )
+    db.session.add(article)
+    db.session.flush()
+    for i in range(4):
+        stored = StoredFile(sha256=f'{i:064x}', size=1024 * 1024 * (i + 1), content_type='application/pdf')
+        db.session.add(ArticleFile(article_id=article.id, stored_file=stored,
+                                   kind='manuscript' if i == 0 else 'supplementary', filename=f'file{i}.pdf'))
+    db.session.commit()
+    return article.id
+
+def run(app, url, count):
+    from app.core.query_budget import QueryCounter
+
+    client = app.test_client()
+    timings, queries = [], 0
+    for _ in range(count):
+        with app.app_context():
+            with QueryCounter() as counter:
+                started = time.perf_counter()
+                response = client.get(url)
+                timings.append(time.perf_counter() - started)
+        if response.status_code != 200:
+            raise SystemExit(f'{url} returned {response.status_code}')
+        queries = counter.count
+    return timings, queries
+
+def main():
+    args = parse_args()
+    db_path = os.path.join(tempfile.mkdtemp(prefix='bench-article-page-'), 'bench.db')
+    os.environ['DATABASE_URL'] = 'sqlite:///' + db_path
+
+    from app import create_app
+    from app.core.extensions import db
+    from app.core.fragment_cache import get_fragment_cache
+
+    app = create_app('development')
+    with app.app_context():
+        article_id = seed(db, args.content_kb)
+    url = f'/articles/article/{article_id}'
+
+    results = {}
+    for enabled in (False, True):
+        app.config['FRAGMENT_CACHE_ENABLED'] = enabled
+        with app.app_context():
+            get_fragment_cache().clear()
+        run(app, url, 5)  # warm-up; fills the cache when enabled
+        results[enabled] = run(app, url, args.requests)
+
+    print(f'{args.requests} requests for {url} ({args.content_kb} KB body)\n')
+    print(f'{"":<12}{"median":>10}{"p95":>10}{"queries":>9}')
+    for enabled, label in ((False, 'uncached'), (True, 'cached')):
+        timings, queries = results[enabled]
+        timings = sorted(timings)
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        print(f'{label:<12}{statistics.median(timings) * 1000:>8.2f}ms{p95 * 1000:>8.2f}ms{queries:>9}')
+
+    os.remove(db_path)
+
+if __name__ == '__main__':
+    main()
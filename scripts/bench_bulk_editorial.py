@@ -0,0 +1,164 @@
+"""Benchmark bulk editorial actions against the per-article routes' loop.
+
+Seeds a throwaway SQLite database with two equal sets of submitted articles,
+then walks each set through reviewer assignment, acceptance and publication:
+one set the way the single-article routes do it (commit and notify per
+article), the other with the batched functions in ``app.core.editorial``.
+Prints the time and SQL statement count of every step.
+
+Usage:
+    python scripts/bench_bulk_editorial.py [--articles 500]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--articles', type=int, default=500, help='articles per set (default 500)')
+    parser.add_argument('--authors', type=int, default=50, help='distinct authors (default 50)')
+    return parser.parse_args()
+
+def seed(db, count, authors):
+    from app.models.article import Article
+    from app.models.tenant import Tenant
+    from app.models.user import User
+
+    db.create_all()
+    editor = User(first_name='Bench', last_name='Editor', email='editor@bench.test', role='tenant_owner')
+    reviewer = User(first_name='Bench', last_name='Reviewer', email='reviewer@bench.test', role='reviewer')
+    for user in (editor, reviewer):
+        user.set_password('bench')
+    db.session.add_all([editor, reviewer])
+    db.session.flush()
+    tenant = Tenant(name='Bench Journal', subdomain='bench', owner_id=editor.id)
+    db.session.add(tenant)
+    db.session.flush()
+    editor.tenant_id = reviewer.tenant_id = tenant.id
+
+    people = []
+    for i in range(authors):
+        # Authors never log in; skip the password hashing
+        people.append(User(first_name=f'Author{i}', last_name='Bench', email=f'author{i}@bench.test',
+                           role='author', tenant_id=tenant.id, password_hash='!'))
+    db.session.add_all(people)
+    db.session.flush()
+
+    sets = ([], [])
+    now = datetime.utcnow()
+    for i in range(count * 2):
+        article = Article(
+            tenant_id=tenant.id, author_id=people[i % authors].id, title=f'Bench article {i}',
+            abstract='Bench abstract', category='physics', status='submitted',
+            created_at=now - timedelta(minutes=i), submitted_at=now - timedelta(minutes=i),
+        )
+        db.session.add(article)
+        sets[i % 2].append(article)
+    db.session.commit()
+    return editor.id, reviewer.id, [a.id for a in sets[0]], [a.id for a in sets[1]]
+
+# The single-article routes' logic (assign_reviewer, editor_decision), one article at a time
+def loop_assign(articles, reviewer, editor_id):
+    from flask import url_for
+    from app.core.extensions import db
+    from app.core.notifications import create_notifications_for_users
+    from app.core.submission_trends import transition_article
+
+    for article in articles:
+        article.reviewer_id = reviewer.id
+        article.editor_id = editor_id
+        transition_article(article, 'under_review', actor_id=editor_id)
+        db.session.commit()
+        create_notifications_for_users(
+            user_ids=[reviewer.id], title='New review assignment',
+            message=f'You were assigned to review "{article.title}".',
+            link_url=url_for('articles.review_article', article_id=article.id), category='review_assignment',
+        )
+
+def loop_decide(articles, decision, editor_id):
+    from flask import url_for
+    from app.core.extensions import db
+    from app.core.notifications import create_notifications_for_users
+    from app.core.submission_trends import transition_article
+    from app.core.trending import record_trending_publish
+
+    status = {'accept': 'accepted', 'publish': 'published'}[decision]
+    for article in articles:
+        article.editor_id = editor_id
+        transition_article(article, status, actor_id=editor_id)
+        if status == 'published':
+            article.published_at = datetime.utcnow()
+            article.doi = article.default_doi
+            db.session.commit()  # generate_doi() used to commit on its own
+        db.session.commit()
+        if status == 'published':
+            record_trending_publish(article)
+        create_notifications_for_users(
+            user_ids=[article.author_id], title=f'Article {status}',
+            message=f'Your article "{article.title}" has been {status}.',
+            link_url=url_for('articles.my_articles'), category='article_status',
+        )
+
+def timed(db, fn):
+    from app.core.query_budget import QueryCounter
+
+    db.session.expunge_all()
+    with QueryCounter() as counter:
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+    return elapsed, counter.count
+
+def main():
+    args = parse_args()
+    db_path = os.path.join(tempfile.mkdtemp(prefix='bench-editorial-'), 'bench.db')
+    os.environ['DATABASE_URL'] = 'sqlite:///' + db_path
+
+    from app import create_app
+    from app.core.editorial import bulk_assign_reviewer, bulk_decide, load_articles
+    from app.core.extensions import db
+    from app.models.article import Article
+    from app.models.user import User
+
+    app = create_app('development')
+    with app.test_request_context():
+        editor_id, reviewer_id, loop_ids, bulk_ids = seed(db, args.articles, args.authors)
+
+        def loop_set():
+            return Article.query.filter(Article.id.in_(loop_ids)).all()
+
+        steps = [
+            ('assign reviewer',
+             lambda: loop_assign(loop_set(), db.session.get(User, reviewer_id), editor_id),
+             lambda: bulk_assign_reviewer(load_articles(bulk_ids), db.session.get(User, reviewer_id), editor_id)),
+            ('accept',
+             lambda: loop_decide(loop_set(), 'accept', editor_id),
+             lambda: bulk_decide(load_articles(bulk_ids), 'accept', editor_id)),
+            ('publish + DOI',
+             lambda: loop_decide(loop_set(), 'publish', editor_id),
+             lambda: bulk_decide(load_articles(bulk_ids), 'publish', editor_id)),
+        ]
+
+        print(f'{args.articles} articles per step, SQLite\n')
+        print(f'{"step":<18}{"loop time":>12}{"queries":>10}{"bulk time":>12}{"queries":>10}{"speedup":>10}')
+        for name, loop, bulk in steps:
+            loop_time, loop_queries = timed(db, loop)
+            bulk_time, bulk_queries = timed(db, bulk)
+            print(f'{name:<18}{loop_time * 1000:>10.0f}ms{loop_queries:>10}'
+                  f'{bulk_time * 1000:>10.0f}ms{bulk_queries:>10}{loop_time / bulk_time:>9.1f}x')
+
+        published = Article.query.filter(Article.id.in_(loop_ids + bulk_ids), Article.status == 'published',
+                                         Article.doi.isnot(None)).count()
+        print(f'\n{published} of {len(loop_ids) + len(bulk_ids)} articles published with a DOI')
+
+    os.remove(db_path)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""Benchmark polling a journal's Atom feed against scraping its article list.
+
+Seeds a throwaway SQLite database with one journal of ``--articles``
+published articles, then times through the Flask test client:
+
+- the public article list a scraper would fetch (its first page)
+- the Atom feed without validators, i.e. a cached render
+- the Atom feed with a stale ``If-None-Match``, i.e. the first poll after a publish
+- the Atom feed with a current ``If-None-Match``, i.e. most polls (304)
+
+counting the SQL statements and response bytes of each request.
+
+Usage:
+    python scripts/bench_journal_feed.py [--articles 5000] [--requests 200]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--articles', type=int, default=5000, help='published articles (default 5000)')
+    parser.add_argument('--requests', type=int, default=200, help='requests per row (default 200)')
+    return parser.parse_args()
+
+def seed(db, count):
+    from app.models.article import Article
+    from app.models.tenant import Tenant
+    from app.models.user import User
+
+    db.create_all()
+    author = User(first_name='Bench', last_name='Author', email='author@bench.test', role='author',
+                  password_hash='!')
+    db.session.add(author)
+    db.session.flush()
+    tenant = Tenant(name='Bench Journal', subdomain='bench', owner_id=author.id)
+    db.session.add(tenant)
+    db.session.flush()
+    now = datetime.utcnow()
+    db.session.execute(Article.__table__.insert(), [
+        {'tenant_id': tenant.id, 'author_id': author.id, 'title': f'Bench article {i}',
+         'abstract': 'An abstract of moderate length. ' * 20, 'category': 'physics', 'status': 'published',
+         'views': 0, 'created_at': now, 'updated_at': now, 'published_at': now - timedelta(hours=i)}
+        for i in range(count)
+    ])
+    db.session.commit()
+    return tenant.subdomain
+
+def timings(client, path, headers, requests, status):
+    from app.core.query_budget import QueryCounter
+
+    samples, queries = [], []
+    for _ in range(requests):
+        with QueryCounter() as counter:
+            started = time.perf_counter()
+            response = client.get(path, headers=headers() if callable(headers) else headers)
+            samples.append((time.perf_counter() - started) * 1000)
+        assert response.status_code == status, (path, response.status_code)
+        queries.append(counter.count)
+    samples.sort()
+    return statistics.mean(samples), samples[int(len(samples) * 0.95) - 1], max(queries), len(response.data)
+
+def main():
+    args = parse_args()
+    db_path = os.path.join(tempfile.mkdtemp(prefix='bench-feed-'), 'bench.db')
+    os.environ['DATABASE_URL'] = 'sqlite:///' + db_path
+
+    from app import create_app
+    from app.core.extensions import db
+    from app.core.fragment_cache import get_fragment_cache
+
+    app = create_app('development')
+    with app.app_context():
+        subdomain = seed(db, args.articles)
+        client = app.test_client()
+        feed = f'/articles/journal/{subdomain}/feed.atom'
+        etag = client.get(feed).headers['ETag']
+
+        def stale():
+            # A publish since the last poll: the feed has to be rendered again
+            get_fragment_cache().clear()
+            return {'If-None-Match': '"atom-stale"'}
+
+        rows = [
+            ('article list, first page', f'/articles/journal/{subdomain}/articles', {}, 200),
+            ('feed, cached render', feed, {}, 200),
+            ('feed, first poll after publish', feed, stale, 200),
+            ('feed, conditional poll (304)', feed, {'If-None-Match': etag}, 304),
+        ]
+        print(f'{args.articles} published articles, {args.requests} requests per row\n')
+        print(f'{"":<34}{"mean":>10}{"p95":>10}{"queries":>9}{"bytes":>9}')
+        for name, path, headers, status in rows:
+            mean, p95, queries, size = timings(client, path, headers, args.requests, status)
+            print(f'{name:<34}{mean:>8.2f}ms{p95:>8.2f}ms{queries:>9}{size:>9}')
+
+    os.remove(db_path)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""Memory benchmark for article list pages: full rows vs list projections.
+
+Seeds a throwaway SQLite database with articles carrying large ``content`` and
+``abstract`` bodies, then measures the peak Python memory (tracemalloc) and
+time of each list page's query with and without the projections from
+``app.core.projections``.
+
+Usage:
+    python scripts/bench_list_memory.py [--articles 400] [--content-kb 256]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--articles', type=int, default=400, help='articles to seed (default 400)')
+    parser.add_argument('--content-kb', type=int, default=256, help='size of each article body in KB')
+    parser.add_argument('--abstract-kb', type=int, default=8, help='size of each abstract in KB')
+    return parser.parse_args()
+
+def seed(db, count, content_kb, abstract_kb):
+    from app.models.article import Article
+    from app.models.tenant import Tenant
+    from app.models.user import User
+
+    db.create_all()
+    user = User(first_name='Bench', last_name='Author', email='bench@example.com', role='super_admin')
+    user.set_password('bench')
+    db.session.add(user)
+    db.session.flush()
+    tenant = Tenant(name='Bench Journal', subdomain='bench', owner_id=user.id)
+    db.session.add(tenant)
+    db.session.flush()
+
+    body = 'x' * (content_kb * 1024)
+    abstract = 'benchmark ' * (abstract_kb * 1024 // 10)
+    start = datetime.utcnow() - timedelta(days=count)
+    statuses = ('published', 'submitted', 'under_review', 'published', 'rejected')
+    for i in range(count):
+        status = statuses[i % len(statuses)]
+        created = start + timedelta(days=i)
+        db.session.add(Article(
+            tenant_id=tenant.id, author_id=user.id, title=f'Benchmark article {i}',
+            abstract=abstract, content=body, keywords='benchmark, memory', category='physics',
+            status=status, created_at=created,
+            published_at=created if status == 'published' else None,
+        ))
+        if i % 100 == 99:
+            db.session.flush()
+    db.session.commit()
+    return user, tenant
+
+def measure(db, build):
+    db.session.expunge_all()
+    tracemalloc.start()
+    started = time.perf_counter()
+    rows = build()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    count = len(rows)
+    del rows
+    db.session.expunge_all()
+    return count, peak, elapsed
+
+def main():
+    args = parse_args()
+    db_path = os.path.join(tempfile.mkdtemp(prefix='bench-lists-'), 'bench.db')
+    os.environ['DATABASE_URL'] = 'sqlite:///' + db_path
+
+    from app import create_app
+    from app.core.extensions import db
+    from app.core.pagination import DEFAULT_PER_PAGE, keyset_paginate
+    from app.core.projections import article_list_query, with_abstract_preview
+    from app.models.article import Article
+
+    app = create_app('development')
+    with app.app_context():
+        user, tenant = seed(db, args.articles, args.content_kb, args.abstract_kb)
+        by_author = Article.query.filter_by(author_id=user.id)
+        in_tenant = Article.query.filter_by(tenant_id=tenant.id)
+        published = Article.query.filter_by(tenant_id=tenant.id, status='published')
+        matching = Article.query.filter(Article.status == 'published', Article.title.ilike('%article%'))
+        newest = (Article.created_at.desc(),)
+
+        pages = {
+            'my_articles': (
+                lambda: by_author.order_by(*newest).all(),
+                lambda: keyset_paginate(article_list_query(by_author), Article.created_at, Article.id).items,
+            ),
+            'editor_panel': (
+                lambda: in_tenant.order_by(*newest).all(),
+                lambda: [a for status in ('submitted', 'under_review', 'accepted', 'published', 'rejected')
+                         for a in keyset_paginate(article_list_query(in_tenant.filter(Article.status == status)),
+                                                  Article.created_at, Article.id).items],
+            ),
+            'journal_articles': (
+                lambda: published.order_by(Article.published_at.desc()).all(),
+                lambda: keyset_paginate(article_list_query(published), Article.published_at, Article.id).items,
+            ),
+            'admin.submissions': (
+                lambda: Article.query.order_by(*newest).paginate(page=1, per_page=20, error_out=False).items,
+                lambda: article_list_query(Article.query).order_by(*newest)
+                        .paginate(page=1, per_page=20, error_out=False).items,
+            ),
+            'search': (
+                lambda: matching.order_by(Article.published_at.desc()).all(),
+                lambda: with_abstract_preview(article_list_query(matching))
+                        .order_by(Article.published_at.desc()).all(),
+            ),
+        }
+
+        print(f'{args.articles} articles, {args.content_kb} KB bodies, {args.abstract_kb} KB abstracts, '
+              f'{DEFAULT_PER_PAGE} rows per keyset page\n')
+        print(f'{"page":<20}{"rows":>12}{"peak before":>14}{"peak after":>13}{"time before":>14}{"time after":>13}')
+        for name, (before, after) in pages.items():
+            rows_before, peak_before, time_before = measure(db, before)
+            rows_after, peak_after, time_after = measure(db, after)
+            print(f'{name:<20}{f"{rows_before} -> {rows_after}":>12}'
+                  f'{peak_before / 1048576:>12.1f}MB{peak_after / 1048576:>11.1f}MB'
+                  f'{time_before * 1000:>12.1f}ms{time_after * 1000:>11.1f}ms')
+
+    os.remove(db_path)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""Benchmark a full OAI-PMH harvest of a large journal.
+
+Seeds a throwaway SQLite database with one journal of ``--articles``
+published articles and harvests it with ``ListRecords`` through the Flask
+test client, following resumption tokens to the end. Prints the time of the
+first, middle and last pages, which keyset tokens keep flat, and the peak
+Python memory (tracemalloc) of one response at several page sizes, which
+streaming keeps flat too.
+
+Usage:
+    python scripts/bench_oai_harvest.py [--articles 100000] [--page-size 500]
+"""
+
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+TOKEN = re.compile(rb'<resumptionToken>([^<]+)</resumptionToken>')
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--articles', type=int, default=100000, help='published articles (default 100000)')
+    parser.add_argument('--page-size', type=int, default=500, help='OAI_PAGE_SIZE for the harvest (default 500)')
+    return parser.parse_args()
+
+def seed(db, count):
+    from app.models.article import Article
+    from app.models.tenant import Tenant
+    from app.models.user import User
+
+    db.create_all()
+    author = User(first_name='Bench', last_name='Author', email='author@bench.test', role='author',
+                  password_hash='!')
+    db.session.add(author)
+    db.session.flush()
+    tenant = Tenant(name='Bench Journal', subdomain='bench', owner_id=author.id)
+    db.session.add(tenant)
+    db.session.flush()
+    start = datetime(2020, 1, 1)
+    for offset in range(0, count, 10000):
+        db.session.execute(Article.__table__.insert(), [
+            {'tenant_id': tenant.id, 'author_id': author.id, 'title': f'Bench article {i}',
+             'abstract': 'An abstract of moderate length. ' * 30, 'keywords': 'harvest, metadata, bench',
+             'category': 'physics', 'status': 'published', 'views': 0, 'created_at': start,
+             'updated_at': start, 'published_at': start + timedelta(minutes=i), 'doi': f'10.9999/rh.1.{i}'}
+            for i in range(offset, min(offset + 10000, count))
+        ])
+    db.session.commit()
+    return tenant.subdomain
+
+def harvest(client, path):
+    """Follow ListRecords to the end; return the time and size of every page."""
+    pages = []
+    args = {'verb': 'ListRecords', 'metadataPrefix': 'oai_dc'}
+    while True:
+        started = time.perf_counter()
+        data = client.get(path, query_string=args).data
+        pages.append((time.perf_counter() - started, len(data), data.count(b'<record>')))
+        match = TOKEN.search(data)
+        if not match:
+            return pages
+        args = {'verb': 'ListRecords', 'resumptionToken': match.group(1).decode()}
+
+def peak_memory(client, path):
+    """Peak traced memory while one ListRecords response is consumed chunk by chunk."""
+    tracemalloc.start()
+    size = 0
+    response = client.get(path, query_string={'verb': 'ListRecords', 'metadataPrefix': 'oai_dc'}, buffered=False)
+    for chunk in response.response:
+        size += len(chunk)
+    response.close()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, size
+
+def main():
+    args = parse_args()
+    db_path = os.path.join(tempfile.mkdtemp(prefix='bench-oai-'), 'bench.db')
+    os.environ['DATABASE_URL'] = 'sqlite:///' + db_path
+
+    from app import create_app
+    from app.core.extensions import db
+
+    app = create_app('development')
+    with app.app_context():
+        subdomain = seed(db, args.articles)
+        client = app.test_client()
+        path = f'/oai/{subdomain}'
+
+        app.config['OAI_PAGE_SIZE'] = args.page_size
+        started = time.perf_counter()
+        pages = harvest(client, path)
+        total = time.perf_counter() - started
+        records = sum(count for _, _, count in pages)
+        print(f'{args.articles} published articles, pages of {args.page_size}\n')
+        print(f'harvested {records} records in {len(pages)} pages, {total:.1f}s, '
+              f'{sum(size for _, size, _ in pages) / 1e6:.0f} MB of XML')
+        for name, index in (('first', 0), ('middle', len(pages) // 2), ('last', len(pages) - 1)):
+            print(f'  {name:<7} page {index + 1:>5}: {pages[index][0] * 1000:7.1f}ms')
+
+        print(f'\n{"page size":>10}{"response":>12}{"peak memory":>14}')
+        for page_size in (500, 5000, 50000):
+            app.config['OAI_PAGE_SIZE'] = min(page_size, args.articles)
+            peak, size = peak_memory(client, path)
+            print(f'{page_size:>10}{size / 1e6:>10.1f}MB{peak / 1e6:>12.1f}MB')
+
+    os.remove(db_path)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""Benchmark a single publish decision: the old three-commit path against the pipeline.
+
+Seeds a throwaway SQLite database with submitted articles and publishes them
+one at a time, half the way ``editor_decision`` used to (commit inside
+``generate_doi``, commit in the view, rank the article, then commit the
+notification) and half through ``bulk_decide``, which commits once and
+leaves the ranking to the post-commit status hooks. Prints the per-decision
+latency and statement count of both, then makes the notification insert
+fail and reports what each path left behind.
+
+Usage:
+    python scripts/bench_publish_pipeline.py [--decisions 300] [--authors 50]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--decisions', type=int, default=300, help='decisions per path (default 300)')
+    parser.add_argument('--authors', type=int, default=50, help='distinct authors (default 50)')
+    return parser.parse_args()
+
+def seed(db, count, authors):
+    from app.models.article import Article
+    from app.models.tenant import Tenant
+    from app.models.user import User
+
+    db.create_all()
+    editor = User(first_name='Bench', last_name='Editor', email='editor@bench.test', role='tenant_owner',
+                  password_hash='!')
+    db.session.add(editor)
+    db.session.flush()
+    tenant = Tenant(name='Bench Journal', subdomain='bench', owner_id=editor.id)
+    db.session.add(tenant)
+    db.session.flush()
+    editor.tenant_id = tenant.id
+    authors = [User(first_name=f'Author{i}', last_name='Bench', email=f'author{i}@bench.test', role='author',
+                    tenant_id=tenant.id, password_hash='!') for i in range(authors)]
+    db.session.add_all(authors)
+    db.session.flush()
+
+    now = datetime.utcnow()
+    articles = [
+        Article(tenant_id=tenant.id, author_id=authors[i % len(authors)].id, title=f'Bench article {i}',
+                abstract='Bench abstract', category='physics', status='submitted', created_at=now,
+                submitted_at=now)
+        for i in range(count)
+    ]
+    db.session.add_all(articles)
+    db.session.commit()
+    return editor.id, [a.id for a in articles]
+
+def old_publish(article, editor_id):
+    """``editor_decision``'s publish branch before the pipeline."""
+    from flask import url_for
+    from app.core.extensions import db
+    from app.core.notifications import create_notifications_for_users
+    from app.core.reviewer_index import refresh_profiles_for
+    from app.core.submission_trends import transition_article
+    from app.core.trending import record_trending_publish
+
+    article.editor_id = editor_id
+    transition_article(article, 'published', actor_id=editor_id)
+    article.published_at = datetime.utcnow()
+    article.doi = article.default_doi
+    db.session.commit()  # generate_doi() used to commit on its own
+    refresh_profiles_for([article])
+    db.session.commit()
+    record_trending_publish(article)
+    create_notifications_for_users(
+        user_ids=[article.author_id], title='Article published',
+        message=f'Your article "{article.title}" is now published.',
+        link_url=url_for('articles.view', article_id=article.id), category='article_status',
+    )
+
+def new_publish(article, editor_id):
+    from app.core.editorial import bulk_decide
+
+    bulk_decide([article], 'publish', editor_id)
+
+def run(db, publish, article_ids, editor_id):
+    from app.core.query_budget import QueryCounter
+    from app.models.article import Article
+
+    samples, queries = [], []
+    for article_id in article_ids:
+        article = db.session.get(Article, article_id)
+        with QueryCounter() as counter:
+            started = time.perf_counter()
+            publish(article, editor_id)
+            samples.append((time.perf_counter() - started) * 1000)
+        queries.append(counter.count)
+    samples.sort()
+    return statistics.mean(samples), samples[int(len(samples) * 0.95) - 1], max(queries)
+
+def after_failure(db, publish, article_id, editor_id):
+    """Publish with the notification insert failing; describe the article afterwards."""
+    from app.models.article import Article
+    from app.models.notification import Notification
+
+    failing = mock.Mock(side_effect=RuntimeError('notification insert failed'))
+    with mock.patch('app.core.notifications.create_notifications_for_users', failing), \
+            mock.patch('app.core.editorial.bulk_create_notifications', failing):
+        try:
+            publish(db.session.get(Article, article_id), editor_id)
+        except RuntimeError:
+            db.session.rollback()
+    article = db.session.get(Article, article_id)
+    notified = Notification.query.filter(Notification.message.contains(f'"{article.title}"')).count()
+    return f'status={article.status}, doi={article.doi or "-"}, notifications={notified}'
+
+def main():
+    args = parse_args()
+    db_path = os.path.join(tempfile.mkdtemp(prefix='bench-publish-'), 'bench.db')
+    os.environ['DATABASE_URL'] = 'sqlite:///' + db_path
+
+    from app import create_app
+    from app.core.extensions import db
+
+    app = create_app('development')
+    with app.test_request_context():
+        editor_id, article_ids = seed(db, args.decisions * 2 + 2, args.authors)
+        old_ids, new_ids = article_ids[:args.decisions], article_ids[args.decisions:-2]
+
+        print(f'{args.decisions} single-article publish decisions per path, SQLite\n')
+        print(f'{"path":<28}{"mean":>10}{"p95":>10}{"queries":>9}')
+        for name, publish, ids in (('three commits (old)', old_publish, old_ids),
+                                   ('one transaction + hooks', new_publish, new_ids)):
+            mean, p95, queries = run(db, publish, ids, editor_id)
+            print(f'{name:<28}{mean:>8.2f}ms{p95:>8.2f}ms{queries:>9}')
+
+        print('\nnotification insert fails:')
+        print(f'  old path: {after_failure(db, old_publish, article_ids[-2], editor_id)}')
+        print(f'  pipeline: {after_failure(db, new_publish, article_ids[-1], editor_id)}')
+
+    os.remove(db_path)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+"""Benchmark reviewer suggestions served from the reviewer profile index.
+
+Seeds a throwaway SQLite database with one journal of ``--members`` reviewers,
+each of whom has authored and reviewed a few keyworded articles, builds the
+profile index, then times:
+
+- suggestions for single articles (``suggest_reviewers``), against scoring
+  every member from their article history on the fly
+- suggestions for a full editor panel page (``reviewer_choices``), next to
+  loading the member list the page's reviewer picker needed anyway
+- the incremental profile refresh that runs on every assignment
+
+Usage:
+    python scripts/bench_reviewer_suggestions.py [--members 3000] [--articles-per-member 5]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+STATUSES = ('published', 'published', 'accepted', 'rejected', 'under_review')
+CATEGORIES = ('physics', 'biology', 'computer_science', 'chemistry', 'mathematics', 'medicine')
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--members', type=int, default=3000, help='reviewers in the journal (default 3000)')
+    parser.add_argument('--articles-per-member', type=int, default=5, help='articles each member wrote (default 5)')
+    parser.add_argument('--vocabulary', type=int, default=400, help='distinct keywords (default 400)')
+    parser.add_argument('--queries', type=int, default=200, help='articles to suggest reviewers for (default 200)')
+    return parser.parse_args()
+
+def seed(db, args, rng):
+    from app.models.article import Article
+    from app.models.tenant import Tenant
+    from app.models.user import User
+
+    db.create_all()
+    owner = User(first_name='Bench', last_name='Owner', email='owner@bench.test', role='tenant_owner',
+                 password_hash='!')
+    db.session.add(owner)
+    db.session.flush()
+    tenant = Tenant(name='Bench Journal', subdomain='bench', owner_id=owner.id)
+    db.session.add(tenant)
+    db.session.flush()
+    owner.tenant_id = tenant.id
+
+    db.session.execute(User.__table__.insert(), [
+        {'first_name': f'Reviewer{i}', 'last_name': 'Bench', 'email': f'reviewer{i}@bench.test',
+         'password_hash': '!', 'role': 'reviewer', 'tenant_id': tenant.id, 'is_active': True,
+         'created_at': datetime.utcnow()}
+        for i in range(args.members)
+    ])
+    member_ids = [user_id for (user_id,) in db.session.query(User.id).filter(User.role == 'reviewer')]
+    vocabulary = [f'topic {n}' for n in range(args.vocabulary)]
+
+    # Each member works in a few neighbouring topics, so expertise clusters
+    def keywords(member_index):
+        base = member_index * args.vocabulary // args.members
+        return ', '.join(vocabulary[(base + rng.randrange(8)) % args.vocabulary] for _ in range(3))
+
+    rows = []
+    now = datetime.utcnow()
+    for index, member_id in enumerate(member_ids):
+        for n in range(args.articles_per_member):
+            rows.append({
+                'tenant_id': tenant.id, 'author_id': member_id, 'title': f'Bench article {index}-{n}',
+                'abstract': 'Bench abstract', 'keywords': keywords(index), 'category': rng.choice(CATEGORIES),
+                'status': STATUSES[n % len(STATUSES)], 'views': 0, 'created_at': now, 'updated_at': now,
+                'reviewer_id': member_ids[(index + 1 + n) % len(member_ids)],
+            })
+    queries = []
+    for n in range(args.queries):
+        index = rng.randrange(len(member_ids))
+        queries.append({
+            'tenant_id': tenant.id, 'author_id': member_ids[index], 'title': f'Submitted article {n}',
+            'abstract': 'Bench abstract', 'keywords': keywords(index), 'category': rng.choice(CATEGORIES),
+            'status': 'submitted', 'views': 0, 'created_at': now, 'updated_at': now,
+        })
+    for start in range(0, len(rows), 5000):
+        db.session.execute(Article.__table__.insert(), rows[start:start + 5000])
+    db.session.execute(Article.__table__.insert(), queries)
+    db.session.commit()
+    return tenant.id, len(rows)
+
+def scan_suggestions(article, limit):
+    """Score every member from their article history, without the index."""
+    import math
+    from collections import Counter
+    from app.core.extensions import db
+    from app.core.reviewer_index import AUTHORED_STATUSES, article_terms
+    from app.models.article import Article
+    from app.models.user import User
+
+    members = {u.id: u for u in User.query.filter(User.tenant_id == article.tenant_id,
+                                                  User.role.in_(User.REVIEWER_ROLES),
+                                                  User.id != article.author_id)}
+    terms = {user_id: Counter() for user_id in members}
+    open_reviews = Counter()
+    rows = db.session.query(Article.author_id, Article.reviewer_id, Article.status, Article.keywords,
+                            Article.category).filter(Article.tenant_id == article.tenant_id)
+    for author_id, reviewer_id, status, keywords, category in rows:
+        weights = article_terms(keywords, category)
+        if reviewer_id in terms:
+            terms[reviewer_id].update(weights)
+            open_reviews[reviewer_id] += status == 'under_review'
+        if author_id in terms and status in AUTHORED_STATUSES:
+            terms[author_id].update(weights)
+    wanted = article_terms(article.keywords, article.category)
+    scored = []
+    for user_id, weights in terms.items():
+        norm = math.sqrt(sum(w * w for w in weights.values()))
+        if norm:
+            overlap = sum(wanted[t] * weights[t] for t in wanted if t in weights) / norm
+            scored.append((overlap / (1 + 0.5 * open_reviews[user_id]), user_id))
+    return sorted(scored, reverse=True)[:limit]
+
+def member_picker(articles):
+    """The editor panel's reviewer list before suggestions: every member, by name."""
+    from sqlalchemy.orm import load_only
+    from app.core.projections import USER_SUMMARY_COLUMNS
+    from app.models.user import User
+
+    return User.query.options(load_only(*USER_SUMMARY_COLUMNS)).filter(
+        User.tenant_id.in_({a.tenant_id for a in articles}), User.role.in_(User.REVIEWER_ROLES),
+    ).order_by(User.first_name, User.last_name).all()
+
+def timings(fn, items):
+    from app.core.query_budget import QueryCounter
+
+    samples, queries = [], []
+    for item in items:
+        with QueryCounter() as counter:
+            started = time.perf_counter()
+            fn(item)
+            samples.append((time.perf_counter() - started) * 1000)
+        queries.append(counter.count)
+    samples.sort()
+    return statistics.mean(samples), samples[int(len(samples) * 0.95) - 1], max(queries)
+
+def main():
+    args = parse_args()
+    rng = random.Random(46)
+    db_path = os.path.join(tempfile.mkdtemp(prefix='bench-reviewers-'), 'bench.db')
+    os.environ['DATABASE_URL'] = 'sqlite:///' + db_path
+
+    from app import create_app
+    from app.core.extensions import db
+    from app.core.projections import article_list_query
+    from app.core.reviewer_index import (
+        rebuild_reviewer_profiles, refresh_profiles_for, reviewer_choices, suggest_reviewers,
+    )
+    from app.models.article import Article
+    from app.models.reviewer_profile import ReviewerTerm
+
+    app = create_app('development')
+    with app.app_context():
+        tenant_id, history = seed(db, args, rng)
+        started = time.perf_counter()
+        profiles = rebuild_reviewer_profiles()
+        rebuild = time.perf_counter() - started
+        print(f'{args.members} reviewers, {history} past articles, {args.vocabulary} keywords')
+        print(f'index build: {profiles} profiles, {ReviewerTerm.query.count()} postings in {rebuild:.2f}s\n')
+
+        submitted = article_list_query(Article.query.filter_by(tenant_id=tenant_id, status='submitted')).all()
+        print(f'{"":<34}{"mean":>10}{"p95":>10}{"queries":>9}')
+        rows = [
+            ('suggest_reviewers (index)', lambda a: suggest_reviewers(a), submitted),
+            ('on-the-fly scan of history', lambda a: scan_suggestions(a, 5), submitted[:10]),
+            ('member picker alone, 25-row page', lambda page: member_picker(page),
+             [submitted[i:i + 25] for i in range(0, len(submitted) - 24, 25)]),
+            ('reviewer_choices, 25-row page', lambda page: reviewer_choices(page),
+             [submitted[i:i + 25] for i in range(0, len(submitted) - 24, 25)]),
+            ('profile refresh on assignment', lambda a: refresh_profiles_for([a]), submitted[:50]),
+        ]
+        for name, fn, items in rows:
+            mean, p95, queries = timings(fn, items)
+            print(f'{name:<34}{mean:>8.2f}ms{p95:>8.2f}ms{queries:>9}')
+        db.session.rollback()
+
+    os.remove(db_path)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""Benchmark a full sitemap build against the incremental refresh after a publish.
+
+Seeds a throwaway SQLite database with ``--journals`` journals sharing
+``--articles`` published articles, builds every sitemap from scratch, then
+times the refresh the post-commit hook runs when one article is published
+and the one that runs when a journal is deactivated. Prints how many files
+each wrote and their compressed size.
+
+Usage:
+    python scripts/bench_sitemaps.py [--articles 200000] [--journals 20]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--articles', type=int, default=200000, help='published articles (default 200000)')
+    parser.add_argument('--journals', type=int, default=20, help='journals (default 20)')
+    return parser.parse_args()
+
+def seed(db, articles, journals):
+    from app.models.article import Article
+    from app.models.tenant import Tenant
+    from app.models.user import User
+
+    db.create_all()
+    author = User(first_name='Bench', last_name='Author', email='author@bench.test', role='author',
+                  password_hash='!')
+    db.session.add(author)
+    db.session.flush()
+    tenants = [Tenant(name=f'Bench Journal {i}', subdomain=f'bench{i}', owner_id=author.id) for i in range(journals)]
+    db.session.add_all(tenants)
+    db.session.flush()
+    now = datetime.utcnow()
+    for offset in range(0, articles, 10000):
+        db.session.execute(Article.__table__.insert(), [
+            {'tenant_id': tenants[i % journals].id, 'author_id': author.id, 'title': f'Bench article {i}',
+             'abstract': 'Bench abstract', 'category': 'physics', 'status': 'published', 'views': 0,
+             'created_at': now, 'updated_at': now, 'published_at': now}
+            for i in range(offset, min(offset + 10000, articles))
+        ])
+    db.session.commit()
+    return [t.id for t in tenants]
+
+def snapshot(root):
+    return {
+        os.path.join(path, name): os.stat(os.path.join(path, name)).st_mtime_ns
+        for path, _, names in os.walk(root) for name in names
+    }
+
+def timed(root, fn):
+    before = snapshot(root)
+    time.sleep(0.01)
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    after = snapshot(root)
+    written = [path for path, mtime in after.items() if before.get(path) != mtime]
+    size = sum(os.path.getsize(path) for path in written)
+    return elapsed, len(written), len(before.keys() - after.keys()), size
+
+def main():
+    args = parse_args()
+    workdir = tempfile.mkdtemp(prefix='bench-sitemaps-')
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(workdir, 'bench.db')
+    sitemap_dir = os.path.join(workdir, 'sitemaps')
+
+    from app import create_app
+    from app.core.extensions import db
+    from app.core.sitemaps import build_sitemaps, refresh_article_sitemaps, refresh_journal_sitemaps
+    from app.models.article import Article
+    from app.models.tenant import Tenant
+
+    app = create_app('development')
+    app.config['SITEMAP_DIR'] = sitemap_dir
+    with app.app_context():
+        tenant_ids = seed(db, args.articles, args.journals)
+        print(f'{args.articles} published articles in {args.journals} journals\n')
+        print(f'{"":<30}{"time":>10}{"written":>9}{"removed":>9}{"gzipped":>10}')
+
+        def publish():
+            article = Article.query.filter_by(tenant_id=tenant_ids[0]).order_by(Article.id.desc()).first()
+            article.status = 'draft'
+            db.session.commit()
+            article.status = 'published'
+            db.session.commit()
+            refresh_article_sitemaps([article.id])
+
+        def deactivate():
+            tenant = db.session.get(Tenant, tenant_ids[0])
+            tenant.is_active = False
+            db.session.commit()
+            refresh_journal_sitemaps(tenant.id)
+
+        for name, fn in (('full build', build_sitemaps), ('one article published', publish),
+                         ('one journal deactivated', deactivate)):
+            elapsed, written, removed, size = timed(sitemap_dir, fn)
+            print(f'{name:<30}{elapsed * 1000:>8.0f}ms{written:>9}{removed:>9}{size / 1e6:>8.1f}MB')
+
+    shutil.rmtree(workdir)
+
+if __name__ == '__main__':
+    main()
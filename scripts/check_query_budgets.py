@@ -0,0 +1,160 @@
+"""Check that list pages run a fixed number of SQL queries.
+
+Seeds a throwaway SQLite database, renders each page in ``BUDGETS`` through
+the Flask test client and counts the statements it issues. It then doubles
+the data and renders every page again. A page fails if it exceeds its budget
+or if its query count grows with the number of rows, which means something
+lazy-loads per row (add it to ``LIST_RELATIONS`` in app/core/projections.py).
+
+Usage:
+    python scripts/check_query_budgets.py [--rows 25] [-v]
+
+Exits non-zero when any page is over budget.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# (who, url, max queries); ``who`` is 'admin' (platform admin) or 'owner'
+BUDGETS = [
+    ('owner', '/articles/my-articles', 4),
+    ('owner', '/articles/editor/panel', 5),
+    ('owner', '/articles/editor/panel?tab=under_review', 5),
+    ('owner', '/articles/editor/panel/tab?tab=submitted', 4),
+    ('owner', '/articles/journal/bench/articles', 4),
+    ('owner', '/search?q=Budget', 5),
+    ('admin', '/admin/submissions', 4),
+    ('admin', '/admin/assigned-reviewers', 4),
+    ('admin', '/billing/pending-requests?status=', 6),
+    ('owner', '/billing/transactions', 9),
+]
+
+STATUSES = ('submitted', 'under_review', 'published', 'accepted', 'rejected')
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=25, help='rows per list in the first pass (default 25)')
+    parser.add_argument('-v', '--verbose', action='store_true', help='print every statement')
+    return parser.parse_args()
+
+def seed_users(db):
+    from app.models.user import User
+
+    admin = User(first_name='Platform', last_name='Admin', email='admin@budget.test', role='super_admin')
+    owner = User(first_name='Journal', last_name='Owner', email='owner@budget.test', role='tenant_owner')
+    for user in (admin, owner):
+        user.set_password('budget')
+        db.session.add(user)
+    db.session.flush()
+    return admin, owner
+
+def seed_rows(db, tenant, owner, rows, offset):
+    """Add ``rows`` articles per status and ``rows`` transactions, each with its own people."""
+    from app.models.article import Article
+    from app.models.transaction import Transaction
+    from app.models.user import User
+
+    now = datetime.utcnow()
+    for i in range(offset, offset + rows):
+        author = User(first_name=f'Author{i}', last_name='Budget', email=f'author{i}@budget.test',
+                      role='author', tenant_id=tenant.id)
+        reviewer = User(first_name=f'Reviewer{i}', last_name='Budget', email=f'reviewer{i}@budget.test',
+                        role='reviewer', tenant_id=tenant.id)
+        author.set_password('budget')
+        reviewer.set_password('budget')
+        db.session.add_all([author, reviewer])
+        db.session.flush()
+        for n, status in enumerate(STATUSES):
+            created = now - timedelta(hours=i * len(STATUSES) + n)
+            db.session.add(Article(
+                tenant_id=tenant.id, author_id=author.id, reviewer_id=reviewer.id,
+                title=f'Budget article {i}-{status}', abstract='Budget abstract', content='Body', keywords='budget, queries',
+                status=status, created_at=created, submitted_at=created,
+                published_at=created if status == 'published' else None,
+            ))
+        db.session.add(Article(
+            tenant_id=tenant.id, author_id=owner.id, title=f'Budget article by owner {i}',
+            abstract='Budget abstract', status='draft', created_at=now - timedelta(minutes=i),
+        ))
+        db.session.add(Transaction(
+            tenant_id=tenant.id, amount=49, status='pending' if i % 2 else 'completed',
+            payment_method='bank_transfer', plan='pro', reference_id=f'REF{i}',
+            created_at=now - timedelta(hours=i),
+        ))
+    db.session.commit()
+
+def client_for(app, user_id):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user_id)
+        session['_fresh'] = True
+    return client
+
+def measure(app, clients, verbose):
+    from app.core.query_budget import QueryCounter
+
+    results = {}
+    for who, url, _ in BUDGETS:
+        with app.app_context():
+            with QueryCounter() as counter:
+                response = clients[who].get(url)
+        if response.status_code != 200:
+            raise SystemExit(f'{url} returned {response.status_code}')
+        results[url] = counter.statements
+        if verbose:
+            print(f'{url}:')
+            for statement in counter.statements:
+                print(f'    {" ".join(statement.split())[:150]}')
+    return results
+
+def main():
+    args = parse_args()
+    db_path = os.path.join(tempfile.mkdtemp(prefix='query-budgets-'), 'budgets.db')
+    os.environ['DATABASE_URL'] = 'sqlite:///' + db_path
+
+    from app import create_app
+    from app.core.extensions import db
+    from app.models.tenant import Tenant
+    from app.models.user import User
+
+    app = create_app('development')
+    with app.app_context():
+        db.create_all()
+        admin, owner = seed_users(db)
+        tenant = Tenant(name='Budget Journal', subdomain='bench', owner_id=owner.id)
+        db.session.add(tenant)
+        db.session.flush()
+        owner.tenant_id = tenant.id
+        seed_rows(db, tenant, owner, args.rows, 0)
+        admin_id, owner_id, tenant_id = admin.id, owner.id, tenant.id
+
+    clients = {'admin': client_for(app, admin_id), 'owner': client_for(app, owner_id)}
+    measure(app, clients, False)  # warm-up: first visits run one-off setup writes
+    first = measure(app, clients, args.verbose)
+
+    with app.app_context():
+        tenant = db.session.get(Tenant, tenant_id)
+        owner = db.session.get(User, owner_id)
+        seed_rows(db, tenant, owner, args.rows, args.rows)
+    second = measure(app, clients, args.verbose)
+
+    failures = 0
+    print(f'{"page":<48}{"budget":>8}{"queries":>9}{"2x rows":>9}')
+    for _, url, budget in BUDGETS:
+        small, large = len(first[url]), len(second[url])
+        ok = large <= budget and large == small
+        failures += not ok
+        print(f'{url:<48}{budget:>8}{small:>9}{large:>9}  {"ok" if ok else "FAIL"}')
+
+    os.remove(db_path)
+    if failures:
+        raise SystemExit(f'{failures} page(s) over budget or scaling with rows')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Check the false-positive rate of the unique-view filter over its window.
+
+Fills a ``RotatingBloomFilter`` period by period with distinct keys, then
+probes it (without recording) with keys it has never seen and counts how
+many it reports as seen; each one is a first view that would not be counted. Runs the full
+window at ``capacity`` keys per period, and one period loaded to several
+times ``capacity``. Needs no database.
+
+Usage:
+    python scripts/check_view_dedup.py [--capacity 5000] [--error-rate 0.01] [--overload 3]
+
+Exits non-zero when a case exceeds its bound.
+"""
+
+import argparse
+import math
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PROBES = 20000
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--capacity', type=int, default=5000)
+    parser.add_argument('--error-rate', type=float, default=0.01)
+    parser.add_argument('--window-hours', type=int, default=24)
+    parser.add_argument('--overload', type=int, default=3, help='keys per period in capacities, single-period case')
+    return parser.parse_args()
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def false_positive_rate(dedup, prefix):
+    return sum(f'{prefix}:{i}' in dedup for i in range(PROBES)) / PROBES
+
+def main():
+    args = parse_args()
+    from app.core.view_dedup import RotatingBloomFilter
+
+    failures = 0
+    print(f'{"case":<28}{"filters":>9}{"bound":>9}{"measured":>10}')
+
+    def report(name, dedup, bound, measured):
+        nonlocal failures
+        # Three standard deviations of sampling noise on PROBES probes
+        ok = measured <= bound + 3 * math.sqrt(bound * (1 - bound) / PROBES)
+        failures += not ok
+        print(f'{name:<28}{len(dedup._filters):>9}{bound:>9.2%}{measured:>10.2%}  {"ok" if ok else "FAIL"}')
+
+    # Every period of the window filled to capacity
+    clock = Clock()
+    dedup = RotatingBloomFilter(window_seconds=args.window_hours * 3600, rotate_seconds=3600,
+                                capacity=args.capacity, error_rate=args.error_rate, clock=clock)
+    for period in range(dedup.max_filters):
+        clock.now = period * 3600
+        for i in range(args.capacity):
+            dedup.seen(f'fill:{period}:{i}')
+    report('full window', dedup, args.error_rate, false_positive_rate(dedup, 'probe'))
+
+    # One period at several times capacity: overflow filters, each within its share
+    clock = Clock()
+    dedup = RotatingBloomFilter(window_seconds=args.window_hours * 3600, rotate_seconds=3600,
+                                capacity=args.capacity, error_rate=args.error_rate, clock=clock)
+    for i in range(args.capacity * args.overload):
+        dedup.seen(f'burst:{i}')
+    bound = 1 - (1 - dedup.filter_error_rate) ** len(dedup._filters)
+    report(f'one period at {args.overload}x capacity', dedup, bound, false_positive_rate(dedup, 'probe'))
+
+    if failures:
+        raise SystemExit(f'{failures} case(s) over their false-positive bound')
+
+if __name__ == '__main__':
+    main()
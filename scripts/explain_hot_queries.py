@@ -0,0 +1,130 @@
+"""Check that the hot list and billing queries are served by an index.
+
+Builds each query shape the list pages run (the same keyset ordering, tenant
+and status filters), compiles it for the configured database and asks the
+planner how it would execute it. A query fails if the planner scans a whole
+table or sorts rows instead of reading them from an index in order.
+
+On PostgreSQL sequential scans are disabled for the check so that small
+development tables do not hide a missing index; on SQLite ``EXPLAIN QUERY
+PLAN`` is used as is.
+
+Usage:
+    python scripts/explain_hot_queries.py [-v]
+
+Run it against a database migrated to head (``flask db upgrade``); exits
+non-zero when any query is not index-backed.
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-v', '--verbose', action='store_true', help='print the SQL of every query')
+    return parser.parse_args()
+
+def hot_queries():
+    """``(name, query)`` for every hot query shape, with representative values."""
+    from app.core.pagination import encode_cursor, keyset_query
+    from app.core.projections import article_list_query
+    from app.models.article import Article
+    from app.models.custom_domain import CustomDomainRequest
+    from app.models.subscription import Subscription
+    from app.models.transaction import Transaction
+    from app.models.user import User
+
+    cursor = encode_cursor(datetime(2024, 1, 1), 1000)
+
+    def keyset(name, query, sort_column):
+        query = article_list_query(query, view=name.split(' ')[0])
+        return [
+            (f'{name} (first page)', keyset_query(query, sort_column, Article.id)),
+            (f'{name} (next page)', keyset_query(query, sort_column, Article.id, cursor)),
+        ]
+
+    queries = []
+    queries += keyset('my_articles', Article.query.filter_by(author_id=1), Article.created_at)
+    queries += keyset('editor_panel', Article.query.filter_by(tenant_id=1, status='submitted'), Article.created_at)
+    queries += keyset('journal_articles', Article.query.filter_by(tenant_id=1, status='published'),
+                      Article.published_at)
+    queries += [
+        ('reviewer_panel', Article.query.filter_by(reviewer_id=1, status='under_review')
+            .order_by(Article.created_at.desc())),
+        ('admin.submissions', article_list_query(Article.query, view='admin.submissions')
+            .order_by(Article.created_at.desc()).limit(20)),
+        ('platform status counts', Article.query.filter_by(status='submitted')
+            .order_by(Article.created_at.desc()).limit(20)),
+        ('trending', Article.query.filter(Article.status == 'published')
+            .order_by(Article.published_at.desc()).limit(10)),
+        ('transactions', Transaction.query.filter_by(tenant_id=1)
+            .order_by(Transaction.created_at.desc())),
+        ('transactions by status', Transaction.query.filter_by(tenant_id=1, status='pending')
+            .order_by(Transaction.created_at.desc())),
+        ('pending requests', Transaction.query.filter(Transaction.status == 'pending')
+            .order_by(Transaction.created_at.desc())),
+        ('subscription', Subscription.query.filter_by(tenant_id=1).limit(1)),
+        ('custom domains', CustomDomainRequest.query.filter_by(status='pending')
+            .order_by(CustomDomainRequest.request_date.desc())),
+        ('custom domain lookup', CustomDomainRequest.query.filter_by(custom_domain='journal.example.org').limit(1)),
+        ('reviewers', User.query.filter(User.tenant_id == 1, User.role.in_(User.REVIEWER_ROLES))),
+    ]
+    return queries
+
+def compile_sql(query, dialect):
+    return str(query.statement.compile(dialect=dialect, compile_kwargs={'literal_binds': True}))
+
+def explain_sqlite(conn, sql):
+    from sqlalchemy import text
+
+    plan = [row[-1] for row in conn.execute(text(f'EXPLAIN QUERY PLAN {sql}'))]
+    problems = [line for line in plan
+                if (line.startswith('SCAN') and 'USING' not in line) or 'TEMP B-TREE' in line]
+    return plan, problems
+
+def explain_postgresql(conn, sql):
+    from sqlalchemy import text
+
+    conn.execute(text('SET LOCAL enable_seqscan = off'))
+    plan = [row[0] for row in conn.execute(text(f'EXPLAIN {sql}'))]
+    problems = [line.strip() for line in plan if 'Seq Scan' in line or line.strip().startswith('-> Sort')
+                or line.startswith('Sort')]
+    return plan, problems
+
+def main():
+    args = parse_args()
+
+    from app import create_app
+    from app.core.extensions import db
+
+    explainers = {'sqlite': explain_sqlite, 'postgresql': explain_postgresql}
+    app = create_app(os.environ.get('FLASK_ENV', 'development'))
+    with app.app_context():
+        dialect = db.engine.dialect
+        explain = explainers.get(dialect.name)
+        if explain is None:
+            raise SystemExit(f'no EXPLAIN support for {dialect.name}')
+
+        failures = 0
+        with db.engine.connect() as conn:
+            for name, query in hot_queries():
+                sql = compile_sql(query, dialect)
+                with conn.begin():
+                    plan, problems = explain(conn, sql)
+                failures += bool(problems)
+                print(f'{"FAIL" if problems else "ok":<6}{name}')
+                if args.verbose:
+                    print('      ' + ' '.join(sql.split()))
+                for line in (plan if args.verbose or problems else ()):
+                    print(f'        {line}')
+
+    if failures:
+        raise SystemExit(f'{failures} quer{"y" if failures == 1 else "ies"} not served by an index')
+
+if __name__ == '__main__':
+    main()